@@ -23,9 +23,15 @@ from . import error
 from . import schema
 
 from .netapplier import apply
+from .netapplier import apply_many
 from .netapplier import commit
+from .netapplier import plan
 from .netapplier import rollback
+from .netinfo import get_covered_routes
+from .netinfo import get_covering_routes
 from .netinfo import show
+from .netwatch import watch
+from .session import Session
 
 from .prettystate import PrettyState
 
@@ -34,12 +40,18 @@ ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 __all__ = [
     "show",
+    "get_covering_routes",
+    "get_covered_routes",
+    "watch",
     "apply",
+    "apply_many",
     "commit",
+    "plan",
     "rollback",
     "error",
     "schema",
     "PrettyState",
+    "Session",
 ]
 
 
@@ -23,58 +23,159 @@ https://bugzilla.redhat.com/show_bug.cgi?id=1621188
 """
 
 import array
+import errno
 import struct
 import fcntl
 import socket
 
 ETHTOOL_GSET = 0x00000001  # Get settings
+ETHTOOL_GLINKSETTINGS = 0x0000004C  # Get link mode settings
 SIOCETHTOOL = 0x8946
 
+SPEED_UNKNOWN = 0xFFFFFFFF
+DUPLEX_UNKNOWN = 0xFF
+AUTONEG_UNKNOWN = 0xFF
+
+# struct ethtool_cmd
+_ETHTOOL_CMD = struct.Struct("I8xHB3xB25x")
+# struct ethtool_link_settings without the link_mode_masks flexible array
+_ETHTOOL_LINK_SETTINGS = struct.Struct("IIBxxBxxxb32x")
+# The link_mode_masks contains supported, advertising and lp_advertising
+# masks.
+_LINK_MODE_MASKS_COUNT = 3
+_U32_SIZE = 4
+_IFREQ = struct.Struct("16sP")
+
+
+class Ethtool:
+    """
+    An AF_INET socket for SIOCETHTOOL requests. The socket is opened on the
+    first request and reused by later requests until `close()` is invoked.
+    """
+
+    def __init__(self):
+        self._sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def get_link_settings(self, interface):
+        """
+        Return dictionary with speed, duplex and auto-negotiation settings
+        for the specified interface. Please refer to `minimal_ethtool()` for
+        the content.
+        The ETHTOOL_GLINKSETTINGS command is used with fallback to the
+        deprecated ETHTOOL_GSET command.
+        """
+        speed, duplex, auto = SPEED_UNKNOWN, DUPLEX_UNKNOWN, AUTONEG_UNKNOWN
+        try:
+            settings = self._get_link_settings(interface)
+            if settings is None:
+                settings = self._get_settings(interface)
+            speed, duplex, auto = settings
+        except IOError:
+            pass
+
+        return _to_dict(speed, duplex, auto)
+
+    def get_all_link_settings(self, interfaces):
+        """
+        Return dictionary of link settings indexed by interface name for all
+        specified interfaces.
+        """
+        return {
+            interface: self.get_link_settings(interface)
+            for interface in interfaces
+        }
+
+    @property
+    def _fd(self):
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        return self._sock.fileno()
+
+    def _ioctl(self, interface, ecmd):
+        ifreq = _IFREQ.pack(interface.encode("utf-8"), ecmd.buffer_info()[0])
+        fcntl.ioctl(self._fd, SIOCETHTOOL, ifreq)
+
+    def _get_settings(self, interface):
+        ecmd = array.array("B", _ETHTOOL_CMD.pack(ETHTOOL_GSET, 0, 0, 0))
+        self._ioctl(interface, ecmd)
+        _, speed, duplex, auto = _ETHTOOL_CMD.unpack(ecmd.tobytes())
+        if speed == 0xFFFF:
+            speed = SPEED_UNKNOWN
+        return speed, duplex, auto
+
+    def _get_link_settings(self, interface):
+        """
+        Return None if kernel or driver does not support
+        ETHTOOL_GLINKSETTINGS.
+        """
+        # The first request is a handshake to retrieve the size of
+        # link_mode_masks which is reported as negative number.
+        ecmd = array.array(
+            "B", _ETHTOOL_LINK_SETTINGS.pack(ETHTOOL_GLINKSETTINGS, 0, 0, 0, 0)
+        )
+        try:
+            self._ioctl(interface, ecmd)
+        except IOError as e:
+            if e.errno == errno.EOPNOTSUPP:
+                return None
+            raise
+        nwords = -_ETHTOOL_LINK_SETTINGS.unpack_from(ecmd)[4]
+        if nwords <= 0:
+            return None
+
+        ecmd = array.array(
+            "B",
+            _ETHTOOL_LINK_SETTINGS.pack(ETHTOOL_GLINKSETTINGS, 0, 0, 0, nwords)
+            + b"\x00" * (_LINK_MODE_MASKS_COUNT * nwords * _U32_SIZE),
+        )
+        self._ioctl(interface, ecmd)
+        _, speed, duplex, auto, _ = _ETHTOOL_LINK_SETTINGS.unpack_from(ecmd)
+        return speed, duplex, auto
+
 
 def minimal_ethtool(interface):
     """
     Return dictionary with speed, duplex and auto-negotiation settings for the
-    specified interface using the ETHTOOL_GSET command. The speed is returned n
-    MBit/s, 0 means that the speed could not be determined. The duplex setting
-    is 'unknown', 'full' or 'half. The auto-negotiation setting True or False
-    or None if it could not be determined.
+    specified interface. The speed is returned n MBit/s, 0 means that the
+    speed could not be determined. The duplex setting is 'unknown', 'full' or
+    'half. The auto-negotiation setting True or False or None if it could not
+    be determined.
 
     Based on:
     https://github.com/rlisagor/pynetlinux/blob/master/pynetlinux/ifconfig.py
     https://elixir.bootlin.com/linux/v4.19-rc1/source/include/uapi/linux/ethtool.h
 
+    Please use `Ethtool` to query multiple interfaces over a single socket.
+
     :param interface str: Name of interface
     :returns dict: Dictionary with the keys speed, duplex, auto-negotiation
 
     """
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sockfd = sock.fileno()
-
-        ecmd = array.array(
-            "B", struct.pack("I39s", ETHTOOL_GSET, b"\x00" * 39)
-        )
-
-        interface = interface.encode("utf-8")
-        ifreq = struct.pack("16sP", interface, ecmd.buffer_info()[0])
+    with Ethtool() as ethtool:
+        return ethtool.get_link_settings(interface)
 
-        fcntl.ioctl(sockfd, SIOCETHTOOL, ifreq)
-        res = ecmd.tobytes()
-        speed, duplex, auto = struct.unpack("12xHB3xB24x", res)
-    except IOError:
-        speed, duplex, auto = 65535, 255, 255
-    finally:
-        sock.close()
 
-    if speed == 65535:
+def _to_dict(speed, duplex, auto):
+    if speed == SPEED_UNKNOWN:
         speed = 0
 
-    if duplex == 255:
+    if duplex == DUPLEX_UNKNOWN:
         duplex = "unknown"
     else:
         duplex = "full" if bool(duplex) else "half"
 
-    if auto == 255:
+    if auto == AUTONEG_UNKNOWN:
         auto = None
     else:
         auto = bool(auto)
@@ -94,6 +94,13 @@ class IPState:
     def to_dict(self):
         return deepcopy(self._info)
 
+    @property
+    def raw(self):
+        """
+        Internal use only: The dictionary modified in place.
+        """
+        return self._info
+
     def validate(self, original):
         if (
             self.is_enabled
@@ -126,8 +133,14 @@ class BaseIface:
     ROUTE_RULES_METADATA = "_route_rules"
 
     def __init__(self, info, save_to_disk=True):
-        self._origin_info = deepcopy(info)
-        self._info = deepcopy(info)
+        """
+        The info is shared with the caller and never modified. Each top level
+        subtree of it is copied when first modified, via `raw` or `_own()`.
+        """
+        self._origin_info = info
+        self._info = dict(info)
+        # The top level keys whose value is copied from the info
+        self._owned_keys = set()
         self._is_desired = False
         self._is_changed = False
         self._name = self._info[Interface.NAME]
@@ -145,8 +158,22 @@ class BaseIface:
         """
         Internal use only: Allowing arbitrary modifcation.
         """
+        for key in self._info:
+            self._own(key)
         return self._info
 
+    def _own(self, key, default=None):
+        """
+        Return the value of key which could be modified in place, copying it
+        from the shared info on first use.
+        """
+        if key not in self._info:
+            return default
+        if key not in self._owned_keys:
+            self._info[key] = deepcopy(self._info[key])
+            self._owned_keys.add(key)
+        return self._info[key]
+
     @property
     def name(self):
         return self._name
@@ -185,7 +212,10 @@ class BaseIface:
         return self._origin_info
 
     def ip_state(self, family):
-        return IPState(family, self._info.get(family, {}))
+        return IPState(family, self._own(family, {}))
+
+    def _origin_ip_state(self, family):
+        return IPState(family, deepcopy(self._origin_info.get(family, {})))
 
     def is_ipv4_enabled(self):
         return self.ip_state(Interface.IPV4).is_enabled
@@ -208,18 +238,16 @@ class BaseIface:
         """
         if self.is_desired:
             for family in (Interface.IPV4, Interface.IPV6):
-                self.ip_state(family).validate(
-                    IPState(family, self._origin_info.get(family, {}))
-                )
+                self.ip_state(family).validate(self._origin_ip_state(family))
             self._validate_slave_ip()
             ip_state = self.ip_state(family)
             ip_state.remove_link_local_address()
-            self._info[family] = ip_state.to_dict()
+            self._info[family] = ip_state.raw
             if self.is_absent and not self._save_to_disk:
                 self._info[Interface.STATE] = InterfaceState.DOWN
 
     def merge(self, other):
-        merge_dict(self._info, other._info)
+        merge_dict(self.raw, other.raw)
         # If down state is not from orignal state, set it as UP.
         if (
             Interface.STATE not in self._origin_info
@@ -229,7 +257,7 @@ class BaseIface:
 
     def _validate_slave_ip(self):
         for family in (Interface.IPV4, Interface.IPV6):
-            ip_state = IPState(family, self._origin_info.get(family, {}))
+            ip_state = self._origin_ip_state(family)
             if (
                 ip_state.is_enabled
                 and self.master
@@ -295,6 +323,7 @@ class BaseIface:
 
     def update(self, info):
         self._info.update(info)
+        self._owned_keys.difference_update(info)
 
     @property
     def mac(self):
@@ -332,7 +361,7 @@ class BaseIface:
         for family in (Interface.IPV4, Interface.IPV6):
             ip_state = self.ip_state(family)
             ip_state.remove_link_local_address()
-            self._info[family] = ip_state.to_dict()
+            self._info[family] = ip_state.raw
         state = self.to_dict()
         _remove_empty_description(state)
         _remove_undesired_data(state, self.original_dict)
@@ -372,19 +401,19 @@ class BaseIface:
 
     def store_dns_metadata(self, dns_metadata):
         for family, dns_config in dns_metadata.items():
-            self.raw[family][BaseIface.DNS_METADATA] = dns_config
+            self._own(family)[BaseIface.DNS_METADATA] = dns_config
 
     def remove_dns_metadata(self):
         for family in (Interface.IPV4, Interface.IPV6):
-            self.raw.get(family, {}).pop(BaseIface.DNS_METADATA, None)
+            self._own(family, {}).pop(BaseIface.DNS_METADATA, None)
 
     def store_route_metadata(self, route_metadata):
         for family, routes in route_metadata.items():
-            self.raw[family][BaseIface.ROUTES_METADATA] = routes
+            self._own(family)[BaseIface.ROUTES_METADATA] = routes
 
     def store_route_rule_metadata(self, route_rule_metadata):
         for family, rules in route_rule_metadata.items():
-            self.raw[family][BaseIface.ROUTE_RULES_METADATA] = rules
+            self._own(family)[BaseIface.ROUTE_RULES_METADATA] = rules
 
 
 def _remove_empty_description(state):
@@ -18,6 +18,7 @@
 #
 
 import contextlib
+from copy import deepcopy
 import logging
 
 from libnmstate.error import NmstateValueError
@@ -42,7 +43,7 @@ class BondIface(BaseIface):
 
     @property
     def slaves(self):
-        return self.raw.get(Bond.CONFIG_SUBTREE, {}).get(Bond.SLAVES, [])
+        return self._info.get(Bond.CONFIG_SUBTREE, {}).get(Bond.SLAVES, [])
 
     @property
     def is_master(self):
@@ -54,7 +55,7 @@ class BondIface(BaseIface):
 
     @property
     def bond_mode(self):
-        return self.raw.get(Bond.CONFIG_SUBTREE, {}).get(Bond.MODE)
+        return self._info.get(Bond.CONFIG_SUBTREE, {}).get(Bond.MODE)
 
     @property
     def _bond_options(self):
@@ -64,7 +65,7 @@ class BondIface(BaseIface):
 
     @property
     def is_bond_mode_changed(self):
-        return self.raw.get(BondIface._MODE_CHANGE_METADATA) is True
+        return self._info.get(BondIface._MODE_CHANGE_METADATA) is True
 
     def _set_bond_mode_changed_metadata(self, value):
         self.raw[BondIface._MODE_CHANGE_METADATA] = value
@@ -94,10 +95,10 @@ class BondIface(BaseIface):
                 "Discarding all current bond options as interface "
                 f"{self.name} has bond mode changed"
             )
-            self.raw[Bond.CONFIG_SUBTREE][
-                Bond.OPTIONS_SUBTREE
-            ] = self.original_dict.get(Bond.CONFIG_SUBTREE, {}).get(
-                Bond.OPTIONS_SUBTREE, {}
+            self.raw[Bond.CONFIG_SUBTREE][Bond.OPTIONS_SUBTREE] = deepcopy(
+                self.original_dict.get(Bond.CONFIG_SUBTREE, {}).get(
+                    Bond.OPTIONS_SUBTREE, {}
+                )
             )
             self._normalize_options_values()
 
@@ -35,7 +35,7 @@ class EthernetIface(BaseIface):
         from the actual configuration.  This makes it possible to distinguish
         whether a user specified these values in the later configuration step.
         """
-        eth_conf = self._info.setdefault(Ethernet.CONFIG_SUBTREE, {})
+        eth_conf = self.raw.setdefault(Ethernet.CONFIG_SUBTREE, {})
         eth_conf.setdefault(Ethernet.AUTO_NEGOTIATION, None)
         eth_conf.setdefault(Ethernet.SPEED, None)
         eth_conf.setdefault(Ethernet.DUPLEX, None)
@@ -17,6 +17,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+from collections import defaultdict
 import logging
 
 from libnmstate.error import NmstateKernelIntegerRoundedError
@@ -283,6 +284,49 @@ class Ifaces:
             if iface.is_changed or iface.is_desired
         ]
 
+    @property
+    def changed_iface_names(self):
+        """
+        The names of desired or changed interfaces along with the slaves of
+        them, which are required for verifying the changes.
+        """
+        iface_names = set()
+        for iface in self._ifaces.values():
+            if iface.is_changed or iface.is_desired:
+                iface_names.add(iface.name)
+                iface_names.update(iface.slaves)
+                cur_iface = self._cur_ifaces.get(iface.name)
+                if cur_iface:
+                    iface_names.update(cur_iface.slaves)
+        return iface_names
+
+    @property
+    def affected_iface_names(self):
+        """
+        The names of desired or changed interfaces along with their masters,
+        slaves, parents and children, recursively.
+        """
+        related_names = defaultdict(set)
+        for ifaces in (self._cur_ifaces, self._ifaces):
+            for iface in ifaces.values():
+                for related_name in filter(
+                    None, iface.slaves + [iface.master, iface.parent]
+                ):
+                    related_names[iface.name].add(related_name)
+                    related_names[related_name].add(iface.name)
+
+        iface_names = {
+            iface.name
+            for iface in self._ifaces.values()
+            if iface.is_changed or iface.is_desired
+        }
+        pending_names = list(iface_names)
+        while pending_names:
+            new_names = related_names[pending_names.pop()] - iface_names
+            iface_names.update(new_names)
+            pending_names.extend(new_names)
+        return iface_names
+
     @property
     def cur_ifaces(self):
         return self._cur_ifaces
@@ -295,8 +339,13 @@ class Ifaces:
         for iface in self._ifaces.values():
             if iface.is_up and iface.is_master and iface.slaves:
                 for slave_name in iface.slaves:
-                    slave_iface = self._ifaces[slave_name]
-                    if slave_iface.type == InterfaceType.UNKNOWN:
+                    # The current state shown for verification only holds the
+                    # changed interfaces, the slave might not be included.
+                    slave_iface = self._ifaces.get(slave_name)
+                    if (
+                        slave_iface
+                        and slave_iface.type == InterfaceType.UNKNOWN
+                    ):
                         iface.remove_slave(slave_name)
 
     def verify(self, cur_iface_infos):
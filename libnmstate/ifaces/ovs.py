@@ -19,7 +19,8 @@
 
 from copy import deepcopy
 from operator import itemgetter
-import subprocess
+import os
+import socket
 
 from libnmstate.error import NmstateValueError
 from libnmstate.schema import Interface
@@ -34,7 +35,8 @@ from .bridge import BridgeIface
 from .base_iface import BaseIface
 
 
-SYSTEMCTL_TIMEOUT_SECONDS = 5
+DEFAULT_OVS_DB_SOCKET_PATH = "/run/openvswitch/db.sock"
+OVS_DB_CONNECT_TIMEOUT_SECONDS = 1
 
 
 class OvsBridgeIface(BridgeIface):
@@ -241,17 +243,20 @@ class OvsInternalIface(BaseIface):
 
 
 def is_ovs_running():
-    try:
-        subprocess.run(
-            ("systemctl", "status", "openvswitch"),
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
-            timeout=SYSTEMCTL_TIMEOUT_SECONDS,
-        )
-        return True
-    except Exception:
-        return False
+    """
+    Whether the OVS database server is accepting connections on its unix
+    socket.
+    """
+    socket_path = os.environ.get(
+        "OVS_DB_UNIX_SOCKET_PATH", DEFAULT_OVS_DB_SOCKET_PATH
+    )
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(OVS_DB_CONNECT_TIMEOUT_SECONDS)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
 
 
 def _convert_external_ids_values_to_string(iface_info):
@@ -27,7 +27,7 @@ from .base_iface import BaseIface
 class TeamIface(BaseIface):
     @property
     def slaves(self):
-        ports = self.raw.get(Team.CONFIG_SUBTREE, {}).get(
+        ports = self._info.get(Team.CONFIG_SUBTREE, {}).get(
             Team.PORT_SUBTREE, []
         )
         return [p[Team.Port.NAME] for p in ports]
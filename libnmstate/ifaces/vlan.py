@@ -34,7 +34,7 @@ class VlanIface(BaseIface):
 
     @property
     def _vlan_config(self):
-        return self.raw.get(VLAN.CONFIG_SUBTREE, {})
+        return self._info.get(VLAN.CONFIG_SUBTREE, {})
 
     @property
     def is_virtual(self):
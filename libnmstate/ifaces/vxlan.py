@@ -34,7 +34,7 @@ class VxlanIface(BaseIface):
 
     @property
     def _vxlan_config(self):
-        return self.raw.get(VXLAN.CONFIG_SUBTREE, {})
+        return self._info.get(VXLAN.CONFIG_SUBTREE, {})
 
     @property
     def is_virtual(self):
@@ -17,6 +17,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import functools
 import ipaddress
 from libnmstate.error import NmstateValueError
 
@@ -25,6 +26,11 @@ _IPV6_LINK_LOCAL_NETWORK_PREFIX_LENGTH = 10
 
 KERNEL_MAIN_ROUTE_TABLE_ID = 254
 
+# The same addresses are parsed again and again by merging and verifying the
+# states. Remember the results of this many addresses per function, enough for
+# the addresses and routes of a host with tens of thousands of routes.
+IP_CACHE_SIZE = 65536
+
 
 def is_ipv6_link_local_addr(ip, prefix):
     return (
@@ -45,6 +51,7 @@ def to_ip_address_full(ip, prefix=None):
         return to_ip_address_full(*ip_address_full_to_tuple(ip))
 
 
+@functools.lru_cache(maxsize=IP_CACHE_SIZE)
 def ip_address_full_to_tuple(addr):
     try:
         net = ipaddress.ip_network(addr)
@@ -54,6 +61,7 @@ def ip_address_full_to_tuple(addr):
     return f"{net.network_address}", net.prefixlen
 
 
+@functools.lru_cache(maxsize=IP_CACHE_SIZE)
 def canonicalize_ip_network(address):
     try:
         return ipaddress.ip_network(address, strict=False).with_prefixlen
@@ -61,8 +69,43 @@ def canonicalize_ip_network(address):
         raise NmstateValueError(f"Invalid IP network address: {e}")
 
 
+@functools.lru_cache(maxsize=IP_CACHE_SIZE)
+def ip_network_to_int(address):
+    """
+    Return the network address as integer, the prefix length and the maximum
+    prefix length of the address family.
+    """
+    try:
+        net = ipaddress.ip_network(address, strict=False)
+    except ValueError as e:
+        raise NmstateValueError(f"Invalid IP network address: {e}")
+    return int(net.network_address), net.prefixlen, net.max_prefixlen
+
+
+@functools.lru_cache(maxsize=IP_CACHE_SIZE)
 def canonicalize_ip_address(address):
     try:
         return ipaddress.ip_address(address).compressed
     except ValueError as e:
         raise NmstateValueError(f"Invalid IP address: {e}")
+
+
+_CACHED_FUNCTIONS = (
+    ip_address_full_to_tuple,
+    canonicalize_ip_network,
+    ip_network_to_int,
+    canonicalize_ip_address,
+)
+
+
+def get_ip_cache_info():
+    """
+    Return the hit and miss counters of the cached functions, indexed by
+    function name.
+    """
+    return {func.__name__: func.cache_info() for func in _CACHED_FUNCTIONS}
+
+
+def clear_ip_cache():
+    for func in _CACHED_FUNCTIONS:
+        func.cache_clear()
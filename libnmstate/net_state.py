@@ -17,8 +17,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
-import copy
-
+from libnmstate.error import NmstateVerificationError
 from libnmstate.schema import DNS
 from libnmstate.schema import Interface
 from libnmstate.schema import Route
@@ -52,19 +51,38 @@ class NetState:
             desire_state.get(RouteRule.KEY),
             current_state.get(RouteRule.KEY),
         )
-        self.desire_state = copy.deepcopy(desire_state)
-        self.current_state = copy.deepcopy(current_state)
+        # The states are shared with the caller, the interfaces only copy
+        # the parts they modify.
+        self.desire_state = desire_state
+        self.current_state = current_state
         if self.desire_state:
             self._ifaces.gen_dns_metadata(self._dns, self._route)
             self._ifaces.gen_route_metadata(self._route)
             self._ifaces.gen_route_rule_metadata(self._route_rule, self._route)
 
-    def verify(self, current_state):
+    def verify(self, current_state, iface_names=None):
+        """
+        When iface_names is defined, the current_state only holds these
+        interfaces and their routes, which should cover the
+        `ifaces.changed_iface_names`.
+        """
         self._ifaces.verify(current_state.get(Interface.KEY))
         self._dns.verify(current_state.get(DNS.KEY))
-        self._route.verify(current_state.get(Route.KEY))
+        self._route.verify(current_state.get(Route.KEY), iface_names)
         self._route_rule.verify(current_state.get(RouteRule.KEY))
 
+    def has_changes(self):
+        """
+        Return False if the current state already matches the desired state
+        for interfaces, routes, route rules and DNS, so there is nothing to
+        apply.
+        """
+        try:
+            self.verify(self.current_state)
+        except NmstateVerificationError:
+            return True
+        return False
+
     @property
     def ifaces(self):
         return self._ifaces
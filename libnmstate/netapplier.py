@@ -18,19 +18,24 @@
 #
 
 import copy
+import logging
 import time
 
 
 from libnmstate import validator
 from libnmstate.error import NmstateVerificationError
+from libnmstate.schema import Interface
 
 from .nmstate import create_checkpoints
 from .nmstate import destroy_checkpoints
 from .nmstate import plugin_context
 from .nmstate import plugins_capabilities
+from .nmstate import plugins_ovs_running
+from .nmstate import rollback_on_failure
 from .nmstate import rollback_checkpoints
 from .nmstate import show_with_plugins
 from .net_state import NetState
+from .plugin import NmstatePlugin
 
 MAINLOOP_TIMEOUT = 35
 VERIFY_RETRY_INTERNAL = 1
@@ -44,6 +49,7 @@ def apply(
     commit=True,
     rollback_timeout=60,
     save_to_disk=True,
+    scoped_checkpoint=True,
 ):
     """
     Apply the desired state
@@ -53,26 +59,236 @@ def apply(
     :param commit: Commit the changes after verification if the state matches.
     :param rollback_timeout: Revert the changes if they are not commited within
         this timeout (specified in seconds).
+    :param scoped_checkpoint: Only include the interfaces affected by the
+        desired state in checkpoint when no new interface is created.
     :type verify_change: bool
     :type commit: bool
     :type rollback_timeout: int (seconds)
-    :returns: Checkpoint identifier
+    :type scoped_checkpoint: bool
+    :returns: Checkpoint identifier, None if the desired state is already
+        applied and `commit` is True. In that case no checkpoint is created
+        and nothing is changed.
     :rtype: str
     """
-    desired_state = copy.deepcopy(desired_state)
     with plugin_context() as plugins:
+        return apply_with_plugins(
+            plugins,
+            desired_state,
+            verify_change=verify_change,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+            save_to_disk=save_to_disk,
+            scoped_checkpoint=scoped_checkpoint,
+        )
+
+
+def apply_many(
+    desired_states,
+    *,
+    verify_change=True,
+    commit=True,
+    rollback_timeout=60,
+    save_to_disk=True,
+):
+    """
+    Apply the desired states in order as a single transaction: all of them
+    are applied within a single checkpoint, any failure rolls back all the
+    changes.
+    The consecutive desired states without common interface or section
+    are merged and applied at once.
+
+    The arguments are the same as `apply()`.
+    :returns: Checkpoint identifier, None if all the desired states are
+        already applied and `commit` is True.
+    :rtype: str
+    """
+    with plugin_context() as plugins:
+        return apply_many_with_plugins(
+            plugins,
+            desired_states,
+            verify_change=verify_change,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+            save_to_disk=save_to_disk,
+        )
+
+
+def apply_with_plugins(
+    plugins,
+    desired_state,
+    *,
+    verify_change=True,
+    commit=True,
+    rollback_timeout=60,
+    save_to_disk=True,
+    scoped_checkpoint=True,
+):
+    return apply_many_with_plugins(
+        plugins,
+        [desired_state],
+        verify_change=verify_change,
+        commit=commit,
+        rollback_timeout=rollback_timeout,
+        save_to_disk=save_to_disk,
+        scoped_checkpoint=scoped_checkpoint,
+    )
+
+
+def apply_many_with_plugins(
+    plugins,
+    desired_states,
+    *,
+    verify_change=True,
+    commit=True,
+    rollback_timeout=60,
+    save_to_disk=True,
+    scoped_checkpoint=True,
+):
+    desired_states = [copy.deepcopy(s) for s in desired_states]
+    for desired_state in desired_states:
         validator.schema_validate(desired_state)
-        current_state = show_with_plugins(plugins, include_status_data=True)
         validator.validate_capabilities(
-            desired_state, plugins_capabilities(plugins)
+            desired_state,
+            plugins_capabilities(plugins),
+            plugins_ovs_running(plugins),
         )
-        net_state = NetState(desired_state, current_state, save_to_disk)
-        checkpoints = create_checkpoints(plugins, rollback_timeout)
-        _apply_ifaces_state(plugins, net_state, verify_change, save_to_disk)
-        if commit:
-            destroy_checkpoints(plugins, checkpoints)
+    desired_states = _merge_desired_states(desired_states)
+    # The checkpoint of affected interfaces is only known for the first
+    # desired state, the following ones depend on the result of it.
+    scoped_checkpoint = scoped_checkpoint and len(desired_states) == 1
+
+    checkpoints = None
+    with rollback_on_failure(plugins):
+        for desired_state in desired_states:
+            current_state = show_with_plugins(
+                plugins, include_status_data=True
+            )
+            net_state = NetState(desired_state, current_state, save_to_disk)
+            is_applied = _is_applied(plugins, net_state, save_to_disk)
+            # Without commit, the caller expects a checkpoint to commit or
+            # rollback later even when nothing changed.
+            if checkpoints is None and not (is_applied and commit):
+                checkpoint_iface_names = (
+                    _get_checkpoint_iface_names(net_state)
+                    if scoped_checkpoint
+                    else None
+                )
+                checkpoints = create_checkpoints(
+                    plugins, rollback_timeout, checkpoint_iface_names
+                )
+            if is_applied:
+                logging.info(
+                    "Desired state is already applied, nothing changed"
+                )
+                continue
+            # The state is verified before collecting the current state for
+            # the following desired state.
+            _apply_ifaces_state(
+                plugins, net_state, verify_change, save_to_disk
+            )
+    if checkpoints is None:
+        return None
+    if commit:
+        destroy_checkpoints(plugins, checkpoints)
+    else:
+        return checkpoints
+
+
+def _is_applied(plugins, net_state, save_to_disk):
+    """
+    The current state matching the desired state is not enough, the plugins
+    might still need to change how it is configured, for example the
+    persistence of configuration.
+    """
+    return not net_state.has_changes() and all(
+        plugin.is_applied(net_state, save_to_disk) for plugin in plugins
+    )
+
+
+def _merge_desired_states(desired_states):
+    """
+    Merge the consecutive desired states which have no common interface and
+    do not both define routes, route rules or DNS. Applying the merged state
+    is identical to applying them in order.
+    """
+    merged_states = []
+    for desired_state in desired_states:
+        if merged_states and _can_merge(merged_states[-1], desired_state):
+            merged_state = merged_states[-1]
+            for key, value in desired_state.items():
+                if key == Interface.KEY:
+                    merged_state[key] = merged_state.get(key, []) + value
+                else:
+                    merged_state[key] = value
         else:
-            return checkpoints
+            merged_states.append(desired_state)
+    return merged_states
+
+
+def _can_merge(state, other_state):
+    iface_names = {
+        iface[Interface.NAME] for iface in state.get(Interface.KEY, [])
+    }
+    if any(
+        iface[Interface.NAME] in iface_names
+        for iface in other_state.get(Interface.KEY, [])
+    ):
+        return False
+    return not (set(state) & set(other_state)) - {Interface.KEY}
+
+
+def plan(desired_state, *, save_to_disk=True):
+    """
+    Return the operations planned for applying the desired state without
+    changing anything.
+
+    :returns: The ordered operations under "operations", each one is a
+        dictionary of "plugin", "operation" and "interface". The sorted names
+        of affected interfaces under "interfaces".
+    :rtype: dict
+    """
+    with plugin_context() as plugins:
+        return plan_with_plugins(
+            plugins, desired_state, save_to_disk=save_to_disk
+        )
+
+
+def plan_with_plugins(
+    plugins, desired_state, *, save_to_disk=True, current_state=None
+):
+    """
+    The current_state, for example a recorded report of `show()` including
+    status data, is used instead of the one collected from plugins.
+    """
+    desired_state = copy.deepcopy(desired_state)
+    validator.schema_validate(desired_state)
+    if current_state is None:
+        current_state = show_with_plugins(plugins, include_status_data=True)
+    validator.validate_capabilities(
+        desired_state,
+        plugins_capabilities(plugins),
+        plugins_ovs_running(plugins),
+    )
+    net_state = NetState(desired_state, current_state, save_to_disk)
+    operations = []
+    if not _is_applied(plugins, net_state, save_to_disk):
+        for plugin in plugins:
+            for operation, iface_name in plugin.plan_changes(
+                net_state, save_to_disk
+            ):
+                operations.append(
+                    {
+                        "plugin": plugin.name,
+                        "operation": operation,
+                        "interface": iface_name,
+                    }
+                )
+    return {
+        "operations": operations,
+        "interfaces": sorted(
+            {operation["interface"] for operation in operations}
+        ),
+    }
 
 
 def commit(*, checkpoint=None):
@@ -99,22 +315,83 @@ def rollback(*, checkpoint=None):
         rollback_checkpoints(plugins, checkpoint)
 
 
+def _get_checkpoint_iface_names(net_state):
+    """
+    Return None when any new interface is desired, as only the checkpoint of
+    all devices disconnects new devices on rollback.
+    """
+    ifaces = net_state.ifaces
+    iface_names = ifaces.affected_iface_names
+    for iface_name in iface_names:
+        iface = ifaces.get(iface_name)
+        if iface and iface.is_up and iface_name not in ifaces.cur_ifaces:
+            return None
+    return iface_names & set(ifaces.cur_ifaces)
+
+
 def _apply_ifaces_state(plugins, net_state, verify_change, save_to_disk):
     for plugin in plugins:
         plugin.apply_changes(net_state, save_to_disk)
-    verified = False
     if verify_change:
-        for _ in range(VERIFY_RETRY_TIMEOUT):
+        watch_plugin = _get_watch_plugin(plugins)
+        if watch_plugin:
+            watch_plugin.start_watch()
             try:
-                _verify_change(plugins, net_state)
-                verified = True
-                break
-            except NmstateVerificationError:
-                time.sleep(VERIFY_RETRY_INTERNAL)
-        if not verified:
+                _verify_change(plugins, net_state, watch_plugin)
+            finally:
+                watch_plugin.stop_watch()
+        else:
             _verify_change(plugins, net_state)
 
 
-def _verify_change(plugins, net_state):
-    current_state = show_with_plugins(plugins)
-    net_state.verify(current_state)
+def _get_watch_plugin(plugins):
+    """
+    Return the plugin which could notify the changes of network state during
+    verification. Plugin already watching for `watch()` is not used, so that
+    its changes are not consumed.
+    """
+    for plugin in plugins:
+        if (
+            NmstatePlugin.PLUGIN_CAPABILITY_WATCH in plugin.plugin_capabilities
+            and not plugin.is_watching
+        ):
+            return plugin
+    return None
+
+
+def _verify_change(plugins, net_state, watch_plugin=None):
+    """
+    Only collect the changed interfaces with their routes. When verification
+    failed, check again once watch_plugin noticed any change of them, or
+    every VERIFY_RETRY_INTERNAL seconds without watch_plugin, till
+    VERIFY_RETRY_TIMEOUT.
+    """
+    iface_names = net_state.ifaces.changed_iface_names
+    deadline = time.monotonic() + VERIFY_RETRY_TIMEOUT
+    while True:
+        current_state = show_with_plugins(plugins, interfaces=iface_names)
+        try:
+            net_state.verify(current_state, iface_names)
+            return
+        except NmstateVerificationError:
+            if not _wait_for_changes(watch_plugin, iface_names, deadline):
+                raise
+
+
+def _wait_for_changes(watch_plugin, iface_names, deadline):
+    """
+    Return False if nothing changed till deadline.
+    """
+    while True:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return False
+        if watch_plugin is None:
+            time.sleep(min(timeout, VERIFY_RETRY_INTERNAL))
+            return True
+        changed_ifaces = watch_plugin.wait_for_changes(timeout)
+        # Empty set means global changes like DNS
+        if changed_ifaces is not None and (
+            not changed_ifaces or changed_ifaces & iface_names
+        ):
+            return True
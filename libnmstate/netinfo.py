@@ -19,9 +19,11 @@
 
 from .nmstate import show_with_plugins
 from .nmstate import plugin_context
+from .route import RouteState
+from .schema import Route
 
 
-def show(*, include_status_data=False):
+def show(*, include_status_data=False, interfaces=None, fields=None):
     """
     Reports configuration and status data on the system.
     Configuration data is the set of writable data which can change the system
@@ -30,6 +32,54 @@ def show(*, include_status_data=False):
     including read-only and statistics information.
     When include_status_data is set, both are reported, otherwise only the
     configuration data is reported.
+    When interfaces(list of interface names or shell-style wildcards) is
+    defined, only the matching interfaces and the routes using them as next
+    hop interface are reported. The route rules and DNS are not bound to
+    interface, hence always reported in full.
+    When fields(list of dot-separated paths, for example
+    ["interfaces.name", "interfaces.state", "routes.config"]) is defined,
+    only the selected parts of the report are collected and reported.
     """
     with plugin_context() as plugins:
-        return show_with_plugins(plugins, include_status_data)
+        return show_with_plugins(
+            plugins, include_status_data, interfaces, fields
+        )
+
+
+def get_covering_routes(state, destination, *, table_id=None):
+    """
+    Returns the routes under routes.config of the state, for example a report
+    of show() or a desired state, with destination containing the specified
+    destination network, including the ones equal to it.
+    When table_id is defined, only the routes in that route table are
+    returned, the main route table could be referred as 254 or 0.
+    The routes are returned as a sorted list of route dictionaries with
+    default values filled, absent routes are ignored.
+    """
+    route_state = _gen_route_state(state)
+    return [
+        rt.to_dict()
+        for rt in route_state.get_covering_routes(destination, table_id)
+    ]
+
+
+def get_covered_routes(state, destination, *, table_id=None):
+    """
+    Same as get_covering_routes(), but returns the routes with destination
+    contained by the specified destination network, including the ones equal
+    to it.
+    """
+    route_state = _gen_route_state(state)
+    return [
+        rt.to_dict()
+        for rt in route_state.get_covered_routes(destination, table_id)
+    ]
+
+
+def _gen_route_state(state):
+    routes = [
+        route
+        for route in state.get(Route.KEY, {}).get(Route.CONFIG, [])
+        if route.get(Route.STATE) != Route.STATE_ABSENT
+    ]
+    return RouteState(None, None, {Route.CONFIG: routes})
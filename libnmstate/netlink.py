@@ -0,0 +1,492 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+""" Minimal rtnetlink client to provide data that Network Manager is not yet
+providing, without forking `ip` and parsing its output.
+
+https://elixir.bootlin.com/linux/v5.7/source/include/uapi/linux/rtnetlink.h
+https://elixir.bootlin.com/linux/v5.7/source/include/uapi/linux/if_link.h
+"""
+
+import errno
+import os
+import socket
+import struct
+
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_DUMP = 0x300
+
+NLMSG_ERROR = 0x2
+NLMSG_DONE = 0x3
+
+RTM_NEWLINK = 16
+RTM_GETLINK = 18
+
+NLA_F_NESTED = 0x8000
+NLA_F_NET_BYTEORDER = 0x4000
+NLA_TYPE_MASK = ~(NLA_F_NESTED | NLA_F_NET_BYTEORDER) & 0xFFFF
+
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_MASTER = 10
+IFLA_PROTINFO = 12
+IFLA_LINKINFO = 18
+IFLA_NUM_VF = 21
+IFLA_VFINFO_LIST = 22
+IFLA_EXT_MASK = 29
+
+RTEXT_FILTER_VF = 1 << 0
+
+IFLA_INFO_KIND = 1
+IFLA_INFO_DATA = 2
+
+IFLA_BR_FORWARD_DELAY = 1
+IFLA_BR_HELLO_TIME = 2
+IFLA_BR_MAX_AGE = 3
+IFLA_BR_AGEING_TIME = 4
+IFLA_BR_STP_STATE = 5
+IFLA_BR_PRIORITY = 6
+IFLA_BR_VLAN_FILTERING = 7
+IFLA_BR_GROUP_FWD_MASK = 9
+IFLA_BR_HELLO_TIMER = 16
+IFLA_BR_GC_TIMER = 19
+IFLA_BR_GROUP_ADDR = 20
+IFLA_BR_MCAST_ROUTER = 22
+IFLA_BR_MCAST_SNOOPING = 23
+IFLA_BR_MCAST_QUERY_USE_IFADDR = 24
+IFLA_BR_MCAST_QUERIER = 25
+IFLA_BR_MCAST_HASH_ELASTICITY = 26
+IFLA_BR_MCAST_HASH_MAX = 27
+IFLA_BR_MCAST_LAST_MEMBER_CNT = 28
+IFLA_BR_MCAST_STARTUP_QUERY_CNT = 29
+IFLA_BR_MCAST_LAST_MEMBER_INTVL = 30
+IFLA_BR_MCAST_MEMBERSHIP_INTVL = 31
+IFLA_BR_MCAST_QUERIER_INTVL = 32
+IFLA_BR_MCAST_QUERY_INTVL = 33
+IFLA_BR_MCAST_QUERY_RESPONSE_INTVL = 34
+IFLA_BR_MCAST_STARTUP_QUERY_INTVL = 35
+
+IFLA_BRPORT_PRIORITY = 2
+IFLA_BRPORT_COST = 3
+IFLA_BRPORT_MODE = 4
+
+IFLA_VF_INFO = 1
+
+IFLA_VF_MAC = 1
+IFLA_VF_TX_RATE = 3
+IFLA_VF_SPOOFCHK = 4
+IFLA_VF_RATE = 6
+IFLA_VF_TRUST = 9
+
+# The kernel reports -1 for VF settings not supported by the driver.
+VF_SETTING_UNSUPPORTED = 0xFFFFFFFF
+
+ETH_ALEN = 6
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_IFINFOMSG = struct.Struct("=BxHiII")
+IFINFOMSG_SIZE = _IFINFOMSG.size
+_NLATTR = struct.Struct("=HH")
+_U32 = struct.Struct("=I")
+_S32 = struct.Struct("=i")
+_U32_PAIR = struct.Struct("=II")
+_U32_TRIPLE = struct.Struct("=III")
+
+BRIDGE_KIND = b"bridge"
+
+# Bridge options in IFLA_INFO_DATA, indexed by the file names used in
+# /sys/class/net/<bridge>/bridge/. Time values are in USER_HZ like sysfs.
+_BRIDGE_OPTIONS = {
+    IFLA_BR_FORWARD_DELAY: ("forward_delay", "=I"),
+    IFLA_BR_HELLO_TIME: ("hello_time", "=I"),
+    IFLA_BR_MAX_AGE: ("max_age", "=I"),
+    IFLA_BR_AGEING_TIME: ("ageing_time", "=I"),
+    IFLA_BR_STP_STATE: ("stp_state", "=I"),
+    IFLA_BR_PRIORITY: ("priority", "=H"),
+    IFLA_BR_VLAN_FILTERING: ("vlan_filtering", "=B"),
+    IFLA_BR_GROUP_FWD_MASK: ("group_fwd_mask", "=H"),
+    IFLA_BR_HELLO_TIMER: ("hello_timer", "=Q"),
+    IFLA_BR_GC_TIMER: ("gc_timer", "=Q"),
+    IFLA_BR_MCAST_ROUTER: ("multicast_router", "=B"),
+    IFLA_BR_MCAST_SNOOPING: ("multicast_snooping", "=B"),
+    IFLA_BR_MCAST_QUERY_USE_IFADDR: ("multicast_query_use_ifaddr", "=B"),
+    IFLA_BR_MCAST_QUERIER: ("multicast_querier", "=B"),
+    IFLA_BR_MCAST_HASH_ELASTICITY: ("hash_elasticity", "=I"),
+    IFLA_BR_MCAST_HASH_MAX: ("hash_max", "=I"),
+    IFLA_BR_MCAST_LAST_MEMBER_CNT: ("multicast_last_member_count", "=I"),
+    IFLA_BR_MCAST_STARTUP_QUERY_CNT: ("multicast_startup_query_count", "=I"),
+    IFLA_BR_MCAST_LAST_MEMBER_INTVL: ("multicast_last_member_interval", "=Q"),
+    IFLA_BR_MCAST_MEMBERSHIP_INTVL: ("multicast_membership_interval", "=Q"),
+    IFLA_BR_MCAST_QUERIER_INTVL: ("multicast_querier_interval", "=Q"),
+    IFLA_BR_MCAST_QUERY_INTVL: ("multicast_query_interval", "=Q"),
+    IFLA_BR_MCAST_QUERY_RESPONSE_INTVL: (
+        "multicast_query_response_interval",
+        "=Q",
+    ),
+    IFLA_BR_MCAST_STARTUP_QUERY_INTVL: (
+        "multicast_startup_query_interval",
+        "=Q",
+    ),
+}
+
+# Bridge port options in IFLA_PROTINFO, indexed by the file names
+# used in /sys/class/net/<port>/brport/.
+_BRIDGE_PORT_OPTIONS = {
+    IFLA_BRPORT_PRIORITY: ("priority", "=H"),
+    IFLA_BRPORT_COST: ("path_cost", "=I"),
+    IFLA_BRPORT_MODE: ("hairpin_mode", "=B"),
+}
+
+_RECV_BUFFER_SIZE = 32768
+# The kernel replies to rtnetlink requests synchronously, a reply not
+# received in time means something is broken and the caller should fall
+# back to other means.
+_RECV_TIMEOUT = 5
+# Replies not matching the request sequence number are discarded, limit them
+# to avoid looping forever on a socket flooded with unexpected messages.
+_MAX_UNEXPECTED_REPLIES = 1024
+
+
+class VfInfo:
+    VF = "vf"
+    MAC = "mac"
+    SPOOF_CHECK = "spoofchk"
+    TRUST = "trust"
+    MIN_TX_RATE = "min_tx_rate"
+    MAX_TX_RATE = "max_tx_rate"
+
+
+class NetlinkRoute:
+    """
+    A NETLINK_ROUTE socket. The socket is opened on the first request and
+    could be reused for multiple requests until `close()` is invoked.
+    """
+
+    def __init__(self):
+        self._sock = None
+        self._seq = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    @property
+    def _socket(self):
+        if self._sock is None:
+            sock = socket.socket(
+                socket.AF_NETLINK,
+                socket.SOCK_RAW | socket.SOCK_CLOEXEC,
+                socket.NETLINK_ROUTE,
+            )
+            try:
+                sock.settimeout(_RECV_TIMEOUT)
+                sock.bind((0, 0))
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def get_link(self, ifname, ext_mask=0):
+        """
+        Return the attributes of specified link as dictionary indexed by
+        IFLA_* type.
+        Raise OSError on failure, e.g. ENODEV if link does not exist.
+        """
+        payload = (
+            _IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+            + pack_attr(IFLA_IFNAME, ifname.encode("utf-8") + b"\0")
+            + pack_attr(IFLA_EXT_MASK, _U32.pack(ext_mask))
+        )
+        for msg_type, body in self.request(RTM_GETLINK, 0, payload):
+            if msg_type == RTM_NEWLINK:
+                return parse_attrs(body[IFINFOMSG_SIZE:])
+        return {}
+
+    def dump_bridge_ports(self):
+        """
+        Return the attributes of all bridge ports. The IFLA_MASTER holds the
+        interface index of the bridge and IFLA_PROTINFO holds the
+        IFLA_BRPORT_* attributes.
+        """
+        payload = _IFINFOMSG.pack(socket.AF_BRIDGE, 0, 0, 0, 0)
+        return [
+            parse_attrs(body[IFINFOMSG_SIZE:])
+            for msg_type, body in self.request(
+                RTM_GETLINK, NLM_F_DUMP, payload
+            )
+            if msg_type == RTM_NEWLINK
+        ]
+
+    def request(self, msg_type, flags, payload):
+        """
+        Send a request and return the replies as list of
+        (message type, message body).
+        Raise OSError on failure, socket.timeout if no reply is received in
+        time.
+        """
+        sock = self._socket
+        self._seq += 1
+        seq = self._seq
+        sock.send(
+            _NLMSGHDR.pack(
+                _NLMSGHDR.size + len(payload),
+                msg_type,
+                flags | NLM_F_REQUEST,
+                seq,
+                0,
+            )
+            + payload
+        )
+
+        replies = []
+        unexpected_count = 0
+        while True:
+            try:
+                data = self._recv()
+            except socket.timeout:
+                # Stale replies of this request should not confuse the next
+                # one.
+                self.close()
+                raise
+            for reply in parse_messages(data):
+                reply_type, reply_flags, reply_seq, body = reply
+                if reply_seq != seq:
+                    unexpected_count += 1
+                    if unexpected_count > _MAX_UNEXPECTED_REPLIES:
+                        self.close()
+                        raise OSError(
+                            errno.EPROTO,
+                            "Too many netlink replies not matching the "
+                            f"request sequence number {seq}",
+                        )
+                    continue
+                if reply_type == NLMSG_DONE:
+                    return replies
+                if reply_type == NLMSG_ERROR:
+                    (error,) = _S32.unpack_from(body)
+                    if error:
+                        raise OSError(-error, os.strerror(-error))
+                    return replies
+                replies.append((reply_type, body))
+                if not reply_flags & NLM_F_MULTI:
+                    return replies
+
+    def _recv(self):
+        # The VF information of a PF with lots of VFs could be larger than
+        # the default buffer, peek the message first to find out the size.
+        sock = self._socket
+        bufsize = _RECV_BUFFER_SIZE
+        while True:
+            _, _, msg_flags, _ = sock.recvmsg(bufsize, 0, socket.MSG_PEEK)
+            if not msg_flags & socket.MSG_TRUNC:
+                return sock.recv(bufsize)
+            bufsize *= 2
+
+
+def pack_attr(attr_type, data):
+    length = _NLATTR.size + len(data)
+    return (
+        _NLATTR.pack(length, attr_type)
+        + data
+        + b"\0" * (_align(length) - length)
+    )
+
+
+def parse_messages(data):
+    """
+    Yield (type, flags, sequence number, body) of each netlink message.
+    """
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, flags, seq, _ = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size or offset + length > len(data):
+            break
+        body_start = offset + _NLMSGHDR.size
+        offset += length
+        yield msg_type, flags, seq, data[body_start:offset]
+        offset = _align(offset)
+
+
+def iter_attrs(data):
+    """
+    Yield (type, payload) of each netlink attribute with the NLA_F_NESTED and
+    NLA_F_NET_BYTEORDER flags removed from type.
+    """
+    offset = 0
+    while offset + _NLATTR.size <= len(data):
+        length, attr_type = _NLATTR.unpack_from(data, offset)
+        if length < _NLATTR.size or offset + length > len(data):
+            break
+        payload_start = offset + _NLATTR.size
+        offset += length
+        yield attr_type & NLA_TYPE_MASK, data[payload_start:offset]
+        offset = _align(offset)
+
+
+def parse_attrs(data, wanted=None):
+    """
+    Return dictionary of netlink attribute payloads indexed by type.
+    When `wanted` set of types is defined, parsing stops once all of them are
+    found.
+    This is the hot path when decoding dumps, hence not using `iter_attrs()`.
+    """
+    attrs = {}
+    remains = len(wanted) if wanted else -1
+    offset = 0
+    end = len(data)
+    unpack_from = _NLATTR.unpack_from
+    while offset + _NLATTR.size <= end:
+        length, attr_type = unpack_from(data, offset)
+        if length < _NLATTR.size or offset + length > end:
+            break
+        attr_type &= NLA_TYPE_MASK
+        payload_start = offset + _NLATTR.size
+        offset += length
+        if remains < 0:
+            attrs[attr_type] = data[payload_start:offset]
+        elif attr_type in wanted:
+            attrs[attr_type] = data[payload_start:offset]
+            remains -= 1
+            if not remains:
+                break
+        offset = (offset + 3) & ~3
+    return attrs
+
+
+def parse_vfs_info(link_attrs):
+    """
+    Decode the IFLA_VFINFO_LIST attribute of a link requested with
+    RTEXT_FILTER_VF into a list of dictionary using VfInfo keys.
+    Return None if the link does not have IFLA_VFINFO_LIST attribute.
+    """
+    vfinfo_list = link_attrs.get(IFLA_VFINFO_LIST)
+    if vfinfo_list is None:
+        return None
+    mac_len = len(link_attrs.get(IFLA_ADDRESS, b"")) or ETH_ALEN
+
+    vfs = []
+    for attr_type, data in iter_attrs(vfinfo_list):
+        if attr_type == IFLA_VF_INFO:
+            vfs.append(_parse_vf_info(parse_attrs(data), mac_len))
+    return vfs
+
+
+def get_ifname(link_attrs):
+    return link_attrs[IFLA_IFNAME].rstrip(b"\0").decode("utf-8")
+
+
+def get_master(link_attrs):
+    return _get_u32(link_attrs, IFLA_MASTER)
+
+
+def parse_bridge_options(link_attrs):
+    """
+    Decode the IFLA_INFO_DATA of a bridge into dictionary indexed by the
+    file names of /sys/class/net/<bridge>/bridge/.
+    Return None if the link is not a bridge.
+    """
+    linkinfo = parse_attrs(link_attrs.get(IFLA_LINKINFO, b""))
+    if _get_string(linkinfo, IFLA_INFO_KIND) != BRIDGE_KIND:
+        return None
+    data = parse_attrs(linkinfo.get(IFLA_INFO_DATA, b""))
+    options = _parse_options(data, _BRIDGE_OPTIONS)
+    if IFLA_BR_GROUP_ADDR in data:
+        options["group_addr"] = ":".join(
+            f"{octet:02x}" for octet in data[IFLA_BR_GROUP_ADDR][:ETH_ALEN]
+        )
+    return options
+
+
+def parse_bridge_port_options(link_attrs):
+    """
+    Decode the IFLA_PROTINFO of a bridge port returned by
+    `NetlinkRoute.dump_bridge_ports()` into dictionary indexed by the file
+    names of /sys/class/net/<port>/brport/.
+    Return None if the link does not have IFLA_PROTINFO attribute.
+    """
+    protinfo = link_attrs.get(IFLA_PROTINFO)
+    if protinfo is None:
+        return None
+    return _parse_options(
+        parse_attrs(protinfo, _BRIDGE_PORT_OPTIONS.keys()),
+        _BRIDGE_PORT_OPTIONS,
+    )
+
+
+def _parse_options(attrs, options_map):
+    options = {}
+    for attr_type, (name, fmt) in options_map.items():
+        if attr_type in attrs:
+            (options[name],) = struct.unpack_from(fmt, attrs[attr_type])
+    return options
+
+
+def _get_string(attrs, attr_type):
+    value = attrs.get(attr_type)
+    return value.rstrip(b"\0") if value is not None else None
+
+
+def _get_u32(attrs, attr_type):
+    value = attrs.get(attr_type)
+    return _U32.unpack_from(value)[0] if value is not None else None
+
+
+def _parse_vf_info(attrs, mac_len):
+    vf = {}
+    if IFLA_VF_MAC in attrs:
+        vf[VfInfo.VF], mac = struct.unpack_from(
+            f"=I{mac_len}s", attrs[IFLA_VF_MAC]
+        )
+        vf[VfInfo.MAC] = ":".join(f"{octet:02X}" for octet in mac)
+
+    for attr_type, key in (
+        (IFLA_VF_SPOOFCHK, VfInfo.SPOOF_CHECK),
+        (IFLA_VF_TRUST, VfInfo.TRUST),
+    ):
+        if attr_type in attrs:
+            vf_id, setting = _U32_PAIR.unpack_from(attrs[attr_type])
+            vf[VfInfo.VF] = vf_id
+            if setting != VF_SETTING_UNSUPPORTED:
+                vf[key] = bool(setting)
+
+    if IFLA_VF_RATE in attrs:
+        vf_id, min_tx_rate, max_tx_rate = _U32_TRIPLE.unpack_from(
+            attrs[IFLA_VF_RATE]
+        )
+        vf[VfInfo.VF] = vf_id
+        vf[VfInfo.MIN_TX_RATE] = min_tx_rate
+        vf[VfInfo.MAX_TX_RATE] = max_tx_rate
+    elif IFLA_VF_TX_RATE in attrs:
+        vf_id, rate = _U32_PAIR.unpack_from(attrs[IFLA_VF_TX_RATE])
+        vf[VfInfo.VF] = vf_id
+        vf[VfInfo.MAX_TX_RATE] = rate
+
+    return vf
+
+
+def _align(length):
+    return (length + 3) & ~3
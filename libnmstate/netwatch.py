@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from copy import deepcopy
+from operator import attrgetter
+from operator import itemgetter
+
+from libnmstate.error import NmstateNotSupportedError
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import Route
+
+from .nmstate import plugin_context
+from .nmstate import show_with_plugins
+from .plugin import NmstatePlugin
+from .state import InterfaceFilter
+
+# Wake up periodically even without any change, so that signals like SIGINT
+# are handled.
+WAKEUP_INTERVAL = 1
+
+
+def watch(*, include_status_data=False, interfaces=None, full_snapshot=False):
+    """
+    Yield the network state report on every change of the system.
+    The first report is the full report of `libnmstate.show()`. Each
+    following report only holds the changed interfaces and the changed
+    sections of routes, route rules and DNS, unless full_snapshot is set.
+    A removed interface is reported with the absent state.
+    Only the interfaces noticed as changed are collected again.
+    The include_status_data and interfaces arguments are the same as
+    `libnmstate.show()`.
+    """
+    with plugin_context() as plugins:
+        yield from watch_with_plugins(
+            plugins,
+            include_status_data=include_status_data,
+            interfaces=interfaces,
+            full_snapshot=full_snapshot,
+        )
+
+
+def watch_with_plugins(
+    plugins, *, include_status_data=False, interfaces=None, full_snapshot=False
+):
+    watch_plugins = [
+        plugin
+        for plugin in plugins
+        if NmstatePlugin.PLUGIN_CAPABILITY_WATCH in plugin.plugin_capabilities
+    ]
+    if not watch_plugins:
+        raise NmstateNotSupportedError(
+            "No plugin is capable of watching network state changes"
+        )
+    watch_plugin = max(watch_plugins, key=attrgetter("priority"))
+    if isinstance(interfaces, str):
+        interfaces = [interfaces]
+    iface_filter = InterfaceFilter(interfaces) if interfaces else None
+
+    watch_plugin.start_watch()
+    try:
+        report = show_with_plugins(plugins, include_status_data, interfaces)
+        if Route.KEY in report:
+            report[Route.KEY] = _merge_routes(report[Route.KEY], {}, set())
+        yield deepcopy(report)
+        while True:
+            changed_ifaces = watch_plugin.wait_for_changes(WAKEUP_INTERVAL)
+            if changed_ifaces is None:
+                continue
+            if iface_filter:
+                changed_ifaces = {
+                    iface_name
+                    for iface_name in changed_ifaces
+                    if iface_filter.match(iface_name)
+                }
+            changes = _update_report(
+                plugins, report, changed_ifaces, include_status_data
+            )
+            if changes:
+                yield deepcopy(report) if full_snapshot else changes
+    finally:
+        watch_plugin.stop_watch()
+
+
+def _update_report(plugins, report, changed_ifaces, include_status_data):
+    """
+    Collect the changed interfaces and update the report in place.
+    Return the changed parts of the report.
+    """
+    new_report = show_with_plugins(
+        plugins, include_status_data, sorted(changed_ifaces)
+    )
+    changes = {}
+
+    ifaces = {iface[Interface.NAME]: iface for iface in report[Interface.KEY]}
+    new_ifaces = {
+        iface[Interface.NAME]: iface for iface in new_report[Interface.KEY]
+    }
+    changed_iface_states = []
+    for iface_name in sorted(changed_ifaces):
+        iface = ifaces.get(iface_name)
+        new_iface = new_ifaces.get(iface_name)
+        if iface == new_iface:
+            continue
+        if new_iface:
+            ifaces[iface_name] = new_iface
+            changed_iface_states.append(new_iface)
+        else:
+            del ifaces[iface_name]
+            changed_iface_states.append(
+                {
+                    Interface.NAME: iface_name,
+                    Interface.STATE: InterfaceState.ABSENT,
+                }
+            )
+    if changed_iface_states:
+        report[Interface.KEY] = sorted(
+            ifaces.values(), key=itemgetter(Interface.NAME)
+        )
+        changes[Interface.KEY] = changed_iface_states
+
+    if Route.KEY in new_report:
+        routes = _merge_routes(
+            report.get(Route.KEY, {}), new_report[Route.KEY], changed_ifaces
+        )
+        if routes != report.get(Route.KEY):
+            report[Route.KEY] = routes
+            changes[Route.KEY] = routes
+
+    # Route rules, DNS and capabilities are not bound to interface, they are
+    # always collected in full.
+    for key, value in new_report.items():
+        if key not in (Interface.KEY, Route.KEY) and report.get(key) != value:
+            report[key] = value
+            changes[key] = value
+
+    return changes
+
+
+def _merge_routes(routes, new_routes, changed_ifaces):
+    """
+    Replace the routes of changed interfaces with the new ones.
+    """
+    merged_routes = {}
+    for route_type in set(routes) | set(new_routes):
+        merged_routes[route_type] = sorted(
+            [
+                route
+                for route in routes.get(route_type, [])
+                if route.get(Route.NEXT_HOP_INTERFACE) not in changed_ifaces
+            ]
+            + new_routes.get(route_type, []),
+            key=_route_sort_key,
+        )
+    return merged_routes
+
+
+def _route_sort_key(route):
+    return (
+        route.get(Route.NEXT_HOP_INTERFACE, ""),
+        route.get(Route.TABLE_ID, 0),
+        route.get(Route.DESTINATION, ""),
+        route.get(Route.NEXT_HOP_ADDRESS, ""),
+        route.get(Route.METRIC, 0),
+    )
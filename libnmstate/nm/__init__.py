@@ -24,6 +24,7 @@ from . import checkpoint
 from . import connection
 from . import device
 from . import dns
+from . import index
 from . import ipv4
 from . import ipv6
 from . import ovs
@@ -41,6 +42,7 @@ checkpoint
 connection
 device
 dns
+index
 ipv4
 ipv6
 ovs
@@ -18,18 +18,23 @@
 #
 
 from distutils.version import StrictVersion
+import functools
 import logging
 import itertools
 
 from libnmstate.error import NmstateNotSupportedError
 from libnmstate.error import NmstateValueError
+from libnmstate.schema import DNS
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceState
 from libnmstate.schema import InterfaceType
 from libnmstate.schema import LinuxBridge as LB
 from libnmstate.schema import OVSBridge as OvsB
 from libnmstate.schema import OVSInterface
-from libnmstate.schema import Team
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+from libnmstate.schema import VLAN
+from libnmstate.schema import VXLAN
 from libnmstate.ifaces.bond import BondIface
 from libnmstate.ifaces.bridge import BridgeIface
 
@@ -51,23 +56,117 @@ from . import wired
 from .common import NM
 from .dns import get_dns_config_iface_names
 from .device import is_externally_managed
+from .scheduler import ActionScheduler
 
 
 MAXIMUM_INTERFACE_LENGTH = 15
 
+# The kinds of scheduled actions in `_set_ifaces_admin_state()`
+_ACTIVATE = "activate"
+_DEACTIVATE = "deactivate"
+_DEACTIVATE_BEFOREHAND = "deactivate-beforehand"
+_DELETE_DOWN_PROFILE = "delete-down-profile"
+_DELETE_PROFILE = "delete-profile"
+_DELETE_DEVICE = "delete-device"
+_SAVE_PROFILE = "save-profile"
+_MANAGE = "manage"
+_ACTIVATE_BEFOREHAND = "activate-beforehand"
+
+# The kinds of other operations reported by `plan_changes()`
+_ADD_PROFILE = "add-profile"
+_UPDATE_PROFILE = "update-profile"
+_REAPPLY = "reapply"
+
 MASTER_METADATA = "_master"
 MASTER_TYPE_METADATA = "_master_type"
-MASTER_IFACE_TYPES = (
-    InterfaceType.OVS_BRIDGE,
-    bond.BOND_TYPE,
-    LB.TYPE,
-    Team.TYPE,
-)
 
 
 def apply_changes(context, net_state, save_to_disk):
-    con_profiles = []
+    ifaces_desired_state = _get_ifaces_desired_state(
+        context, net_state, save_to_disk
+    )
+    profile_actions, con_profiles, unchanged_ifaces = _get_profile_actions(
+        context, net_state, ifaces_desired_state, save_to_disk
+    )
+    _set_ifaces_admin_state(
+        context,
+        ifaces_desired_state,
+        con_profiles,
+        unchanged_ifaces,
+        profile_actions,
+    )
+    context.wait_all_finish()
+
+
+def plan_changes(context, net_state, save_to_disk):
+    """
+    Return the NM operations `apply_changes()` would do in order, as a list
+    of (operation, interface name), without changing anything.
+    The operations are ordered by their dependencies, `apply_changes()` may
+    run the independent ones in parallel.
+    """
+    ifaces_desired_state = _get_ifaces_desired_state(
+        context, net_state, save_to_disk
+    )
+    profile_actions, con_profiles, unchanged_ifaces = _get_profile_actions(
+        context, net_state, ifaces_desired_state, save_to_disk
+    )
+    scheduler, operations = _get_admin_state_actions(
+        context,
+        ifaces_desired_state,
+        con_profiles,
+        unchanged_ifaces,
+        profile_actions,
+    )
+    return [
+        operation
+        for key in scheduler.plan()
+        for operation in operations.get(key, [key])
+    ]
+
+
+def is_applied(context, net_state, save_to_disk):
+    """
+    Return whether all the interfaces holding the desired state are activated
+    with a profile owned by NetworkManager and stored as requested by
+    `save_to_disk`.
+    """
+    for ifname in _get_iface_names_holding_state(context, net_state):
+        nmdev = context.get_nm_dev(ifname)
+        if not nmdev or is_externally_managed(nmdev):
+            return False
+        profile = context.index.profile(nmdev)
+        if not profile:
+            return False
+        con_profile = connection.ConnectionProfile(context, profile=profile)
+        if bool(con_profile.is_memory_only) == save_to_disk:
+            return False
+    return True
+
+
+def _get_iface_names_holding_state(context, net_state):
+    iface_names = {
+        iface_state[Interface.NAME]
+        for iface_state in net_state.ifaces.state_to_edit
+    }
+    desire_state = net_state.desire_state
+    routes = []
+    if Route.KEY in desire_state:
+        routes.extend(desire_state[Route.KEY].get(Route.CONFIG, []))
+    if RouteRule.KEY in desire_state:
+        # Route rules are stored in the profile holding their route table.
+        routes.extend(
+            net_state.current_state.get(Route.KEY, {}).get(Route.CONFIG, [])
+        )
+    for route in routes:
+        if route.get(Route.NEXT_HOP_INTERFACE):
+            iface_names.add(route[Route.NEXT_HOP_INTERFACE])
+    if DNS.KEY in desire_state:
+        iface_names.update(get_dns_config_iface_names(context))
+    return iface_names
 
+
+def _get_ifaces_desired_state(context, net_state, save_to_disk):
     if (
         not save_to_disk
         and _has_ovs_interface_desired_or_changed(net_state)
@@ -86,7 +185,20 @@ def apply_changes(context, net_state, save_to_disk):
     ifaces_desired_state.extend(
         _create_proxy_ifaces_desired_state(ifaces_desired_state)
     )
+    return ifaces_desired_state
+
 
+def _get_profile_actions(
+    context, net_state, ifaces_desired_state, save_to_disk
+):
+    """
+    Return the profile actions as a list of (operation, interface name,
+    function invoking it), the profiles of interfaces and the interfaces
+    with current profile identical to the desired one.
+    """
+    profile_actions = []
+    con_profiles = []
+    unchanged_ifaces = set()
     for iface_desired_state in filter(
         lambda s: s.get(Interface.STATE) != InterfaceState.ABSENT,
         ifaces_desired_state,
@@ -100,19 +212,20 @@ def apply_changes(context, net_state, save_to_disk):
         else:
             # Profile for virtual interface will remove interface when down
             # hence search on existing NM.RemoteConnections
-            con_profile = context.client.get_connection_by_id(ifname)
-            if con_profile and con_profile.get_interface_name() == ifname:
+            con_profile = _get_iface_profile_by_id(context, ifname)
+            if con_profile:
                 cur_con_profile = connection.ConnectionProfile(
                     context, profile=con_profile
                 )
 
         if save_to_disk:
             # TODO: Need handle save_to_disk=False
-            connection.delete_iface_profiles_except(
+            for con in connection.list_iface_profiles_except(
                 context,
                 ifname,
                 cur_con_profile.profile if cur_con_profile else None,
-            )
+            ):
+                profile_actions.append((_DELETE_PROFILE, ifname, con.delete))
 
         original_desired_iface_state = {}
         if net_state.ifaces.get(ifname):
@@ -132,6 +245,7 @@ def apply_changes(context, net_state, save_to_disk):
                 # We don't need to do this once we support querying on-disk
                 # configure
                 con_profiles.append(cur_con_profile)
+                unchanged_ifaces.add(ifname)
                 continue
         new_con_profile = _build_connection_profile(
             context,
@@ -143,19 +257,59 @@ def apply_changes(context, net_state, save_to_disk):
             set_conn = new_con_profile.profile.get_setting_connection()
             set_conn.props.interface_name = iface_desired_state[Interface.NAME]
         if cur_con_profile and cur_con_profile.profile:
-            cur_con_profile.update(new_con_profile, save_to_disk)
+            is_same_storage = (
+                bool(cur_con_profile.is_memory_only) != save_to_disk
+            )
+            if is_same_storage and cur_con_profile.has_same_settings(
+                new_con_profile
+            ):
+                logging.debug(
+                    f"Profile of interface {ifname} is unchanged, "
+                    "skip updating it"
+                )
+                con_profiles.append(cur_con_profile)
+                unchanged_ifaces.add(ifname)
+                continue
+            profile_actions.append(
+                (
+                    _UPDATE_PROFILE,
+                    ifname,
+                    functools.partial(
+                        cur_con_profile.update, new_con_profile, save_to_disk
+                    ),
+                )
+            )
             con_profiles.append(new_con_profile)
         else:
             # Missing connection, attempting to create a new one.
-            new_con_profile.add(save_to_disk)
+            profile_actions.append(
+                (
+                    _ADD_PROFILE,
+                    ifname,
+                    functools.partial(new_con_profile.add, save_to_disk),
+                )
+            )
             con_profiles.append(new_con_profile)
-    context.wait_all_finish()
+    return profile_actions, con_profiles, unchanged_ifaces
 
-    _set_ifaces_admin_state(context, ifaces_desired_state, con_profiles)
-    context.wait_all_finish()
+
+def _get_iface_profile_by_id(context, ifname):
+    """
+    Return the NM.RemoteConnection bound to the interface and named after it.
+    """
+    for profile in context.index.iface_profiles(ifname):
+        if profile.get_id() == ifname:
+            return profile
+    return None
 
 
-def _set_ifaces_admin_state(context, ifaces_desired_state, con_profiles):
+def _set_ifaces_admin_state(
+    context,
+    ifaces_desired_state,
+    con_profiles,
+    unchanged_ifaces=(),
+    profile_actions=(),
+):
     """
     Control interface admin state by activating, deactivating and deleting
     devices connection profiles.
@@ -167,33 +321,55 @@ def _set_ifaces_admin_state(context, ifaces_desired_state, con_profiles):
     new connection profile. For existing devices, the device is activated,
     leaving it to choose the correct profile.
 
-    In order to activate correctly the interfaces, the order is significant:
-    - Master-less master interfaces.
-    - New interfaces (virtual interfaces, but not OVS ones).
-    - Master interfaces.
-    - OVS ports.
-    - OVS internal.
-    - All the rest.
+    The `profile_actions` saving the profiles are scheduled per interface.
+    The activations are scheduled as a dependency graph, each interface is
+    activated once its own profile is saved and these interfaces are
+    activated:
+    - Its master, including the OVS bridge of OVS port and the OVS port of
+      OVS interface.
+    - Its parent, the base interface of VLAN or VXLAN.
+    The deactivations start after all activations, followed by the profile
+    and device deletions.
+
+    The interfaces in `unchanged_ifaces` are not reapplied if already
+    activated with their profile and none of their dependencies are
+    activated again.
     """
+    scheduler, _ = _get_admin_state_actions(
+        context,
+        ifaces_desired_state,
+        con_profiles,
+        unchanged_ifaces,
+        profile_actions,
+    )
+    scheduler.run()
+
+
+def _get_admin_state_actions(
+    context,
+    ifaces_desired_state,
+    con_profiles,
+    unchanged_ifaces,
+    profile_actions,
+):
+    """
+    Return the ActionScheduler holding the actions and the list of
+    (operation, interface name) of the scheduled actions whose key is not
+    the operation.
+    """
+    operations = {}
     con_profiles_by_devname = _index_profiles_by_devname(con_profiles)
     new_ifaces = _get_new_ifaces(context, con_profiles)
-    new_ifaces_to_activate = set()
-    new_vlan_ifaces_to_activate = set()
-    new_vxlan_ifaces_to_activate = set()
-    new_ovs_interface_to_activate = set()
-    new_ovs_port_to_activate = set()
-    new_master_not_enslaved_ifaces = set()
-    master_ifaces_to_edit = set()
-    ifaces_to_edit = set()
+    ifaces_to_activate = {}
+    ifaces_to_edit = {}
     devs_to_deactivate = {}
     devs_to_delete_profile = {}
     devs_to_delete = {}
     devs_to_deactivate_beforehand = []
     profiles_to_delete = []
+    devs_to_manage = []
     devs_to_activate_beforehand = []
 
-    current_profiles = context.client.get_connections()
-
     for iface_desired_state in ifaces_desired_state:
         ifname = iface_desired_state[Interface.NAME]
         nmdev = context.get_nm_dev(ifname)
@@ -202,41 +378,16 @@ def _set_ifaces_admin_state(context, ifaces_desired_state, con_profiles):
                 ifname in new_ifaces
                 and iface_desired_state[Interface.STATE] == InterfaceState.UP
             ):
-                if _is_master_iface(
-                    iface_desired_state
-                ) and not _is_slave_iface(iface_desired_state):
-                    new_master_not_enslaved_ifaces.add(ifname)
-                elif (
-                    iface_desired_state[Interface.TYPE]
-                    == InterfaceType.OVS_INTERFACE
-                ):
-                    new_ovs_interface_to_activate.add(ifname)
-                elif (
-                    iface_desired_state[Interface.TYPE]
-                    == InterfaceType.OVS_PORT
-                ):
-                    new_ovs_port_to_activate.add(ifname)
-                elif iface_desired_state[Interface.TYPE] == InterfaceType.VLAN:
-                    new_vlan_ifaces_to_activate.add(ifname)
-                elif (
-                    iface_desired_state[Interface.TYPE] == InterfaceType.VXLAN
-                ):
-                    new_vxlan_ifaces_to_activate.add(ifname)
-                else:
-                    new_ifaces_to_activate.add(ifname)
+                ifaces_to_activate[ifname] = iface_desired_state
             elif iface_desired_state[Interface.STATE] == InterfaceState.ABSENT:
                 # Delete the down profiles
-                iface_name = iface_desired_state[Interface.NAME]
-                for current_profile in current_profiles:
-                    if current_profile.get_interface_name() == iface_name:
-                        profile = connection.ConnectionProfile(
-                            context, current_profile
-                        )
-                        profiles_to_delete.append(profile)
+                profiles_to_delete.extend(
+                    connection.list_connections_by_ifname(context, ifname)
+                )
 
         else:
             if not nmdev.get_managed():
-                nmdev.set_managed(True)
+                devs_to_manage.append(nmdev)
                 if iface_desired_state[Interface.STATE] == InterfaceState.DOWN:
                     devs_to_activate_beforehand.append(nmdev)
             if iface_desired_state[Interface.STATE] == InterfaceState.UP:
@@ -257,14 +408,11 @@ def _set_ifaces_admin_state(context, ifaces_desired_state, con_profiles):
                         )
                         devs_to_deactivate_beforehand.append(nmdev)
 
-                if _is_master_iface(iface_desired_state):
-                    master_ifaces_to_edit.add(
-                        (nmdev, con_profiles_by_devname[ifname].profile)
-                    )
-                else:
-                    ifaces_to_edit.add(
-                        (nmdev, con_profiles_by_devname[ifname].profile)
-                    )
+                ifaces_to_edit[ifname] = (
+                    iface_desired_state,
+                    nmdev,
+                    con_profiles_by_devname[ifname].profile,
+                )
             elif iface_desired_state[Interface.STATE] in (
                 InterfaceState.DOWN,
                 InterfaceState.ABSENT,
@@ -297,68 +445,224 @@ def _set_ifaces_admin_state(context, ifaces_desired_state, con_profiles):
                     )
                 )
 
-    for nmdev in devs_to_activate_beforehand:
-        profile = connection.ConnectionProfile(context)
-        profile.con_id = nmdev.get_iface()
-        profile.activate()
-    context.wait_all_finish()
+    # Do not remove devices that are marked for editing.
+    for ifname in ifaces_to_edit:
+        devs_to_deactivate.pop(ifname, None)
+        devs_to_delete_profile.pop(ifname, None)
+        devs_to_delete.pop(ifname, None)
+
+    for ifname in _get_ifaces_to_skip_reapply(
+        unchanged_ifaces,
+        ifaces_to_activate,
+        ifaces_to_edit,
+        devs_to_deactivate_beforehand,
+    ):
+        logging.debug(f"Interface {ifname} is unchanged, skip reapplying it")
+        iface_desired_state, dev, _ = ifaces_to_edit[ifname]
+        ifaces_to_edit[ifname] = (iface_desired_state, dev, None)
+
+    scheduler = ActionScheduler(context)
+    profile_saves = []
+    for ifname, actions in _group_profile_actions(profile_actions).items():
+        profile_saves.append((_SAVE_PROFILE, ifname))
+        scheduler.add(
+            (_SAVE_PROFILE, ifname),
+            functools.partial(_issue_all, [issue for _, _, issue in actions]),
+        )
+        operations[(_SAVE_PROFILE, ifname)] = [
+            (operation, ifname) for operation, _, _ in actions
+        ]
+
+    # Devices are managed and activated beforehand ahead of any other
+    # action on devices.
+    pre_actions = []
+    for dev in devs_to_manage:
+        ifname = dev.get_iface()
+        scheduler.add(
+            (_MANAGE, ifname),
+            functools.partial(dev.set_managed, True),
+            after=[(_SAVE_PROFILE, ifname)],
+        )
+        pre_actions.append((_MANAGE, ifname))
+    for dev in devs_to_activate_beforehand:
+        ifname = dev.get_iface()
+        scheduler.add(
+            (_ACTIVATE_BEFOREHAND, ifname),
+            functools.partial(_activate_beforehand, context, dev),
+            after=[(_SAVE_PROFILE, ifname), (_MANAGE, ifname)],
+        )
+        pre_actions.append((_ACTIVATE_BEFOREHAND, ifname))
 
     for dev in devs_to_deactivate_beforehand:
-        device.deactivate(context, dev)
+        scheduler.add(
+            (_DEACTIVATE_BEFOREHAND, dev.get_iface()),
+            functools.partial(device.deactivate, context, dev),
+            after=pre_actions,
+        )
 
-    # Do not remove devices that are marked for editing.
-    for dev, _ in itertools.chain(master_ifaces_to_edit, ifaces_to_edit):
-        devs_to_deactivate.pop(dev.get_iface(), None)
-        devs_to_delete_profile.pop(dev.get_iface(), None)
-        devs_to_delete.pop(dev.get_iface(), None)
+    down_profile_deletions = []
+    for index, profile in enumerate(profiles_to_delete):
+        scheduler.add(
+            (_DELETE_DOWN_PROFILE, index), profile.delete, after=pre_actions
+        )
+        down_profile_deletions.append((_DELETE_DOWN_PROFILE, index))
+        operations[(_DELETE_DOWN_PROFILE, index)] = [
+            (_DELETE_PROFILE, profile.devname)
+        ]
 
-    for profile in profiles_to_delete:
-        profile.delete()
-        context.wait_all_finish()
+    for ifname, iface_desired_state in ifaces_to_activate.items():
+        scheduler.add(
+            (_ACTIVATE, ifname),
+            functools.partial(
+                device.activate, context, dev=None, connection_id=ifname
+            ),
+            after=_get_activation_dependencies(iface_desired_state)
+            + _get_profile_dependencies(ifname, iface_desired_state)
+            + down_profile_deletions
+            + pre_actions,
+        )
 
-    for ifname in new_master_not_enslaved_ifaces:
-        device.activate(context, dev=None, connection_id=ifname)
-    context.wait_all_finish()
+    for ifname, (iface_desired_state, dev, profile) in ifaces_to_edit.items():
+        if profile is None:
+            continue
+        scheduler.add(
+            (_ACTIVATE, ifname),
+            functools.partial(device.modify, context, dev, profile),
+            after=_get_activation_dependencies(iface_desired_state)
+            + _get_profile_dependencies(ifname, iface_desired_state)
+            + down_profile_deletions
+            + pre_actions
+            + [(_DEACTIVATE_BEFOREHAND, ifname)],
+        )
+        operations[(_ACTIVATE, ifname)] = [(_REAPPLY, ifname)]
 
-    for ifname in new_ifaces_to_activate:
-        device.activate(context, dev=None, connection_id=ifname)
-    context.wait_all_finish()
+    activations = [
+        (_ACTIVATE, ifname)
+        for ifname in itertools.chain(ifaces_to_activate, ifaces_to_edit)
+        if ifname in ifaces_to_activate or ifaces_to_edit[ifname][2]
+    ]
+    deactivations = [(_DEACTIVATE, ifname) for ifname in devs_to_deactivate]
+    profile_deletions = [
+        (_DELETE_PROFILE, ifname) for ifname in devs_to_delete_profile
+    ]
+    for ifname, dev in devs_to_deactivate.items():
+        scheduler.add(
+            (_DEACTIVATE, ifname),
+            functools.partial(device.deactivate, context, dev),
+            after=activations + profile_saves + pre_actions,
+        )
+    for ifname, dev in devs_to_delete_profile.items():
+        scheduler.add(
+            (_DELETE_PROFILE, ifname),
+            functools.partial(device.delete, context, dev),
+            after=activations + deactivations + profile_saves + pre_actions,
+        )
+    for ifname, dev in devs_to_delete.items():
+        scheduler.add(
+            (_DELETE_DEVICE, ifname),
+            functools.partial(device.delete_device, context, dev),
+            after=activations
+            + deactivations
+            + profile_deletions
+            + profile_saves
+            + pre_actions,
+        )
 
-    for dev, con_profile in master_ifaces_to_edit:
-        device.modify(context, dev, con_profile)
-    context.wait_all_finish()
+    return scheduler, operations
 
-    for ifname in new_ovs_port_to_activate:
-        device.activate(context, dev=None, connection_id=ifname)
-    context.wait_all_finish()
 
-    for ifname in new_ovs_interface_to_activate:
-        device.activate(context, dev=None, connection_id=ifname)
-    context.wait_all_finish()
+def _group_profile_actions(profile_actions):
+    """
+    Return the profile actions grouped by interface name, keeping the order.
+    """
+    actions_by_ifname = {}
+    for action in profile_actions:
+        actions_by_ifname.setdefault(action[1], []).append(action)
+    return actions_by_ifname
 
-    for dev, con_profile in ifaces_to_edit:
-        device.modify(context, dev, con_profile)
-    context.wait_all_finish()
 
-    for ifname in new_vlan_ifaces_to_activate:
-        device.activate(context, dev=None, connection_id=ifname)
-    context.wait_all_finish()
+def _issue_all(issues):
+    for issue in issues:
+        issue()
 
-    for ifname in new_vxlan_ifaces_to_activate:
-        device.activate(context, dev=None, connection_id=ifname)
-    context.wait_all_finish()
 
-    for dev in devs_to_deactivate.values():
-        device.deactivate(context, dev)
-    context.wait_all_finish()
+def _get_profile_dependencies(ifname, iface_desired_state):
+    """
+    The interface is activated once its own profile and the profiles of the
+    interfaces it depends on are saved.
+    """
+    return [(_SAVE_PROFILE, ifname)] + [
+        (_SAVE_PROFILE, dep_ifname)
+        for _, dep_ifname in _get_activation_dependencies(iface_desired_state)
+    ]
 
-    for dev in devs_to_delete_profile.values():
-        device.delete(context, dev)
-    context.wait_all_finish()
 
-    for dev in devs_to_delete.values():
-        device.delete_device(context, dev)
-    context.wait_all_finish()
+def _activate_beforehand(context, nmdev):
+    profile = connection.ConnectionProfile(context)
+    profile.con_id = nmdev.get_iface()
+    profile.activate()
+
+
+def _get_ifaces_to_skip_reapply(
+    unchanged_ifaces,
+    ifaces_to_activate,
+    ifaces_to_edit,
+    devs_to_deactivate_beforehand,
+):
+    """
+    Return the unchanged interfaces which are already activated with their
+    profile. An interface is still reapplied when any interface it depends
+    on, for example its master, is activated again.
+    """
+    candidates = set()
+    for ifname, (_, nmdev, profile) in ifaces_to_edit.items():
+        nm_ac = nmdev.get_active_connection()
+        if (
+            ifname in unchanged_ifaces
+            and nmdev not in devs_to_deactivate_beforehand
+            and connection.is_activated(nm_ac, nmdev)
+            and nm_ac.get_uuid() == profile.get_uuid()
+        ):
+            candidates.add(ifname)
+
+    while True:
+        activated = set(ifaces_to_activate) | (
+            set(ifaces_to_edit) - candidates
+        )
+        reactivated = {
+            ifname
+            for ifname in candidates
+            if any(
+                dep_ifname in activated
+                for _, dep_ifname in _get_activation_dependencies(
+                    ifaces_to_edit[ifname][0]
+                )
+            )
+        }
+        if not reactivated:
+            return candidates
+        candidates -= reactivated
+
+
+def _get_activation_dependencies(iface_desired_state):
+    dependencies = []
+    master = iface_desired_state.get(MASTER_METADATA)
+    if master:
+        dependencies.append((_ACTIVATE, master))
+    iface_type = iface_desired_state.get(Interface.TYPE)
+    if iface_type == InterfaceType.VLAN:
+        parent = iface_desired_state.get(VLAN.CONFIG_SUBTREE, {}).get(
+            VLAN.BASE_IFACE
+        )
+    elif iface_type == InterfaceType.VXLAN:
+        parent = iface_desired_state.get(VXLAN.CONFIG_SUBTREE, {}).get(
+            VXLAN.BASE_IFACE
+        )
+    else:
+        parent = None
+    if parent:
+        dependencies.append((_ACTIVATE, parent))
+    return dependencies
 
 
 def _index_profiles_by_devname(con_profiles):
@@ -379,14 +683,6 @@ def _get_new_ifaces(context, con_profiles):
     return ifaces_without_device
 
 
-def _is_master_iface(iface_state):
-    return iface_state[Interface.TYPE] in MASTER_IFACE_TYPES
-
-
-def _is_slave_iface(iface_state):
-    return iface_state.get(MASTER_METADATA)
-
-
 def _get_affected_devices(context, iface_state):
     nmdev = context.get_nm_dev(iface_state[Interface.NAME])
     devs = []
@@ -597,10 +893,7 @@ def _preapply_dns_fix(context, net_state):
      * When DNS configuration changed, include old interface which is holding
        DNS configuration, so it's DNS configure could be removed.
     """
-    cur_dns_iface_names = get_dns_config_iface_names(
-        ipv4.acs_and_ip_profiles(context.client),
-        ipv6.acs_and_ip_profiles(context.client),
-    )
+    cur_dns_iface_names = get_dns_config_iface_names(context)
 
     # Whether to mark interface as changed which is used for holding old DNS
     # configurations
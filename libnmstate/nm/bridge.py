@@ -17,10 +17,13 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+from collections import namedtuple
 import glob
+import logging
 import os
+import socket
 
-from libnmstate.nm import connection
+from libnmstate import netlink
 from libnmstate.nm.bridge_port_vlan import PortVlanFilter
 from libnmstate.schema import LinuxBridge as LB
 from .common import NM
@@ -34,6 +37,8 @@ BRIDGE_PORT_NMSTATE_TO_SYSFS = {
     LB.Port.STP_PRIORITY: "priority",
 }
 
+BridgePort = namedtuple("BridgePort", ("name", "options"))
+
 SYSFS_USER_HZ_KEYS = [
     "forward_delay",
     "ageing_time",
@@ -191,13 +196,13 @@ def get_info(context, nmdev):
     if not bridge_setting:
         return info
 
-    port_profiles_by_name = _get_slave_profiles_by_name(nmdev)
-    port_names_sysfs = _get_slaves_names_from_sysfs(nmdev.get_iface())
-    props = _get_sysfs_bridge_options(nmdev.get_iface())
+    iface_name = context.index.iface_name(nmdev)
+    port_profiles_by_name = _get_slave_profiles_by_name(context, nmdev)
+    props, ports = _get_bridge_state(context, iface_name)
     info[LB.CONFIG_SUBTREE] = {
         LB.PORT_SUBTREE: _get_bridge_ports_info(
             port_profiles_by_name,
-            port_names_sysfs,
+            ports,
             vlan_filtering_enabled=bridge_setting.get_vlan_filtering(),
         ),
         LB.OPTIONS_SUBTREE: {
@@ -230,18 +235,17 @@ def get_slaves(nm_device):
 
 def _get_bridge_setting(context, nmdev):
     bridge_setting = None
-    bridge_con_profile = connection.ConnectionProfile(context)
-    bridge_con_profile.import_by_device(nmdev)
-    if bridge_con_profile.profile:
-        bridge_setting = bridge_con_profile.profile.get_setting_bridge()
+    profile = context.index.profile(nmdev)
+    if profile:
+        bridge_setting = profile.get_setting_bridge()
     return bridge_setting
 
 
 def _get_bridge_ports_info(
-    port_profiles_by_name, port_names_sysfs, vlan_filtering_enabled=False
+    port_profiles_by_name, ports, vlan_filtering_enabled=False
 ):
     ports_info_by_name = {
-        name: _get_bridge_port_info(name) for name in port_names_sysfs
+        port.name: _get_bridge_port_info(port) for port in ports
     }
 
     for name, p in port_profiles_by_name.items():
@@ -255,28 +259,78 @@ def _get_bridge_ports_info(
     return list(ports_info_by_name.values())
 
 
-def _get_slave_profiles_by_name(master_device):
+def _get_slave_profiles_by_name(context, master_device):
     slaves_profiles_by_name = {}
+    index = context.index
     for dev in master_device.get_slaves():
-        active_con = connection.get_device_active_connection(dev)
-        if active_con:
-            slaves_profiles_by_name[
-                dev.get_iface()
-            ] = active_con.props.connection
+        profile = index.profile(dev)
+        if profile:
+            slaves_profiles_by_name[index.iface_name(dev)] = profile
     return slaves_profiles_by_name
 
 
-def _get_bridge_port_info(port_name):
-    """Report port runtime information from sysfs."""
-    port = {LB.Port.NAME: port_name}
+def _get_bridge_port_info(port):
+    port_info = {LB.Port.NAME: port.name}
     for option, option_sysfs in BRIDGE_PORT_NMSTATE_TO_SYSFS.items():
+        option_value = port.options[option_sysfs]
+        if option == LB.Port.STP_HAIRPIN_MODE:
+            option_value = bool(option_value)
+        port_info[option] = option_value
+    return port_info
+
+
+def _get_bridge_state(context, iface_name):
+    """
+    Return the bridge options indexed by sysfs names and the list of
+    BridgePort. The kernel is queried via netlink with fallback to sysfs.
+    """
+    try:
+        bridge_state = _get_bridge_state_from_netlink(
+            context.index, iface_name
+        )
+    except OSError as e:
+        logging.debug(
+            f"Failed to query bridge {iface_name} via netlink: {e}, "
+            "falling back to sysfs"
+        )
+        bridge_state = None
+    if bridge_state is None:
+        bridge_state = _get_bridge_state_from_sysfs(iface_name)
+    return bridge_state
+
+
+def _get_bridge_state_from_netlink(index, iface_name):
+    options = netlink.parse_bridge_options(index.netlink.get_link(iface_name))
+    if options is None:
+        return None
+    _convert_user_hz_options(options)
+
+    ports = []
+    for link_attrs in index.bridge_ports(socket.if_nametoindex(iface_name)):
+        port_options = netlink.parse_bridge_port_options(link_attrs)
+        if port_options is not None:
+            ports.append(
+                BridgePort(netlink.get_ifname(link_attrs), port_options)
+            )
+    return options, ports
+
+
+def _get_bridge_state_from_sysfs(iface_name):
+    ports = [
+        BridgePort(port_name, _get_sysfs_bridge_port_options(port_name))
+        for port_name in _get_slaves_names_from_sysfs(iface_name)
+    ]
+    return _get_sysfs_bridge_options(iface_name), ports
+
+
+def _get_sysfs_bridge_port_options(port_name):
+    """Report port runtime information from sysfs."""
+    options = {}
+    for option_sysfs in BRIDGE_PORT_NMSTATE_TO_SYSFS.values():
         sysfs_path = f"/sys/class/net/{port_name}/brport/{option_sysfs}"
         with open(sysfs_path) as f:
-            option_value = int(f.read())
-            if option == LB.Port.STP_HAIRPIN_MODE:
-                option_value = bool(option_value)
-        port[option] = option_value
-    return port
+            options[option_sysfs] = int(f.read())
+    return options
 
 
 def _get_slaves_names_from_sysfs(master):
@@ -294,7 +348,6 @@ def _get_slaves_names_from_sysfs(master):
 
 
 def _get_sysfs_bridge_options(iface_name):
-    user_hz = os.sysconf("SC_CLK_TCK")
     options = {}
     for sysfs_file_path in glob.iglob(f"/sys/class/net/{iface_name}/bridge/*"):
         key = os.path.basename(sysfs_file_path)
@@ -305,7 +358,12 @@ def _get_sysfs_bridge_options(iface_name):
                 options[key] = int(value, base=0)
         except Exception:
             pass
-    for key, value in options.items():
-        if key in SYSFS_USER_HZ_KEYS:
-            options[key] = int(value / user_hz)
+    _convert_user_hz_options(options)
     return options
+
+
+def _convert_user_hz_options(options):
+    user_hz = os.sysconf("SC_CLK_TCK")
+    for key in SYSFS_USER_HZ_KEYS:
+        if key in options:
+            options[key] = int(options[key] / user_hz)
@@ -38,23 +38,31 @@ class CheckPoint:
         self._timeout = timeout
         self._dbuspath = dbuspath
         self._timeout_source = None
+        self._devs = []
 
     def __str__(self):
         return self._dbuspath
 
     @staticmethod
-    def create(nm_context, timeout=60):
+    def create(nm_context, timeout=60, iface_names=None):
+        """
+        Create checkpoint for the devices of iface_names, or for all devices
+        if iface_names is None.
+        """
         cp = CheckPoint(nm_context=nm_context, timeout=timeout)
+        if iface_names is not None:
+            cp._devs = _get_checkpoint_devices(nm_context, iface_names)
         cp._create()
         return cp
 
     def _create(self):
-        devs = []
+        devs = self._devs
         timeout = self._timeout
-        cp_flags = (
-            common.NM.CheckpointCreateFlags.DELETE_NEW_CONNECTIONS
-            | common.NM.CheckpointCreateFlags.DISCONNECT_NEW_DEVICES
-        )
+        cp_flags = common.NM.CheckpointCreateFlags.DELETE_NEW_CONNECTIONS
+        if not devs:
+            # The empty device list means all devices. With a device list,
+            # NetworkManager treats every device not in it as a new device.
+            cp_flags |= common.NM.CheckpointCreateFlags.DISCONNECT_NEW_DEVICES
 
         self._ctx.register_async("Create checkpoint")
         self._ctx.client.checkpoint_create(
@@ -129,10 +137,12 @@ class CheckPoint:
             cp = client.checkpoint_create_finish(result)
             if cp:
                 self._dbuspath = cp.get_path()
+                if self._devs:
+                    dev_names = ", ".join(d.get_iface() for d in self._devs)
+                else:
+                    dev_names = "all devices"
                 logging.debug(
-                    "Checkpoint {} created for all devices".format(
-                        self._dbuspath
-                    )
+                    f"Checkpoint {self._dbuspath} created for {dev_names}"
                 )
                 self._ctx.finish_async("Create checkpoint")
             else:
@@ -224,3 +234,33 @@ class CheckPoint:
                     f"error={e}"
                 )
             )
+
+
+def _get_checkpoint_devices(context, iface_names):
+    """
+    Return the NM devices of iface_names, or an empty list meaning all devices
+    when any of them has no device or is OpenvSwitch related, as the OVS port
+    devices are not visible as interfaces.
+    """
+    ovs_dev_types = (
+        common.NM.DeviceType.OVS_BRIDGE,
+        common.NM.DeviceType.OVS_PORT,
+        common.NM.DeviceType.OVS_INTERFACE,
+    )
+    devs = []
+    for iface_name in sorted(iface_names):
+        nmdev = context.get_nm_dev(iface_name)
+        if not nmdev:
+            logging.debug(
+                f"Interface {iface_name} has no device, creating checkpoint "
+                "for all devices"
+            )
+            return []
+        if nmdev.get_device_type() in ovs_dev_types:
+            logging.debug(
+                f"Interface {iface_name} is OpenvSwitch related, creating "
+                "checkpoint for all devices"
+            )
+            return []
+        devs.append(nmdev)
+    return devs
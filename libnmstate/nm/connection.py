@@ -24,6 +24,7 @@ from libnmstate.error import NmstateLibnmError
 from libnmstate.error import NmstateInternalError
 from libnmstate.error import NmstateValueError
 
+from .common import GLib
 from .common import NM
 from . import ipv4
 from . import ipv6
@@ -66,7 +67,7 @@ class ConnectionProfile:
         else:
             flags |= NM.SettingsUpdate2Flags.IN_MEMORY
         action = f"Update profile: {self.profile.get_id()}"
-        user_data = action
+        user_data = action, con_profile.devname
         args = None
 
         self._ctx.register_async(action, fast=True)
@@ -153,6 +154,28 @@ class ConnectionProfile:
             user_data,
         )
 
+    def has_same_settings(self, con_profile):
+        """
+        Whether the settings of con_profile are semantically identical to
+        this profile. The con_profile is compared after normalization, the
+        same as NetworkManager does when receiving it.
+        """
+        if not self.profile or not con_profile.profile:
+            return False
+        new_profile = NM.SimpleConnection.new_clone(con_profile.profile)
+        try:
+            new_profile.normalize()
+        except GLib.Error as e:
+            logging.debug(
+                f"Failed to normalize profile {new_profile.get_id()}: {e}"
+            )
+            return False
+        return self.profile.compare(
+            new_profile,
+            NM.SettingCompareFlags.IGNORE_TIMESTAMP
+            | NM.SettingCompareFlags.IGNORE_SECRETS,
+        )
+
     @property
     def profile(self):
         return self._con_profile
@@ -410,12 +433,13 @@ class ConnectionProfile:
                 )
             )
         else:
+            self._ctx.index.profile_added(profile)
             self._ctx.finish_async(action)
 
     def _update2_callback(self, src_object, result, user_data):
         if self._ctx.is_cancelled():
             return
-        action = user_data
+        action, iface_name = user_data
         try:
             ret = src_object.update2_finish(result)
         except Exception as e:
@@ -431,6 +455,7 @@ class ConnectionProfile:
                 )
             )
         else:
+            self._ctx.index.profile_updated(src_object, iface_name)
             self._ctx.finish_async(action)
 
     def _delete_connection_callback(self, src_object, result, user_data):
@@ -444,6 +469,7 @@ class ConnectionProfile:
             return
 
         if success:
+            self._ctx.index.profile_deleted(src_object)
             self._ctx.finish_async(action)
         else:
             self._ctx.fail(
@@ -506,21 +532,22 @@ def get_device_active_connection(nm_device):
     return active_conn
 
 
-def delete_iface_profiles_except(context, ifname, excluded_profile):
-    for con in list_connections_by_ifname(context, ifname):
+def list_iface_profiles_except(context, ifname, excluded_profile):
+    return [
+        con
+        for con in list_connections_by_ifname(context, ifname)
         if (
             not excluded_profile
             or not con.profile
             or con.profile.get_uuid() != excluded_profile.get_uuid()
-        ):
-            con.delete()
+        )
+    ]
 
 
 def list_connections_by_ifname(context, ifname):
     return [
         ConnectionProfile(context, profile=con)
-        for con in context.client.get_connections()
-        if con.get_interface_name() == ifname
+        for con in context.index.iface_profiles(ifname)
     ]
 
 
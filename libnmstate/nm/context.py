@@ -22,10 +22,12 @@ import logging
 
 from libnmstate.error import NmstateInternalError
 from libnmstate.error import NmstateTimeoutError
+from libnmstate.error import NmstateValueError
 
 from .common import NM
 from .common import GLib
 from .common import Gio
+from .index import DeviceIndex
 
 # Interval for idle checker to check on whether timeout should trigger since
 # last finish async action.
@@ -37,12 +39,32 @@ IDLE_TIMEOUT = 25
 # NetworkManage is using dbus in libnm while the dbus has limitation on
 # maximum number of pending replies per connection.(RHEL/CentOS 8 is 1024)
 # Hence limit the synchronous queue size
+DBUS_MAX_PENDING_REPLIES = 1024
 SLOW_ASYNC_QUEUE_SIZE = 100
 FAST_ASYNC_QUEUE_SIZE = 300
 
 
 class NmContext:
-    def __init__(self):
+    def __init__(
+        self,
+        slow_queue_size=SLOW_ASYNC_QUEUE_SIZE,
+        fast_queue_size=FAST_ASYNC_QUEUE_SIZE,
+    ):
+        """
+        The slow_queue_size and fast_queue_size are the maximum numbers of
+        async actions in flight. Once full, registering new async action
+        blocks till any action of the same queue finished.
+        """
+        if slow_queue_size < 1 or fast_queue_size < 1:
+            raise NmstateValueError("The async queue size should be positive")
+        if slow_queue_size + fast_queue_size > DBUS_MAX_PENDING_REPLIES:
+            raise NmstateValueError(
+                f"The sum of async queue sizes {slow_queue_size} and "
+                f"{fast_queue_size} exceeds the D-Bus limitation of "
+                f"{DBUS_MAX_PENDING_REPLIES} pending replies"
+            )
+        self._slow_queue_size = slow_queue_size
+        self._fast_queue_size = fast_queue_size
         self._client = NM.Client.new(cancellable=None)
         self._context = self._client.get_main_context()
         self._quitting = False
@@ -52,12 +74,22 @@ class NmContext:
         self._last_async_finish_time = None
         self._fast_queue = None
         self._slow_queue = None
+        self._index = None
+        self._async_groups = None
+        self._action_groups = None
+        self._issuing_group = None
+        self._finishing_group = None
         self._init_queue()
         self._init_cancellable()
 
     def _init_queue(self):
         self._fast_queue = set()
         self._slow_queue = set()
+        # Group -> (finish callback, registered but unfinished actions)
+        self._async_groups = {}
+        # Action -> group
+        self._action_groups = {}
+        self._finishing_group = None
 
     def _init_cancellable(self):
         self._cancellable = Gio.Cancellable.new()
@@ -80,7 +112,18 @@ class NmContext:
             )
         return self._context
 
+    @property
+    def index(self):
+        """
+        The DeviceIndex of current NM.Client content. It is discarded by
+        `refresh_content()`.
+        """
+        if self._index is None:
+            self._index = DeviceIndex(self)
+        return self._index
+
     def refresh_content(self):
+        self._del_index()
         if self.context:
             while self.context.iteration(False):
                 pass
@@ -88,6 +131,7 @@ class NmContext:
     def clean_up(self):
         if self._cancellable:
             self._cancellable.cancel()
+        self._del_index()
         self._del_timeout()
         self._del_client()
         self._context = None
@@ -118,6 +162,11 @@ class NmContext:
                 logging.error("BUG: NM.Client is not cleaned")
             self._context = None
 
+    def _del_index(self):
+        if self._index:
+            self._index.close()
+            self._index = None
+
     def _del_timeout(self):
         if self._timeout_source:
             self._timeout_source.destroy()
@@ -130,15 +179,13 @@ class NmContext:
         for example: profile modification.
         """
         queue = self._fast_queue if fast else self._slow_queue
-        max_queue = FAST_ASYNC_QUEUE_SIZE if fast else SLOW_ASYNC_QUEUE_SIZE
+        max_queue = self._fast_queue_size if fast else self._slow_queue_size
         if len(queue) >= max_queue:
             logging.debug(
-                f"Async queue({max_queue}) full, waiting all existing actions "
+                f"Async queue({max_queue}) full, waiting any existing action "
                 "to be finished before registering more async action"
             )
-            # TODO: No need to wait all finish, should continue when the queue
-            #       is considerably empty and ready for new async action.
-            self.wait_all_finish()
+            self._wait(lambda: len(queue) < max_queue)
 
         if action in self._fast_queue or action in self._slow_queue:
             raise NmstateInternalError(
@@ -148,6 +195,14 @@ class NmContext:
         logging.debug(f"Async action: {action} started")
         queue.add(action)
 
+        # Actions registered by the callback of a grouped action, for example
+        # the activation fallback of a failed reapply, belong to the same
+        # group.
+        group = self._issuing_group or self._finishing_group
+        if group is not None:
+            self._action_groups[action] = group
+            self._async_groups[group][1].add(action)
+
     def finish_async(self, action, suppress_log=False):
         """
         Mark action(string) as finished.
@@ -157,13 +212,56 @@ class NmContext:
             logging.debug(f"Async action: {action} finished")
         self._fast_queue.discard(action)
         self._slow_queue.discard(action)
+        group = self._action_groups.pop(action, None)
+        if group is not None:
+            self._async_groups[group][1].discard(action)
+            self._finishing_group = group
+
+    def start_async_group(self, group, issue, finish_callback):
+        """
+        Invoke `issue()` and track the async actions registered by it and by
+        their callbacks as the group(hashable). Once all of them finished,
+        `finish_callback(group)` is invoked by `wait_all_finish()`, which is
+        the place to start the actions depending on this group.
+        """
+        if group in self._async_groups:
+            raise NmstateInternalError(
+                f"BUG: An existing async group {group} is already started"
+            )
+        self._async_groups[group] = (finish_callback, set())
+        self._issuing_group = group
+        try:
+            issue()
+        finally:
+            self._issuing_group = None
+
+    def _finish_async_groups(self):
+        # The group finish callbacks are not invoked when waiting on full
+        # queue in the middle of issuing actions of another group.
+        if self._issuing_group is not None:
+            return
+        self._finishing_group = None
+        while True:
+            finished_groups = [
+                group
+                for group, (_, actions) in self._async_groups.items()
+                if not actions
+            ]
+            if not finished_groups:
+                break
+            for group in finished_groups:
+                finish_callback, _ = self._async_groups.pop(group)
+                finish_callback(group)
 
     def _action_all_finished(self):
         return not (len(self._fast_queue) or len(self._slow_queue))
 
     def _idle_timeout_cb(self, _user_data):
-        if self._error or self._action_all_finished():
+        if self._error:
             return GLib.SOURCE_REMOVE
+        elif self._action_all_finished():
+            # The finish callback of async group might register more
+            return GLib.SOURCE_CONTINUE
         idle_time = datetime.datetime.now() - self._last_async_finish_time
         if idle_time > datetime.timedelta(seconds=IDLE_TIMEOUT):
             remaining_actions = self._slow_queue | self._fast_queue
@@ -192,19 +290,41 @@ class NmContext:
         """
         Block till all async actions been marked as finished via
         `finish_async()` or anyone failed by `fail()`.
+        The finish callbacks of async groups are invoked in the meantime.
+        """
+        self._finish_async_groups()
+        self._wait(self._action_all_finished, finish_groups=True)
+
+    def _wait(self, condition, finish_groups=False):
+        """
+        Iterate the main context till condition() is True or any action
+        failed by `fail()`.
         """
         self._last_async_finish_time = datetime.datetime.now()
-        if not self._action_all_finished():
-            self._timeout_source = GLib.timeout_source_new(
-                IDLE_CHECK_INTERNAL * 1000
-            )
-            user_data = None
-            self._timeout_source.set_callback(self._idle_timeout_cb, user_data)
-            self._timeout_source.attach(self._context)
+        if not condition() and not self._error:
+            # The timeout source is shared when waiting for queue room in the
+            # middle of waiting all actions to finish.
+            own_timeout_source = self._timeout_source is None
+            if own_timeout_source:
+                self._timeout_source = GLib.timeout_source_new(
+                    IDLE_CHECK_INTERNAL * 1000
+                )
+                user_data = None
+                self._timeout_source.set_callback(
+                    self._idle_timeout_cb, user_data
+                )
+                self._timeout_source.attach(self._context)
 
-            while not self._action_all_finished() and not self._error:
-                self.context.iteration(True)
-            self._del_timeout()
+            try:
+                while not condition() and not self._error:
+                    self.context.iteration(True)
+                    # The callbacks of a single iteration are done, it is
+                    # safe to tell whether a group is finished.
+                    if finish_groups and not self._error:
+                        self._finish_async_groups()
+            finally:
+                if own_timeout_source:
+                    self._del_timeout()
 
         if self._error:
             # The queue and error should be flush and perpare for another run
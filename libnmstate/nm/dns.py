@@ -17,14 +17,13 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
-from itertools import chain
 from operator import itemgetter
 
 from libnmstate import iplib
 from libnmstate.dns import DnsState
 from libnmstate.error import NmstateInternalError
-from libnmstate.nm import active_connection as nm_ac
 from libnmstate.schema import DNS
+from libnmstate.schema import Interface
 
 
 DNS_DEFAULT_PRIORITY_VPN = 50
@@ -66,10 +65,10 @@ def get_running(context):
     return dns_state
 
 
-def get_config(acs_and_ipv4_profiles, acs_and_ipv6_profiles):
+def get_config(context):
     dns_conf = {DNS.SERVER: [], DNS.SEARCH: []}
     tmp_dns_confs = []
-    for ac, ip_profile in chain(acs_and_ipv6_profiles, acs_and_ipv4_profiles):
+    for ac, ip_profile in _acs_and_ip_profiles(context):
         if not ip_profile.props.dns and not ip_profile.props.dns_search:
             continue
         priority = ip_profile.props.dns_priority
@@ -113,12 +112,17 @@ def add_dns(setting_ip, dns_state):
         setting_ip.add_dns_search(search)
 
 
-def get_dns_config_iface_names(acs_and_ipv4_profiles, acs_and_ipv6_profiles):
+def get_dns_config_iface_names(context):
     """
     Return a list of interface names which hold static DNS configuration.
     """
     iface_names = []
-    for ac, ip_profile in chain(acs_and_ipv6_profiles, acs_and_ipv4_profiles):
+    for ac, ip_profile in _acs_and_ip_profiles(context):
         if ip_profile.props.dns or ip_profile.props.dns_search:
-            iface_names.append(nm_ac.ActiveConnection(nm_ac_con=ac).devname)
+            iface_names.append(context.index.ac_iface_name(ac))
     return iface_names
+
+
+def _acs_and_ip_profiles(context):
+    yield from context.index.acs_and_ip_profiles(Interface.IPV6)
+    yield from context.index.acs_and_ip_profiles(Interface.IPV4)
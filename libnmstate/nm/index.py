@@ -0,0 +1,301 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from collections import defaultdict
+
+from libnmstate import netlink
+from libnmstate.ethtool import Ethtool
+from libnmstate.ifaces.ovs import is_ovs_running
+from libnmstate.schema import Interface
+
+from .profile import get_all_applied_configs
+
+
+class DeviceIndex:
+    """
+    Cache of the relationship between NM objects:
+        device -> active connection -> profile -> IPv4/IPv6 setting
+        device -> applied config
+        interface name -> UUID -> profile
+        interface name -> ethtool link settings
+        bridge interface index -> netlink attributes of bridge ports
+        whether OVS database server is running
+    The libnm property lookup is done at most once per object. The index
+    should be closed and discarded when NM.Client content is refreshed.
+    """
+
+    def __init__(self, context):
+        self._ctx = context
+        self._devices = None
+        self._dev_names = {}
+        self._acs = {}
+        self._ac_dev_names = {}
+        self._ac_profiles = {}
+        self._ip_profiles = {}
+        self._active_connections = None
+        self._applied_configs = {}
+        self._applied_config_devs = set()
+        self._netlink = None
+        self._ethtool = None
+        self._link_settings = {}
+        self._bridge_ports = None
+        self._iface_profiles = None
+        self._profile_keys = None
+        self._ovs_running = None
+
+    def close(self):
+        if self._netlink:
+            self._netlink.close()
+            self._netlink = None
+        if self._ethtool:
+            self._ethtool.close()
+            self._ethtool = None
+
+    @property
+    def netlink(self):
+        """
+        The rtnetlink socket shared by the collectors querying kernel for
+        information NetworkManager is not providing.
+        """
+        if self._netlink is None:
+            self._netlink = netlink.NetlinkRoute()
+        return self._netlink
+
+    @property
+    def ethtool(self):
+        """
+        The SIOCETHTOOL socket shared by the collectors querying kernel for
+        link settings.
+        """
+        if self._ethtool is None:
+            self._ethtool = Ethtool()
+        return self._ethtool
+
+    @property
+    def ovs_running(self):
+        if self._ovs_running is None:
+            self._ovs_running = is_ovs_running()
+        return self._ovs_running
+
+    @property
+    def devices(self):
+        if self._devices is None:
+            self._devices = self._ctx.client.get_devices()
+        return self._devices
+
+    def iface_name(self, nmdev):
+        try:
+            return self._dev_names[nmdev]
+        except KeyError:
+            iface_name = nmdev.get_iface()
+            self._dev_names[nmdev] = iface_name
+            return iface_name
+
+    def active_connection(self, nmdev):
+        """
+        Return the NM.ActiveConnection of specified NM.Device or None.
+        """
+        if nmdev is None:
+            return None
+        try:
+            return self._acs[nmdev]
+        except KeyError:
+            ac = nmdev.get_active_connection()
+            self._acs[nmdev] = ac
+            return ac
+
+    def profile(self, nmdev):
+        """
+        Return the NM.RemoteConnection activated on specified NM.Device or
+        None.
+        """
+        return self.ac_profile(self.active_connection(nmdev))
+
+    @property
+    def active_connections(self):
+        if self._active_connections is None:
+            self._active_connections = (
+                self._ctx.client.get_active_connections()
+            )
+        return self._active_connections
+
+    def ac_iface_name(self, ac):
+        """
+        Return the interface name of the first device of specified
+        NM.ActiveConnection or None.
+        """
+        try:
+            return self._ac_dev_names[ac]
+        except KeyError:
+            nmdevs = ac.get_devices()
+            iface_name = self.iface_name(nmdevs[0]) if nmdevs else None
+            self._ac_dev_names[ac] = iface_name
+            return iface_name
+
+    def ac_profile(self, ac):
+        if ac is None:
+            return None
+        try:
+            return self._ac_profiles[ac]
+        except KeyError:
+            profile = ac.get_connection()
+            self._ac_profiles[ac] = profile
+            return profile
+
+    def ip_profile(self, ac, family):
+        """
+        Return the NM.SettingIP4Config or NM.SettingIP6Config of the profile
+        activated by specified NM.ActiveConnection.
+        The family should be Interface.IPV4 or Interface.IPV6.
+        """
+        key = (ac, family)
+        try:
+            return self._ip_profiles[key]
+        except KeyError:
+            profile = self.ac_profile(ac)
+            ip_profile = None
+            if profile:
+                if family == Interface.IPV4:
+                    ip_profile = profile.get_setting_ip4_config()
+                else:
+                    ip_profile = profile.get_setting_ip6_config()
+            self._ip_profiles[key] = ip_profile
+            return ip_profile
+
+    def acs_and_ip_profiles(self, family):
+        for ac in self.active_connections:
+            ip_profile = self.ip_profile(ac, family)
+            if ip_profile:
+                yield ac, ip_profile
+
+    def load_applied_configs(self, nmdevs=None):
+        """
+        Retrieve the applied configs of specified devices(default to all
+        devices) in a single batch of asynchronous calls.
+        """
+        if nmdevs is None:
+            nmdevs = self.devices
+        nmdevs = [
+            nmdev for nmdev in nmdevs if nmdev not in self._applied_config_devs
+        ]
+        if nmdevs:
+            self._applied_configs.update(
+                get_all_applied_configs(self._ctx, nmdevs)
+            )
+            self._applied_config_devs.update(nmdevs)
+
+    def applied_config(self, iface_name):
+        """
+        Return the applied config of specified interface or None.
+        The `load_applied_configs()` should be invoked before this.
+        """
+        return self._applied_configs.get(iface_name)
+
+    def load_link_settings(self, iface_names):
+        """
+        Retrieve the ethtool link settings of specified interfaces over a
+        single socket.
+        """
+        iface_names = [
+            iface_name
+            for iface_name in iface_names
+            if iface_name not in self._link_settings
+        ]
+        if iface_names:
+            self._link_settings.update(
+                self.ethtool.get_all_link_settings(iface_names)
+            )
+
+    def link_settings(self, iface_name):
+        """
+        Return the ethtool link settings of specified interface. Please refer
+        to `libnmstate.ethtool.minimal_ethtool()` for the content.
+        """
+        self.load_link_settings([iface_name])
+        return self._link_settings[iface_name]
+
+    def bridge_ports(self, master):
+        """
+        Return the netlink attributes of the ports attached to specified
+        bridge interface index. The ports of all bridges are retrieved by a
+        single netlink dump.
+        """
+        if self._bridge_ports is None:
+            bridge_ports = defaultdict(list)
+            for link_attrs in self.netlink.dump_bridge_ports():
+                bridge_ports[netlink.get_master(link_attrs)].append(link_attrs)
+            self._bridge_ports = bridge_ports
+        return self._bridge_ports.get(master, [])
+
+    def iface_profiles(self, iface_name):
+        """
+        Return the NM.RemoteConnection list bound to specified interface name.
+        """
+        self._load_profiles()
+        return list(self._iface_profiles.get(iface_name, {}).values())
+
+    def profile_added(self, profile):
+        """
+        Track the NM.RemoteConnection added after the index was loaded.
+        """
+        if self._profile_keys is not None:
+            self._add_profile(profile)
+
+    def profile_deleted(self, profile):
+        """
+        Stop tracking the NM.RemoteConnection deleted after the index was
+        loaded.
+        """
+        if self._profile_keys is not None:
+            self._remove_profile(profile)
+
+    def profile_updated(self, profile, iface_name):
+        """
+        Re-index the NM.RemoteConnection updated after the index was loaded
+        under the interface name of its new settings, which the
+        NM.RemoteConnection might not reflect yet.
+        """
+        if self._profile_keys is not None:
+            self._remove_profile(profile)
+            self._add_profile(profile, iface_name)
+
+    def _load_profiles(self):
+        if self._profile_keys is None:
+            self._iface_profiles = {}
+            self._profile_keys = {}
+            for profile in self._ctx.client.get_connections():
+                self._add_profile(profile)
+
+    def _add_profile(self, profile, iface_name=None):
+        if profile in self._profile_keys:
+            return
+        if iface_name is None:
+            iface_name = profile.get_interface_name()
+        uuid = profile.get_uuid()
+        self._profile_keys[profile] = (iface_name, uuid)
+        self._iface_profiles.setdefault(iface_name, {})[uuid] = profile
+
+    def _remove_profile(self, profile):
+        if profile not in self._profile_keys:
+            return
+        iface_name, uuid = self._profile_keys.pop(profile)
+        iface_profiles = self._iface_profiles.get(iface_name, {})
+        iface_profiles.pop(uuid, None)
+        if not iface_profiles:
+            self._iface_profiles.pop(iface_name, None)
@@ -21,6 +21,7 @@ import socket
 
 from libnmstate.nm import dns as nm_dns
 from libnmstate.nm import route as nm_route
+from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceIPv4
 from libnmstate.schema import Route
 
@@ -160,28 +161,31 @@ def get_ip_profile(active_connection):
     return None
 
 
-def get_route_running(context):
-    return nm_route.get_running(_acs_and_ip_cfgs(context))
+def get_route_running(context, iface_filter=None):
+    return nm_route.get_running(_ifaces_and_ip_cfgs(context), iface_filter)
 
 
-def get_route_config(context):
-    return nm_route.get_config(acs_and_ip_profiles(context))
+def get_route_config(context, iface_filter=None):
+    return nm_route.get_config(_ifaces_and_ip_profiles(context), iface_filter)
 
 
-def _acs_and_ip_cfgs(nm_client):
-    for ac in nm_client.get_active_connections():
+def _ifaces_and_ip_cfgs(context):
+    index = context.index
+    for ac in index.active_connections:
         ip_cfg = ac.get_ip4_config()
         if not ip_cfg:
             continue
-        yield ac, ip_cfg
+        yield index.ac_iface_name(ac), ip_cfg
 
 
-def acs_and_ip_profiles(nm_client):
-    for ac in nm_client.get_active_connections():
-        ip_profile = get_ip_profile(ac)
-        if not ip_profile:
-            continue
-        yield ac, ip_profile
+def _ifaces_and_ip_profiles(context):
+    index = context.index
+    for ac, ip_profile in acs_and_ip_profiles(context):
+        yield index.ac_iface_name(ac), ip_profile
+
+
+def acs_and_ip_profiles(context):
+    return context.index.acs_and_ip_profiles(Interface.IPV4)
 
 
 def is_dynamic(active_connection):
@@ -191,5 +195,5 @@ def is_dynamic(active_connection):
     return False
 
 
-def get_routing_rule_config(nm_client):
-    return nm_route.get_routing_rule_config(acs_and_ip_profiles(nm_client))
+def get_routing_rule_config(context):
+    return nm_route.get_routing_rule_config(acs_and_ip_profiles(context))
@@ -17,7 +17,6 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
-from libnmstate.nm import connection
 from libnmstate.schema import LLDP
 
 from .common import NM
@@ -106,11 +105,11 @@ def apply_lldp_setting(con_setting, iface_desired_state):
         con_setting.setting.props.lldp = lldp_status
 
 
-def get_info(nm_client, nmdev):
+def get_info(context, nmdev):
     """
     Provides the current LLDP neighbors information
     """
-    lldp_status = _get_lldp_status(nm_client, nmdev)
+    lldp_status = _get_lldp_status(context, nmdev)
     info = {}
     if lldp_status == NM_LLDP_STATUS_DEFAULT or not lldp_status:
         info[LLDP.ENABLED] = False
@@ -121,7 +120,7 @@ def get_info(nm_client, nmdev):
     return {LLDP.CONFIG_SUBTREE: info}
 
 
-def _get_lldp_status(nm_client, nmdev):
+def _get_lldp_status(context, nmdev):
     """
     Default means NM global config file value which is by default disabled.
     According to NM folks, there is no way from libnm to know if lldp is
@@ -133,10 +132,9 @@ def _get_lldp_status(nm_client, nmdev):
     Ref: https://bugzilla.redhat.com/1832273
     """
     lldp_status = None
-    con_profile = connection.ConnectionProfile(nm_client)
-    con_profile.import_by_device(nmdev)
-    if con_profile.profile:
-        con_setting = con_profile.profile.get_setting_connection()
+    profile = context.index.profile(nmdev)
+    if profile:
+        con_setting = profile.get_setting_connection()
         if con_setting:
             lldp_status = con_setting.get_lldp()
 
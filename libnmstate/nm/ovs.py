@@ -140,7 +140,7 @@ def get_port_by_slave(nmdev):
 
 
 def get_ovs_info(context, bridge_device, devices_info):
-    port_profiles = _get_slave_profiles(bridge_device, devices_info)
+    port_profiles = _get_slave_profiles(context, bridge_device, devices_info)
     ports = _get_bridge_ports_info(context, port_profiles, devices_info)
     options = _get_bridge_options(context, bridge_device)
 
@@ -204,7 +204,9 @@ def _get_bridge_port_info(context, port_profile, devices_info):
 
     port_name = port_profile.get_interface_name()
     port_device = context.get_nm_dev(port_name)
-    port_slave_profiles = _get_slave_profiles(port_device, devices_info)
+    port_slave_profiles = _get_slave_profiles(
+        context, port_device, devices_info
+    )
     port_slave_names = [c.get_interface_name() for c in port_slave_profiles]
 
     if port_slave_names:
@@ -258,10 +260,9 @@ def _get_lag_info(port_name, port_setting, port_slave_names):
 
 def _get_bridge_options(context, bridge_device):
     bridge_options = {}
-    con = connection.ConnectionProfile(context)
-    con.import_by_device(bridge_device)
-    if con.profile:
-        bridge_setting = con.profile.get_setting(NM.SettingOvsBridge)
+    profile = context.index.profile(bridge_device)
+    if profile:
+        bridge_setting = profile.get_setting(NM.SettingOvsBridge)
         bridge_options["stp"] = bridge_setting.props.stp_enable
         bridge_options["rstp"] = bridge_setting.props.rstp_enable
         bridge_options["fail-mode"] = bridge_setting.props.fail_mode or ""
@@ -272,12 +273,14 @@ def _get_bridge_options(context, bridge_device):
     return bridge_options
 
 
-def _get_slave_profiles(master_device, devices_info):
+def _get_slave_profiles(context, master_device, devices_info):
     slave_profiles = []
+    index = context.index
+    master_name = index.iface_name(master_device)
     for dev, _ in devices_info:
-        active_con = connection.get_device_active_connection(dev)
+        active_con = index.active_connection(dev)
         if active_con:
             master = active_con.props.master
-            if master and (master.get_iface() == master_device.get_iface()):
-                slave_profiles.append(active_con.props.connection)
+            if master and (index.iface_name(master) == master_name):
+                slave_profiles.append(index.ac_profile(active_con))
     return slave_profiles
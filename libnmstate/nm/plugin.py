@@ -21,16 +21,23 @@ import logging
 from operator import itemgetter
 
 from libnmstate.error import NmstateValueError
-from libnmstate.ifaces.ovs import is_ovs_running
+from libnmstate.schema import Bond
 from libnmstate.schema import DNS
+from libnmstate.schema import Ethernet
 from libnmstate.schema import Interface
+from libnmstate.schema import LinuxBridge
+from libnmstate.schema import LLDP
+from libnmstate.schema import OVSBridge
+from libnmstate.schema import OVSInterface
 from libnmstate.schema import Route
 from libnmstate.schema import RouteRule
+from libnmstate.schema import Team
+from libnmstate.schema import VLAN
+from libnmstate.schema import VXLAN
 from libnmstate.plugin import NmstatePlugin
 
 from . import bond as nm_bond
 from . import bridge as nm_bridge
-from . import connection as nm_connection
 from . import device as nm_device
 from . import ipv4 as nm_ipv4
 from . import ipv6 as nm_ipv6
@@ -48,13 +55,14 @@ from .checkpoint import CheckPoint
 from .checkpoint import get_checkpoints
 from .common import NM
 from .context import NmContext
-from .profile import get_all_applied_configs
+from .watcher import NmWatcher
 
 
 class NetworkManagerPlugin(NmstatePlugin):
     def __init__(self):
         self._ctx = NmContext()
         self._checkpoint = None
+        self._watcher = None
         self._check_version_mismatch()
 
     @property
@@ -62,6 +70,7 @@ class NetworkManagerPlugin(NmstatePlugin):
         return "NetworkManager"
 
     def unload(self):
+        self.stop_watch()
         if self._ctx:
             self._ctx.clean_up()
             self._ctx = None
@@ -81,12 +90,16 @@ class NetworkManagerPlugin(NmstatePlugin):
     @property
     def capabilities(self):
         capabilities = []
-        if nm_ovs.has_ovs_capability(self.client) and is_ovs_running():
+        if nm_ovs.has_ovs_capability(self.client) and self.ovs_running:
             capabilities.append(NmstatePlugin.OVS_CAPABILITY)
         if nm_team.has_team_capability(self.client):
             capabilities.append(NmstatePlugin.TEAM_CAPABILITY)
         return capabilities
 
+    @property
+    def ovs_running(self):
+        return self.context.index.ovs_running
+
     @property
     def plugin_capabilities(self):
         return [
@@ -94,53 +107,91 @@ class NetworkManagerPlugin(NmstatePlugin):
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE,
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE_RULE,
             NmstatePlugin.PLUGIN_CAPABILITY_DNS,
+            NmstatePlugin.PLUGIN_CAPABILITY_WATCH,
         ]
 
-    def get_interfaces(self):
+    def start_watch(self):
+        if not self._watcher:
+            self._watcher = NmWatcher(self.context)
+
+    def stop_watch(self):
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+
+    @property
+    def is_watching(self):
+        return self._watcher is not None
+
+    def wait_for_changes(self, timeout):
+        return self._watcher.wait_for_changes(timeout)
+
+    def get_interfaces(self, iface_filter=None, field_filter=None):
         info = []
         capabilities = self.capabilities
 
-        applied_configs = get_all_applied_configs(self.context)
-
-        devices_info = [
-            (dev, nm_device.get_device_common_info(dev))
-            for dev in nm_device.list_devices(self.client)
-        ]
+        index = self.context.index
+        all_devices = index.devices
+        if iface_filter:
+            nm_devs = [
+                dev
+                for dev in all_devices
+                if iface_filter.match(index.iface_name(dev))
+            ]
+        else:
+            nm_devs = all_devices
+
+        collectors = _get_iface_info_collectors(field_filter)
+        if _is_iface_info_requested(field_filter, IP_INFO_KEYS):
+            index.load_applied_configs(nm_devs)
+
+        devices_info = _get_devices_info(nm_devs)
+        if _is_iface_info_requested(field_filter, [Ethernet.CONFIG_SUBTREE]):
+            index.load_link_settings(
+                [
+                    devinfo["name"]
+                    for _, devinfo in devices_info
+                    if devinfo["type_id"] == NM.DeviceType.ETHERNET
+                ]
+            )
+        # OVS bridge is searching its ports and interfaces in all devices
+        all_devices_info = None if iface_filter else devices_info
+        with_bond_info = _is_iface_info_requested(
+            field_filter, [Bond.CONFIG_SUBTREE]
+        )
+        with_ovs_bridge_info = _is_iface_info_requested(
+            field_filter, [OVSBridge.CONFIG_SUBTREE]
+        )
+        with_ovs_iface_info = _is_iface_info_requested(
+            field_filter, [OVSInterface.PATCH_CONFIG_SUBTREE]
+        )
 
         for dev, devinfo in devices_info:
             type_id = devinfo["type_id"]
 
             iface_info = nm_translator.Nm2Api.get_common_device_info(devinfo)
-            applied_config = applied_configs.get(iface_info[Interface.NAME])
-
-            act_con = nm_connection.get_device_active_connection(dev)
-            iface_info[Interface.IPV4] = nm_ipv4.get_info(
-                act_con, applied_config
-            )
-            iface_info[Interface.IPV6] = nm_ipv6.get_info(
-                act_con, applied_config
-            )
-            iface_info.update(nm_wired.get_info(dev))
-            iface_info.update(nm_user.get_info(self.context, dev))
-            iface_info.update(nm_lldp.get_info(self.client, dev))
-            iface_info.update(nm_vlan.get_info(dev))
-            iface_info.update(nm_vxlan.get_info(dev))
-            iface_info.update(nm_bridge.get_info(self.context, dev))
-            iface_info.update(nm_team.get_info(dev))
+            act_con = index.active_connection(dev)
+            for collector in collectors:
+                iface_info.update(collector(self.context, dev, act_con))
 
             if nm_bond.is_bond_type_id(type_id):
-                bondinfo = nm_bond.get_bond_info(dev)
-                iface_info.update(_ifaceinfo_bond(bondinfo))
+                if with_bond_info:
+                    bondinfo = nm_bond.get_bond_info(dev)
+                    iface_info.update(_ifaceinfo_bond(bondinfo))
             elif NmstatePlugin.OVS_CAPABILITY in capabilities:
                 if nm_ovs.is_ovs_bridge_type_id(type_id):
-                    iface_info["bridge"] = nm_ovs.get_ovs_info(
-                        self.context, dev, devices_info
-                    )
+                    if with_ovs_bridge_info:
+                        if all_devices_info is None:
+                            all_devices_info = _get_devices_info(all_devices)
+                        iface_info["bridge"] = nm_ovs.get_ovs_info(
+                            self.context, dev, all_devices_info
+                        )
                     iface_info = _remove_ovs_bridge_unsupported_entries(
                         iface_info
                     )
                 elif nm_ovs.is_ovs_interface_type_id(type_id):
-                    iface_info.update(nm_ovs.get_interface_info(act_con))
+                    if with_ovs_iface_info:
+                        iface_info.update(nm_ovs.get_interface_info(act_con))
                 elif nm_ovs.is_ovs_port_type_id(type_id):
                     continue
 
@@ -150,34 +201,35 @@ class NetworkManagerPlugin(NmstatePlugin):
 
         return info
 
-    def get_routes(self):
-        return {
-            Route.RUNNING: (
-                nm_ipv4.get_route_running(self.client)
-                + nm_ipv6.get_route_running(self.client)
-            ),
-            Route.CONFIG: (
-                nm_ipv4.get_route_config(self.client)
-                + nm_ipv6.get_route_config(self.client)
-            ),
-        }
+    def get_routes(self, iface_filter=None, field_filter=None):
+        routes = {}
+        if field_filter is None or field_filter.match(
+            Route.KEY, Route.RUNNING
+        ):
+            routes[Route.RUNNING] = nm_ipv4.get_route_running(
+                self.context, iface_filter
+            ) + nm_ipv6.get_route_running(self.context, iface_filter)
+        if field_filter is None or field_filter.match(Route.KEY, Route.CONFIG):
+            routes[Route.CONFIG] = nm_ipv4.get_route_config(
+                self.context, iface_filter
+            ) + nm_ipv6.get_route_config(self.context, iface_filter)
+        return routes
 
     def get_route_rules(self):
         return {
             RouteRule.CONFIG: (
-                nm_ipv4.get_routing_rule_config(self.client)
-                + nm_ipv6.get_routing_rule_config(self.client)
+                nm_ipv4.get_routing_rule_config(self.context)
+                + nm_ipv6.get_routing_rule_config(self.context)
             )
         }
 
-    def get_dns_client_config(self):
-        return {
-            DNS.RUNNING: nm_dns.get_running(self.client),
-            DNS.CONFIG: nm_dns.get_config(
-                nm_ipv4.acs_and_ip_profiles(self.client),
-                nm_ipv6.acs_and_ip_profiles(self.client),
-            ),
-        }
+    def get_dns_client_config(self, field_filter=None):
+        dns_config = {}
+        if field_filter is None or field_filter.match(DNS.KEY, DNS.RUNNING):
+            dns_config[DNS.RUNNING] = nm_dns.get_running(self.client)
+        if field_filter is None or field_filter.match(DNS.KEY, DNS.CONFIG):
+            dns_config[DNS.CONFIG] = nm_dns.get_config(self.context)
+        return dns_config
 
     def refresh_content(self):
         self._ctx.refresh_content()
@@ -185,6 +237,12 @@ class NetworkManagerPlugin(NmstatePlugin):
     def apply_changes(self, net_state, save_to_disk):
         nm_applier.apply_changes(self.context, net_state, save_to_disk)
 
+    def plan_changes(self, net_state, save_to_disk):
+        return nm_applier.plan_changes(self.context, net_state, save_to_disk)
+
+    def is_applied(self, net_state, save_to_disk):
+        return nm_applier.is_applied(self.context, net_state, save_to_disk)
+
     def _load_checkpoint(self, checkpoint_path):
         if checkpoint_path:
             if self._checkpoint:
@@ -209,8 +267,8 @@ class NetworkManagerPlugin(NmstatePlugin):
                 else:
                     raise NmstateValueError("No checkpoint specified or found")
 
-    def create_checkpoint(self, timeout=60):
-        self._checkpoint = CheckPoint.create(self._ctx, timeout)
+    def create_checkpoint(self, timeout=60, iface_names=None):
+        self._checkpoint = CheckPoint.create(self._ctx, timeout, iface_names)
         return str(self._checkpoint)
 
     def rollback_checkpoint(self, checkpoint=None):
@@ -239,6 +297,70 @@ class NetworkManagerPlugin(NmstatePlugin):
             )
 
 
+def _get_devices_info(nm_devs):
+    return [(dev, nm_device.get_device_common_info(dev)) for dev in nm_devs]
+
+
+def _get_ip_info(context, dev, act_con):
+    applied_config = context.index.applied_config(dev.get_iface())
+    return {
+        Interface.IPV4: nm_ipv4.get_info(act_con, applied_config),
+        Interface.IPV6: nm_ipv6.get_info(act_con, applied_config),
+    }
+
+
+# The interface properties and the collector providing them, the collector is
+# skipped when none of its properties is requested by the field filter.
+IP_INFO_KEYS = (Interface.IPV4, Interface.IPV6)
+IFACE_INFO_COLLECTORS = (
+    (IP_INFO_KEYS, _get_ip_info),
+    (
+        (Interface.MTU, Interface.MAC),
+        lambda context, dev, act_con: nm_wired.get_link_info(dev),
+    ),
+    (
+        (Ethernet.CONFIG_SUBTREE,),
+        lambda context, dev, act_con: nm_wired.get_ethernet_info(context, dev),
+    ),
+    (
+        (Interface.DESCRIPTION,),
+        lambda context, dev, act_con: nm_user.get_info(context, dev),
+    ),
+    (
+        (LLDP.CONFIG_SUBTREE,),
+        lambda context, dev, act_con: nm_lldp.get_info(context, dev),
+    ),
+    (
+        (VLAN.CONFIG_SUBTREE,),
+        lambda context, dev, act_con: nm_vlan.get_info(dev),
+    ),
+    (
+        (VXLAN.CONFIG_SUBTREE,),
+        lambda context, dev, act_con: nm_vxlan.get_info(dev),
+    ),
+    (
+        (LinuxBridge.CONFIG_SUBTREE,),
+        lambda context, dev, act_con: nm_bridge.get_info(context, dev),
+    ),
+    (
+        (Team.CONFIG_SUBTREE,),
+        lambda context, dev, act_con: nm_team.get_info(dev),
+    ),
+)
+
+
+def _get_iface_info_collectors(field_filter):
+    return [
+        collector
+        for keys, collector in IFACE_INFO_COLLECTORS
+        if _is_iface_info_requested(field_filter, keys)
+    ]
+
+
+def _is_iface_info_requested(field_filter, keys):
+    return field_filter is None or field_filter.match_any(Interface.KEY, keys)
+
+
 def _ifaceinfo_bond(devinfo):
     # TODO: What about unmanaged devices?
     bondinfo = nm_translator.Nm2Api.get_bond_info(devinfo)
@@ -26,9 +26,11 @@ from .common import NM
 from .device import list_devices
 
 
-def get_all_applied_configs(context):
+def get_all_applied_configs(context, nm_devs=None):
     applied_configs = {}
-    for nm_dev in list_devices(context.client):
+    if nm_devs is None:
+        nm_devs = list_devices(context.client)
+    for nm_dev in nm_devs:
         if nm_dev.get_state() in (
             NM.DeviceState.ACTIVATED,
             NM.DeviceState.IP_CONFIG,
@@ -23,7 +23,6 @@ import socket
 from libnmstate import iplib
 from libnmstate.error import NmstateNotImplementedError
 from libnmstate.error import NmstateValueError
-from libnmstate.nm import active_connection as nm_ac
 from libnmstate.schema import Interface
 from libnmstate.schema import Route
 from libnmstate.schema import RouteRule
@@ -40,20 +39,21 @@ IPV6_DEFAULT_GATEWAY_DESTINATION = "::/0"
 ROUTE_RULE_DEFAULT_PRIORIRY = 30000
 
 
-def get_running(acs_and_ip_cfgs):
+def get_running(ifaces_and_ip_cfgs, iface_filter=None):
     """
     Query running routes
-    The acs_and_ip_cfgs should be generate to generate a tuple:
-        NM.NM.ActiveConnection, NM.IPConfig
+    The ifaces_and_ip_cfgs should be generate to generate a tuple:
+        interface name, NM.IPConfig
+    When iface_filter is defined, only routes of matching next hop interface
+    are included.
     """
     routes = []
-    for (active_connection, ip_cfg) in acs_and_ip_cfgs:
+    for (iface_name, ip_cfg) in ifaces_and_ip_cfgs:
         if not ip_cfg.props.routes:
             continue
-        iface_name = nm_ac.ActiveConnection(
-            nm_ac_con=active_connection
-        ).devname
-        if not iface_name:
+        if not iface_name or (
+            iface_filter and not iface_filter.match(iface_name)
+        ):
             continue
         for nm_route in ip_cfg.props.routes:
             table_id = _get_per_route_table_id(
@@ -70,22 +70,23 @@ def get_running(acs_and_ip_cfgs):
     return routes
 
 
-def get_config(acs_and_ip_profiles):
+def get_config(ifaces_and_ip_profiles, iface_filter=None):
     """
     Query running routes
-    The acs_and_ip_profiles should be generate to generate a tuple:
-        NM.NM.ActiveConnection, NM.SettingIPConfig
+    The ifaces_and_ip_profiles should be generate to generate a tuple:
+        interface name, NM.SettingIPConfig
+    When iface_filter is defined, only routes of matching next hop interface
+    are included.
     """
     routes = []
-    for (active_connection, ip_profile) in acs_and_ip_profiles:
+    for (iface_name, ip_profile) in ifaces_and_ip_profiles:
         nm_routes = ip_profile.props.routes
         gateway = ip_profile.props.gateway
         if not nm_routes and not gateway:
             continue
-        iface_name = nm_ac.ActiveConnection(
-            nm_ac_con=active_connection
-        ).devname
-        if not iface_name:
+        if not iface_name or (
+            iface_filter and not iface_filter.match(iface_name)
+        ):
             continue
         default_table_id = ip_profile.props.route_table
         if gateway:
@@ -0,0 +1,140 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from collections import defaultdict
+import logging
+
+from libnmstate.error import NmstateInternalError
+from libnmstate.error import NmstateValueError
+
+
+class ActionScheduler:
+    """
+    Run the actions as a dependency graph: each action is started as soon as
+    all the actions it depends on are finished, instead of waiting for all
+    the actions of a phase.
+
+    Each action is a function issuing async actions via the NmContext, it is
+    finished when all the async actions it registered, including the ones
+    registered by their callbacks, are finished.
+    """
+
+    def __init__(self, context):
+        self._ctx = context
+        self._actions = {}
+        self._dependencies = {}
+        self._pending_dependencies = {}
+        self._dependents = defaultdict(set)
+        self._finished = set()
+
+    def add(self, key, issue, after=()):
+        """
+        Add action identified by key(hashable) which is run by invoking
+        `issue()` after the actions identified by `after` are finished.
+        The keys in `after` which are not added to the scheduler are ignored.
+        """
+        if key in self._actions:
+            raise NmstateInternalError(
+                f"BUG: Action {key} is already scheduled"
+            )
+        self._actions[key] = issue
+        self._dependencies[key] = set(after)
+
+    def plan(self):
+        """
+        Return the keys of actions in an order satisfying the dependencies,
+        without running them.
+        """
+        return _sort_dependencies(self._resolve_dependencies())
+
+    def run(self):
+        """
+        Run all the actions and block till all of them are finished.
+        """
+        self._pending_dependencies = self._resolve_dependencies()
+        for key, dependencies in self._pending_dependencies.items():
+            for dep in dependencies:
+                self._dependents[dep].add(key)
+        _sort_dependencies(self._pending_dependencies)
+
+        ready = [
+            key
+            for key, dependencies in self._pending_dependencies.items()
+            if not dependencies
+        ]
+        for key in ready:
+            self._start(key)
+        self._ctx.wait_all_finish()
+
+        unfinished = set(self._actions) - self._finished
+        if unfinished:
+            raise NmstateInternalError(
+                f"BUG: Actions {unfinished} are never started"
+            )
+
+    def _resolve_dependencies(self):
+        """
+        Return the dependencies of each action, excluding the ones not added.
+        """
+        resolved = {}
+        for key, dependencies in self._dependencies.items():
+            resolved[key] = {
+                dep
+                for dep in dependencies
+                if dep in self._actions and dep != key
+            }
+        return resolved
+
+    def _start(self, key):
+        logging.debug(f"Scheduled action: {key} started")
+        self._ctx.start_async_group(
+            key, self._actions[key], self._finish_callback
+        )
+
+    def _finish_callback(self, key):
+        logging.debug(f"Scheduled action: {key} finished")
+        self._finished.add(key)
+        for dependent in sorted(self._dependents[key], key=str):
+            dependencies = self._pending_dependencies[dependent]
+            dependencies.discard(key)
+            if not dependencies:
+                self._start(dependent)
+
+
+def _sort_dependencies(dependencies):
+    """
+    Return the keys in topological order, keeping the order of addition for
+    the keys without dependency between them.
+    Raise NmstateValueError if the dependency graph is not acyclic.
+    """
+    remaining = {key: set(deps) for key, deps in dependencies.items()}
+    sorted_keys = []
+    while remaining:
+        ready = [key for key, deps in remaining.items() if not deps]
+        if not ready:
+            raise NmstateValueError(
+                "Circular dependency found between actions: "
+                f"{', '.join(sorted(str(key) for key in remaining))}"
+            )
+        for key in ready:
+            del remaining[key]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+        sorted_keys.extend(ready)
+    return sorted_keys
@@ -17,9 +17,11 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import logging
 import re
 import subprocess
 
+from libnmstate import netlink
 from libnmstate.error import NmstateNotSupportedError
 from libnmstate.schema import Ethernet
 from libnmstate.schema import Interface
@@ -51,6 +53,14 @@ SRIOV_NMSTATE_TO_NM_MAP = {
     ),
 }
 
+SRIOV_NMSTATE_TO_NETLINK_MAP = {
+    Ethernet.SRIOV.VFS.MAC_ADDRESS: netlink.VfInfo.MAC,
+    Ethernet.SRIOV.VFS.SPOOF_CHECK: netlink.VfInfo.SPOOF_CHECK,
+    Ethernet.SRIOV.VFS.TRUST: netlink.VfInfo.TRUST,
+    Ethernet.SRIOV.VFS.MIN_TX_RATE: netlink.VfInfo.MIN_TX_RATE,
+    Ethernet.SRIOV.VFS.MAX_TX_RATE: netlink.VfInfo.MAX_TX_RATE,
+}
+
 SRIOV_NMSTATE_TO_REGEX = {
     Ethernet.SRIOV.VFS.MAC_ADDRESS: re.compile(
         r"[a-fA-F0-9:]{17}|[a-fA-F0-9]{12}"
@@ -133,7 +143,7 @@ def _has_sriov_capability(context, ifname):
     return dev and (NM.DeviceCapabilities.SRIOV & dev.props.capabilities)
 
 
-def get_info(device):
+def get_info(context, device):
     """
     Provide the current active SR-IOV runtime values
     """
@@ -149,7 +159,7 @@ def get_info(device):
 
     if sriov_running_info[Ethernet.SRIOV.TOTAL_VFS]:
         sriov_running_info[Ethernet.SRIOV.VFS_SUBTREE] = _get_sriov_vfs_info(
-            ifname
+            context, ifname
         )
     else:
         sriov_running_info[Ethernet.SRIOV.VFS_SUBTREE] = []
@@ -157,11 +167,44 @@ def get_info(device):
     return {Ethernet.SRIOV_SUBTREE: sriov_running_info}
 
 
-def _get_sriov_vfs_info(ifname):
+def _get_sriov_vfs_info(context, ifname):
     """
     This is a workaround to get the VFs configuration from runtime.
     Ref: https://bugzilla.redhat.com/1777520
     """
+    try:
+        vfs_config = _get_sriov_vfs_info_from_netlink(
+            context.index.netlink, ifname
+        )
+    except OSError as e:
+        logging.debug(
+            f"Failed to query VFs of {ifname} via netlink: {e}, "
+            "falling back to ip link"
+        )
+        vfs_config = None
+    if vfs_config is None:
+        vfs_config = _get_sriov_vfs_info_from_iplink(ifname)
+    return vfs_config
+
+
+def _get_sriov_vfs_info_from_netlink(nl, ifname):
+    link_attrs = nl.get_link(ifname, ext_mask=netlink.RTEXT_FILTER_VF)
+    vfs = netlink.parse_vfs_info(link_attrs)
+    if vfs is None:
+        return None
+    return [_vf_info_to_nmstate(vf) for vf in vfs]
+
+
+def _vf_info_to_nmstate(vf):
+    vf_config = {}
+    for option, key in SRIOV_NMSTATE_TO_NETLINK_MAP.items():
+        if key in vf:
+            vf_config[option] = vf[key]
+    vf_config[Ethernet.SRIOV.VFS.ID] = vf[netlink.VfInfo.VF]
+    return vf_config
+
+
+def _get_sriov_vfs_info_from_iplink(ifname):
     proc = subprocess.run(
         ("ip", "link", "show", ifname),
         stdout=subprocess.PIPE,
@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from .common import GLib
+
+# NetworkManager emits a burst of signals for a single change, for example
+# an activation. Keep collecting signals for this long(milliseconds) after
+# the first one, so that the interface is only collected once.
+SETTLE_TIME = 200
+
+
+class NmWatcher:
+    """
+    Track the interfaces changed since last `wait_for_changes()` via the
+    signals of NM.Client, NM.Device and NM.IPConfig objects. The signals are
+    dispatched by the GLib main context of NmContext, which is only iterated
+    by `wait_for_changes()` or `NmContext.refresh_content()`.
+    """
+
+    def __init__(self, context):
+        self._ctx = context
+        self._changed_ifaces = set()
+        self._global_changed = False
+        self._client_handlers = set()
+        # NM.Device -> (interface name, handler ids)
+        self._devices = {}
+        # NM.Device -> {NM.IPConfig: handler id}
+        self._ip_configs = {}
+
+        client = context.client
+        for signal, callback in (
+            ("device-added", self._device_added_callback),
+            ("device-removed", self._device_removed_callback),
+            ("active-connection-added", self._ac_callback),
+            ("active-connection-removed", self._ac_callback),
+            ("notify::dns-configuration", self._global_callback),
+        ):
+            self._client_handlers.add(client.connect(signal, callback))
+        for nmdev in client.get_devices():
+            self._watch_device(nmdev)
+
+    def close(self):
+        client = self._ctx.client
+        if client:
+            for handler_id in self._client_handlers:
+                client.handler_disconnect(handler_id)
+        self._client_handlers = set()
+        for nmdev in list(self._devices):
+            self._unwatch_device(nmdev)
+
+    def wait_for_changes(self, timeout):
+        """
+        Block until any change noticed or timeout(seconds).
+        Return None on timeout, otherwise the set of changed interface names
+        which could be empty if only global settings like DNS changed.
+        """
+        if not self._has_changes():
+            self._iterate(timeout * 1000, self._has_changes)
+            if not self._has_changes():
+                return None
+        self._iterate(SETTLE_TIME, lambda: False)
+
+        changed_ifaces = self._changed_ifaces
+        self._changed_ifaces = set()
+        self._global_changed = False
+        return changed_ifaces
+
+    def _has_changes(self):
+        return self._global_changed or bool(self._changed_ifaces)
+
+    def _iterate(self, timeout_ms, stop_condition):
+        timed_out = []
+
+        def _timeout_cb(_user_data):
+            timed_out.append(True)
+            return GLib.SOURCE_REMOVE
+
+        main_context = self._ctx.context
+        timeout_source = GLib.timeout_source_new(int(timeout_ms))
+        user_data = None
+        timeout_source.set_callback(_timeout_cb, user_data)
+        timeout_source.attach(main_context)
+        try:
+            while not timed_out and not stop_condition():
+                main_context.iteration(True)
+        finally:
+            timeout_source.destroy()
+
+    def _watch_device(self, nmdev):
+        if nmdev in self._devices:
+            return
+        handler_ids = {
+            nmdev.connect("state-changed", self._device_state_callback),
+            nmdev.connect("notify", self._device_notify_callback),
+        }
+        self._devices[nmdev] = (nmdev.get_iface(), handler_ids)
+        self._ip_configs[nmdev] = {}
+        self._watch_ip_configs(nmdev)
+
+    def _unwatch_device(self, nmdev):
+        _, handler_ids = self._devices.pop(nmdev, (None, ()))
+        for handler_id in handler_ids:
+            nmdev.handler_disconnect(handler_id)
+        for ip_config, handler_id in self._ip_configs.pop(nmdev, {}).items():
+            ip_config.handler_disconnect(handler_id)
+
+    def _watch_ip_configs(self, nmdev):
+        """
+        The NM.IPConfig objects are updated in place for address and route
+        changes, they are replaced when the device is reactivated.
+        """
+        ip_configs = self._ip_configs[nmdev]
+        current = {nmdev.get_ip4_config(), nmdev.get_ip6_config()} - {None}
+        for ip_config in set(ip_configs) - current:
+            ip_config.handler_disconnect(ip_configs.pop(ip_config))
+        for ip_config in current - set(ip_configs):
+            ip_configs[ip_config] = ip_config.connect(
+                "notify", self._ip_config_notify_callback, nmdev
+            )
+
+    def _mark_device_changed(self, nmdev):
+        iface_name, _ = self._devices.get(nmdev, (None, None))
+        if iface_name is None:
+            iface_name = nmdev.get_iface()
+        if iface_name:
+            self._changed_ifaces.add(iface_name)
+
+    def _device_added_callback(self, _client, nmdev):
+        self._watch_device(nmdev)
+        self._mark_device_changed(nmdev)
+
+    def _device_removed_callback(self, _client, nmdev):
+        self._mark_device_changed(nmdev)
+        self._unwatch_device(nmdev)
+
+    def _ac_callback(self, _client, nm_ac):
+        for nmdev in nm_ac.get_devices() or []:
+            self._mark_device_changed(nmdev)
+
+    def _global_callback(self, _client, _param_spec):
+        self._global_changed = True
+
+    def _device_state_callback(self, nmdev, _new_state, _old_state, _reason):
+        self._mark_device_changed(nmdev)
+
+    def _device_notify_callback(self, nmdev, param_spec):
+        if param_spec.name in ("ip4-config", "ip6-config"):
+            self._watch_ip_configs(nmdev)
+        elif param_spec.name == "interface":
+            # Interface renamed, report both old and new name
+            self._mark_device_changed(nmdev)
+            _, handler_ids = self._devices[nmdev]
+            self._devices[nmdev] = (nmdev.get_iface(), handler_ids)
+        self._mark_device_changed(nmdev)
+
+    def _ip_config_notify_callback(self, _ip_config, _param_spec, nmdev):
+        self._mark_device_changed(nmdev)
@@ -23,7 +23,6 @@ from libnmstate.schema import Ethernet
 from libnmstate.schema import Interface
 from .common import NM
 
-
 ZEROED_MAC = "00:00:00:00:00:00"
 
 
@@ -116,10 +115,19 @@ def create_setting(iface_state, base_con_profile):
     return nm_wired_setting
 
 
-def get_info(device):
+def get_info(context, device):
     """
     Provides the current active values for a device
     """
+    info = get_link_info(device)
+    info.update(get_ethernet_info(context, device))
+    return info
+
+
+def get_link_info(device):
+    """
+    Provides the current MTU and MAC address of a device
+    """
     info = {}
 
     iface = device.get_iface()
@@ -138,8 +146,17 @@ def get_info(device):
     if mac and mac != ZEROED_MAC:
         info[Interface.MAC] = mac
 
+    return info
+
+
+def get_ethernet_info(context, device):
+    """
+    Provides the current link settings and SR-IOV information of an ethernet
+    device
+    """
+    info = {}
     if device.get_device_type() == NM.DeviceType.ETHERNET:
-        ethernet = _get_ethernet_info(device, iface)
+        ethernet = _get_ethernet_info(context, device, device.get_iface())
         if ethernet:
             info[Ethernet.CONFIG_SUBTREE] = ethernet
 
@@ -161,7 +178,7 @@ def _get_mac_address_from_sysfs(ifname):
     return mac
 
 
-def _get_ethernet_info(device, iface):
+def _get_ethernet_info(context, device, iface):
     ethernet = {}
     try:
         speed = int(device.get_speed())
@@ -172,7 +189,7 @@ def _get_ethernet_info(device, iface):
     except AttributeError:
         return None
 
-    ethtool_results = minimal_ethtool(iface)
+    ethtool_results = context.index.link_settings(iface)
     auto_setting = ethtool_results[Ethernet.AUTO_NEGOTIATION]
     if auto_setting is True:
         ethernet[Ethernet.AUTO_NEGOTIATION] = True
@@ -187,7 +204,7 @@ def _get_ethernet_info(device, iface):
     else:
         return None
 
-    sriov_info = sriov.get_info(device)
+    sriov_info = sriov.get_info(context, device)
     if sriov_info:
         ethernet.update(sriov_info)
 
@@ -19,6 +19,7 @@
 
 from contextlib import contextmanager
 import importlib
+import inspect
 import logging
 from operator import itemgetter
 from operator import attrgetter
@@ -35,16 +36,36 @@ from libnmstate.schema import Route
 from libnmstate.schema import RouteRule
 
 from .plugin import NmstatePlugin
+from .state import FieldFilter
+from .state import InterfaceFilter
 from .state import merge_dict
 
+REPORT_SECTIONS = {
+    "capabilities",
+    Interface.KEY,
+    Route.KEY,
+    RouteRule.KEY,
+    DNS.KEY,
+}
+
 
 @contextmanager
 def plugin_context():
-    plugins = _load_plugins()
+    plugins = load_plugins()
+    try:
+        with rollback_on_failure(plugins):
+            yield plugins
+    finally:
+        unload_plugins(plugins)
+
+
+@contextmanager
+def rollback_on_failure(plugins):
+    """
+    Roll back the checkpoint of each plugin if exception raised.
+    """
     try:
-        # Lowest priority plugin should perform actions first.
-        plugins.sort(key=attrgetter("priority"))
-        yield plugins
+        yield
     except (Exception, KeyboardInterrupt):
         for plugin in plugins:
             if plugin.checkpoint:
@@ -55,42 +76,118 @@ def plugin_context():
                 except Exception as e:
                     logging.error(f"Rollback failed with error {e}")
         raise
-    finally:
-        for plugin in plugins:
-            plugin.unload()
 
 
-def show_with_plugins(plugins, include_status_data=None):
+def load_plugins():
+    plugins = _load_plugins()
+    # Lowest priority plugin should perform actions first.
+    plugins.sort(key=attrgetter("priority"))
+    return plugins
+
+
+def unload_plugins(plugins):
+    for plugin in plugins:
+        plugin.unload()
+
+
+def show_with_plugins(
+    plugins, include_status_data=None, interfaces=None, fields=None
+):
     for plugin in plugins:
         plugin.refresh_content()
     report = {}
-    if include_status_data:
+
+    # Plugins are only asked to filter when filter is requested and only with
+    # the filters their methods accept, so that plugins without filter
+    # support still work. The plugin output is filtered again here.
+    iface_filter = None
+    filter_args = {}
+    if interfaces is not None:
+        if isinstance(interfaces, str):
+            interfaces = [interfaces]
+        iface_filter = InterfaceFilter(interfaces)
+        filter_args["iface_filter"] = iface_filter
+
+    field_filter = None
+    field_args = {}
+    if fields is not None:
+        if isinstance(fields, str):
+            fields = [fields]
+        field_filter = FieldFilter(fields)
+        field_args["field_filter"] = field_filter
+        unknown_sections = field_filter.sections - REPORT_SECTIONS
+        if unknown_sections:
+            raise NmstateValueError(
+                f"Unknown fields {', '.join(sorted(unknown_sections))}, "
+                f"supported: {', '.join(sorted(REPORT_SECTIONS))}"
+            )
+
+    if include_status_data and _is_requested(field_filter, "capabilities"):
         report["capabilities"] = plugins_capabilities(plugins)
 
-    report[Interface.KEY] = _get_interface_info_from_plugins(plugins)
+    if _is_requested(field_filter, Interface.KEY):
+        report[Interface.KEY] = _get_interface_info_from_plugins(
+            plugins, {**filter_args, **field_args}
+        )
 
     route_plugin = _find_plugin_for_capability(
         plugins, NmstatePlugin.PLUGIN_CAPABILITY_ROUTE
     )
-    if route_plugin:
-        report[Route.KEY] = route_plugin.get_routes()
+    if route_plugin and _is_requested(field_filter, Route.KEY):
+        report[Route.KEY] = _filter_routes(
+            _call_with_supported_args(
+                route_plugin.get_routes, {**filter_args, **field_args}
+            ),
+            iface_filter,
+        )
 
     route_rule_plugin = _find_plugin_for_capability(
         plugins, NmstatePlugin.PLUGIN_CAPABILITY_ROUTE_RULE
     )
-    if route_rule_plugin:
+    if route_rule_plugin and _is_requested(field_filter, RouteRule.KEY):
         report[RouteRule.KEY] = route_rule_plugin.get_route_rules()
 
     dns_plugin = _find_plugin_for_capability(
         plugins, NmstatePlugin.PLUGIN_CAPABILITY_DNS
     )
-    if dns_plugin:
-        report[DNS.KEY] = dns_plugin.get_dns_client_config()
+    if dns_plugin and _is_requested(field_filter, DNS.KEY):
+        report[DNS.KEY] = _call_with_supported_args(
+            dns_plugin.get_dns_client_config, field_args
+        )
 
-    validator.schema_validate(report)
+    # The report of plugins is trusted, only validated for tests and
+    # debugging.
+    if validator.is_show_validation_enabled():
+        validator.schema_validate(report)
+    # The projection is done after validation as the schema requires
+    # properties like interface name and type.
+    if field_filter:
+        report = field_filter.project(report)
     return report
 
 
+def _call_with_supported_args(method, kwargs):
+    """
+    Invoke the plugin method with the keyword arguments it accepts. The
+    filters were added to the plugin API later, external plugins might not
+    support all of them.
+    """
+    if kwargs:
+        params = inspect.signature(method).parameters
+        if not any(
+            param.kind == inspect.Parameter.VAR_KEYWORD
+            for param in params.values()
+        ):
+            kwargs = {
+                key: value for key, value in kwargs.items() if key in params
+            }
+    return method(**kwargs)
+
+
+def _is_requested(field_filter, section):
+    return field_filter is None or field_filter.match(section)
+
+
 def plugins_capabilities(plugins):
     capabilities = set()
     for plugin in plugins:
@@ -98,6 +195,10 @@ def plugins_capabilities(plugins):
     return list(capabilities)
 
 
+def plugins_ovs_running(plugins):
+    return any(plugin.ovs_running for plugin in plugins)
+
+
 def _load_plugins():
     plugins = [NetworkManagerPlugin()]
     plugins.extend(_load_external_py_plugins())
@@ -145,18 +246,23 @@ def _find_plugin_for_capability(plugins, capability):
     return chose_plugin
 
 
-def _get_interface_info_from_plugins(plugins):
+def _get_interface_info_from_plugins(plugins, filter_args):
     all_ifaces = {}
     IFACE_PRIORITY_METADATA = "_plugin_priority"
+    iface_filter = filter_args.get("iface_filter")
     for plugin in plugins:
         if (
             NmstatePlugin.PLUGIN_CAPABILITY_IFACE
             not in plugin.plugin_capabilities
         ):
             continue
-        for iface in plugin.get_interfaces():
-            iface[IFACE_PRIORITY_METADATA] = plugin.priority
+        for iface in _call_with_supported_args(
+            plugin.get_interfaces, filter_args
+        ):
             iface_name = iface[Interface.NAME]
+            if iface_filter and not iface_filter.match(iface_name):
+                continue
+            iface[IFACE_PRIORITY_METADATA] = plugin.priority
             if iface_name in all_ifaces:
                 existing_iface = all_ifaces[iface_name]
                 existing_priority = existing_iface[IFACE_PRIORITY_METADATA]
@@ -176,16 +282,32 @@ def _get_interface_info_from_plugins(plugins):
     return sorted(all_ifaces.values(), key=itemgetter(Interface.NAME))
 
 
-def create_checkpoints(plugins, timeout):
+def _filter_routes(routes, iface_filter):
+    if iface_filter:
+        for route_type, route_entries in routes.items():
+            routes[route_type] = [
+                route
+                for route in route_entries
+                if iface_filter.match(route.get(Route.NEXT_HOP_INTERFACE, ""))
+            ]
+    return routes
+
+
+def create_checkpoints(plugins, timeout, iface_names=None):
     """
     Return a string containing all the check point created by each plugin in
     the format:
         plugin.name|<checkpoing_path>|plugin.name|<checkpoing_path|...
 
+    When iface_names is defined, plugins are asked to only include these
+    interfaces in checkpoint.
     """
     checkpoints = []
+    scope_args = {}
+    if iface_names is not None:
+        scope_args["iface_names"] = iface_names
     for plugin in plugins:
-        checkpoint = plugin.create_checkpoint(timeout)
+        checkpoint = plugin.create_checkpoint(timeout, **scope_args)
         if checkpoint:
             checkpoints.append(f"{plugin.name}|{checkpoint}")
     return "|".join(checkpoints)
@@ -32,6 +32,7 @@ class NmstatePlugin(metaclass=ABCMeta):
     PLUGIN_CAPABILITY_ROUTE = "route"
     PLUGIN_CAPABILITY_ROUTE_RULE = "route_rule"
     PLUGIN_CAPABILITY_DNS = "dns"
+    PLUGIN_CAPABILITY_WATCH = "watch"
 
     DEFAULT_PRIORITY = 10
 
@@ -53,7 +54,16 @@ class NmstatePlugin(metaclass=ABCMeta):
     def priority(self):
         return NmstatePlugin.DEFAULT_PRIORITY
 
-    def get_interfaces(self):
+    def get_interfaces(self, iface_filter=None, field_filter=None):
+        """
+        Return the list of interface information.
+        When iface_filter(libnmstate.state.InterfaceFilter) is defined, plugin
+        could skip interfaces not matching `iface_filter.match(iface_name)`.
+        When field_filter(libnmstate.state.FieldFilter) is defined, plugin
+        could skip collecting properties not matching
+        `field_filter.match(Interface.KEY, property_name)`. The interface name
+        and type should always be included.
+        """
         raise NmstatePluginError(
             f"Plugin {self.name} BUG: get_interfaces() not implemented"
         )
@@ -61,15 +71,43 @@ class NmstatePlugin(metaclass=ABCMeta):
     def apply_changes(self, net_state, save_to_disk):
         pass
 
+    def plan_changes(self, net_state, save_to_disk):
+        """
+        Return the operations `apply_changes()` would do in order, as a list
+        of (operation, interface name), without changing anything.
+        """
+        return []
+
+    def is_applied(self, net_state, save_to_disk):
+        """
+        Only invoked when the current state already matches the desired state.
+        Return False if `apply_changes()` would still change something, for
+        example storing the configuration with different persistence or
+        taking over an interface configured by others.
+        """
+        return True
+
     @property
     def capabilities(self):
         return []
 
+    @property
+    def ovs_running(self):
+        """
+        Whether the OVS database server is running, False if the plugin does
+        not know.
+        """
+        return False
+
     @abstractmethod
     def plugin_capabilities(self):
         pass
 
-    def create_checkpoint(self, timeout):
+    def create_checkpoint(self, timeout, iface_names=None):
+        """
+        The iface_names is only defined when the checkpoint could be limited
+        to these interfaces.
+        """
         return None
 
     def rollback_checkpoint(self, checkpoint=None):
@@ -78,17 +116,60 @@ class NmstatePlugin(metaclass=ABCMeta):
     def destroy_checkpoint(self, checkpoint=None):
         pass
 
-    def get_routes(self):
+    def get_routes(self, iface_filter=None, field_filter=None):
+        """
+        Return the route information.
+        When iface_filter(libnmstate.state.InterfaceFilter) is defined, plugin
+        could skip routes whose next hop interface is not matching.
+        When field_filter(libnmstate.state.FieldFilter) is defined, plugin
+        could skip the route types not matching
+        `field_filter.match(Route.KEY, route_type)`.
+        """
         raise NmstatePluginError(
             f"Plugin {self.name} BUG: get_routes() not implemented"
         )
 
+    def start_watch(self):
+        """
+        Start tracking the changes of network state. Only invoked when plugin
+        has PLUGIN_CAPABILITY_WATCH.
+        """
+        raise NmstatePluginError(
+            f"Plugin {self.name} BUG: start_watch() not implemented"
+        )
+
+    def stop_watch(self):
+        pass
+
+    @property
+    def is_watching(self):
+        """
+        Whether `start_watch()` is invoked without `stop_watch()`.
+        """
+        return False
+
+    def wait_for_changes(self, timeout):
+        """
+        Block until network state changed or timeout(seconds).
+        Return None on timeout, otherwise the set of changed interface names
+        which could be empty when only global settings changed.
+        """
+        raise NmstatePluginError(
+            f"Plugin {self.name} BUG: wait_for_changes() not implemented"
+        )
+
     def get_route_rules(self):
         raise NmstatePluginError(
             f"Plugin {self.name} BUG: get_route_rules() not implemented"
         )
 
-    def get_dns_client_config(self):
+    def get_dns_client_config(self, field_filter=None):
+        """
+        Return the DNS information.
+        When field_filter(libnmstate.state.FieldFilter) is defined, plugin
+        could skip the DNS types not matching
+        `field_filter.match(DNS.KEY, dns_type)`.
+        """
         raise NmstatePluginError(
             f"Plugin {self.name} BUG: get_dns_client_config() not implemented"
         )
@@ -33,10 +33,10 @@ from libnmstate.error import NmstateTimeoutError
 from libnmstate.error import NmstatePermissionError
 from libnmstate.error import NmstateValueError
 from libnmstate.error import NmstatePluginError
+from libnmstate.ifaces.ovs import DEFAULT_OVS_DB_SOCKET_PATH
 
 TIMEOUT = 5
 
-DEFAULT_OVS_DB_SOCKET_PATH = "/run/openvswitch/db.sock"
 DEFAULT_OVS_SCHEMA_PATH = "/usr/share/openvswitch/vswitch.ovsschema"
 
 NM_EXTERNAL_ID = "NM.connection.uuid"
@@ -145,11 +145,13 @@ class NmstateOvsdbPlugin(NmstatePlugin):
     def plugin_capabilities(self):
         return NmstatePlugin.PLUGIN_CAPABILITY_IFACE
 
-    def get_interfaces(self):
+    def get_interfaces(self, iface_filter=None, field_filter=None):
         ifaces = []
         for row in list(self._idl.tables["Interface"].rows.values()) + list(
             self._idl.tables["Bridge"].rows.values()
         ):
+            if iface_filter and not iface_filter.match(row.name):
+                continue
             ifaces.append(
                 {
                     Interface.NAME: row.name,
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from libnmstate.iplib import ip_network_to_int
+
+
+class PrefixTrie:
+    """
+    Binary trie of values keyed by IP networks of the same address family.
+    The lookup of the values of networks equal to, covering or covered by
+    specified network does not depend on the number of values stored.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def add(self, network, value):
+        self._get_node(network, create=True).values.add(value)
+
+    def remove(self, network, value):
+        node = self._get_node(network)
+        if node:
+            node.values.discard(value)
+
+    def get_exact(self, network):
+        """
+        Return the set of values of networks equal to specified network.
+        """
+        node = self._get_node(network)
+        return set(node.values) if node else set()
+
+    def get_covering(self, network):
+        """
+        Return the set of values of networks containing specified network,
+        including the ones equal to it.
+        """
+        address, prefix_len, max_prefix_len = ip_network_to_int(network)
+        node = self._root
+        values = set(node.values)
+        for depth in range(prefix_len):
+            node = node.children[_get_bit(address, depth, max_prefix_len)]
+            if node is None:
+                break
+            values.update(node.values)
+        return values
+
+    def get_covered_by(self, network):
+        """
+        Return the set of values of networks contained by specified network,
+        including the ones equal to it.
+        """
+        values = set()
+        node = self._get_node(network)
+        pending_nodes = [node] if node else []
+        while pending_nodes:
+            node = pending_nodes.pop()
+            values.update(node.values)
+            pending_nodes.extend(
+                child for child in node.children if child is not None
+            )
+        return values
+
+    def _get_node(self, network, create=False):
+        address, prefix_len, max_prefix_len = ip_network_to_int(network)
+        node = self._root
+        for depth in range(prefix_len):
+            bit = _get_bit(address, depth, max_prefix_len)
+            child = node.children[bit]
+            if child is None:
+                if not create:
+                    return None
+                child = _TrieNode()
+                node.children[bit] = child
+            node = child
+        return node
+
+
+class _TrieNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children = [None, None]
+        self.values = set()
+
+
+def _get_bit(address, depth, max_prefix_len):
+    return (address >> (max_prefix_len - depth - 1)) & 1
@@ -18,9 +18,11 @@
 #
 
 from collections import defaultdict
+import sys
 
 from libnmstate.error import NmstateValueError
 from libnmstate.error import NmstateVerificationError
+from libnmstate.iplib import KERNEL_MAIN_ROUTE_TABLE_ID
 from libnmstate.iplib import is_ipv6_address
 from libnmstate.iplib import canonicalize_ip_network
 from libnmstate.iplib import canonicalize_ip_address
@@ -28,29 +30,50 @@ from libnmstate.prettystate import format_desired_current_state_diff
 from libnmstate.schema import Interface
 from libnmstate.schema import Route
 
+from .prefix_trie import PrefixTrie
 from .state import StateEntry
 from .state import state_match
 
+# The main route table is referred as 0 in the routes using the default table
+_MAIN_ROUTE_TABLE_IDS = frozenset(
+    (Route.USE_DEFAULT_ROUTE_TABLE, KERNEL_MAIN_ROUTE_TABLE_ID)
+)
+
 
 class RouteEntry(StateEntry):
     IPV4_DEFAULT_GATEWAY_DESTINATION = "0.0.0.0/0"
     IPV6_DEFAULT_GATEWAY_DESTINATION = "::/0"
 
+    __slots__ = (
+        "table_id",
+        "state",
+        "metric",
+        "destination",
+        "next_hop_address",
+        "next_hop_interface",
+        "_invalid_reason",
+        "_is_ipv6",
+    )
+
     def __init__(self, route):
         self.table_id = route.get(Route.TABLE_ID)
         self.state = route.get(Route.STATE)
         self.metric = route.get(Route.METRIC)
         self.destination = route.get(Route.DESTINATION)
         self.next_hop_address = route.get(Route.NEXT_HOP_ADDRESS)
-        self.next_hop_interface = route.get(Route.NEXT_HOP_INTERFACE)
+        self.next_hop_interface = _intern(route.get(Route.NEXT_HOP_INTERFACE))
         # TODO: Convert IPv6 full address to abbreviated address
         self.complement_defaults()
         self._invalid_reason = None
         self._canonicalize_ip_address()
+        self._is_ipv6 = bool(self.destination) and is_ipv6_address(
+            self.destination
+        )
+        self._freeze()
 
     @property
     def is_ipv6(self):
-        return is_ipv6_address(self.destination)
+        return self._is_ipv6
 
     @property
     def is_gateway(self):
@@ -156,21 +179,32 @@ class RouteEntry(StateEntry):
             if self.destination:
                 self.destination = canonicalize_ip_network(self.destination)
             if self.next_hop_address:
-                self.next_hop_address = canonicalize_ip_address(
-                    self.next_hop_address
+                # Many routes share the same gateway
+                self.next_hop_address = _intern(
+                    canonicalize_ip_address(self.next_hop_address)
                 )
 
 
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class RouteState:
     def __init__(self, ifaces, des_route_state, cur_route_state):
         self._cur_routes = defaultdict(set)
         self._routes = defaultdict(set)
+        # Secondary indexes of self._routes
+        self._table_routes = defaultdict(set)
+        self._table_dest_routes = defaultdict(set)
+        # (table ID, is IPv6) -> PrefixTrie of routes by destination, only
+        # built once queried
+        self._dest_tries = None
         if cur_route_state:
             for entry in cur_route_state.get(Route.CONFIG, []):
                 rt = RouteEntry(entry)
                 self._cur_routes[rt.next_hop_interface].add(rt)
                 if not ifaces or rt.is_valid(ifaces):
-                    self._routes[rt.next_hop_interface].add(rt)
+                    self._add_route(rt)
         if des_route_state:
             self._merge_routes(des_route_state, ifaces)
 
@@ -187,26 +221,125 @@ class RouteState:
             if not rt.absent:
                 if rt.is_valid(ifaces):
                     ifaces[rt.next_hop_interface].mark_as_changed()
-                    self._routes[rt.next_hop_interface].add(rt)
+                    self._add_route(rt)
                 else:
                     raise NmstateValueError(rt.invalid_reason)
 
+    def _add_route(self, rt):
+        self._routes[rt.next_hop_interface].add(rt)
+        self._table_routes[rt.table_id].add(rt)
+        self._table_dest_routes[(rt.table_id, rt.destination)].add(rt)
+        if self._dest_tries is not None:
+            self._add_route_to_trie(rt)
+
+    def _remove_route(self, rt):
+        # Keep the empty route set of interface, so that its routes are
+        # removed by gen_metadata()
+        self._routes[rt.next_hop_interface].discard(rt)
+        _discard_from_index(self._table_routes, rt.table_id, rt)
+        _discard_from_index(
+            self._table_dest_routes, (rt.table_id, rt.destination), rt
+        )
+        if self._dest_tries is not None and rt.destination:
+            trie = self._dest_tries.get((rt.table_id, rt.is_ipv6))
+            if trie:
+                trie.remove(rt.destination, rt)
+
     def _apply_absent_routes(self, rt, ifaces):
         """
         Remove routes based on absent routes and treat missing property as
         wildcard match.
         """
-        absent_iface_name = rt.next_hop_interface
-        for iface_name, route_set in self._routes.items():
-            if absent_iface_name and absent_iface_name != iface_name:
+        matched_routes = [
+            route
+            for route in self._get_route_candidates(rt)
+            if rt.match(route)
+        ]
+        changed_iface_names = set()
+        for route in matched_routes:
+            self._remove_route(route)
+            changed_iface_names.add(route.next_hop_interface)
+        for iface_name in changed_iface_names:
+            ifaces[iface_name].mark_as_changed()
+
+    def _get_route_candidates(self, rt):
+        """
+        Return the routes which might be matched by the absent route, from the
+        most selective index of the properties it defined.
+        """
+        candidates = []
+        if rt.next_hop_interface:
+            candidates.append(self._routes.get(rt.next_hop_interface, ()))
+        if rt.table_id is not None:
+            if rt.destination is not None:
+                candidates.append(
+                    self._table_dest_routes.get(
+                        (rt.table_id, rt.destination), ()
+                    )
+                )
+            else:
+                candidates.append(self._table_routes.get(rt.table_id, ()))
+        if candidates:
+            return min(candidates, key=len)
+        return [route for routes in self._routes.values() for route in routes]
+
+    def get_table_routes(self, table_id):
+        """
+        Return the configured routes in specified route table.
+        """
+        return self._table_routes.get(table_id, set())
+
+    def get_covering_routes(self, destination, table_id=None):
+        """
+        Return the sorted configured routes with destination containing the
+        specified destination, including the ones equal to it.
+        Only search in specified route table if table_id is not None, the
+        main route table could be referred as 254 or 0.
+        """
+        return self._query_dest_tries(
+            PrefixTrie.get_covering, destination, table_id
+        )
+
+    def get_covered_routes(self, destination, table_id=None):
+        """
+        Return the sorted configured routes with destination contained by the
+        specified destination, including the ones equal to it.
+        Only search in specified route table if table_id is not None, the
+        main route table could be referred as 254 or 0.
+        """
+        return self._query_dest_tries(
+            PrefixTrie.get_covered_by, destination, table_id
+        )
+
+    def _query_dest_tries(self, query, destination, table_id):
+        if self._dest_tries is None:
+            self._dest_tries = {}
+            for route_set in self._routes.values():
+                for rt in route_set:
+                    self._add_route_to_trie(rt)
+        table_ids = None
+        if table_id is not None:
+            table_ids = {table_id}
+            if table_id in _MAIN_ROUTE_TABLE_IDS:
+                table_ids = _MAIN_ROUTE_TABLE_IDS
+        is_ipv6 = is_ipv6_address(destination)
+        routes = set()
+        for (trie_table_id, trie_is_ipv6), trie in self._dest_tries.items():
+            if trie_is_ipv6 != is_ipv6 or (
+                table_ids is not None and trie_table_id not in table_ids
+            ):
                 continue
-            new_routes = set()
-            for route in route_set:
-                if not rt.match(route):
-                    new_routes.add(route)
-            if new_routes != route_set:
-                ifaces[iface_name].mark_as_changed()
-                self._routes[iface_name] = new_routes
+            routes.update(query(trie, destination))
+        return sorted(routes)
+
+    def _add_route_to_trie(self, rt):
+        if rt.destination:
+            key = (rt.table_id, rt.is_ipv6)
+            trie = self._dest_tries.get(key)
+            if trie is None:
+                trie = PrefixTrie()
+                self._dest_tries[key] = trie
+            trie.add(rt.destination, rt)
 
     def gen_metadata(self, ifaces):
         """
@@ -239,11 +372,16 @@ class RouteState:
             return {}
         return self._routes
 
-    def verify(self, cur_route_state):
+    def verify(self, cur_route_state, iface_names=None):
+        """
+        Only verify the routes of iface_names if defined.
+        """
         current = RouteState(
             ifaces=None, des_route_state=None, cur_route_state=cur_route_state
         )
         for iface_name, route_set in self._routes.items():
+            if iface_names is not None and iface_name not in iface_names:
+                continue
             routes_info = [r.to_dict() for r in sorted(route_set)]
             cur_routes_info = [
                 r.to_dict()
@@ -256,3 +394,11 @@ class RouteState:
                         {Route.KEY: {Route.CONFIG: cur_routes_info}},
                     )
                 )
+
+
+def _discard_from_index(index, key, route):
+    routes = index.get(key)
+    if routes is not None:
+        routes.discard(route)
+        if not routes:
+            del index[key]
@@ -17,13 +17,17 @@ from .state import state_match
 
 
 class RouteRuleEntry(StateEntry):
+    __slots__ = ("ip_from", "ip_to", "priority", "route_table", "_is_ipv6")
+
     def __init__(self, route_rule):
         self.ip_from = route_rule.get(RouteRule.IP_FROM)
         self.ip_to = route_rule.get(RouteRule.IP_TO)
         self.priority = route_rule.get(RouteRule.PRIORITY)
         self.route_table = route_rule.get(RouteRule.ROUTE_TABLE)
+        self._is_ipv6 = None
         self._complement_defaults()
         self._canonicalize_ip_network()
+        self._freeze()
 
     def _complement_defaults(self):
         if self.ip_from is None:
@@ -49,16 +53,18 @@ class RouteRuleEntry(StateEntry):
 
     @property
     def is_ipv6(self):
-        if self.ip_from:
-            return is_ipv6_address(self.ip_from)
-        elif self.ip_to:
-            return is_ipv6_address(self.ip_to)
-        else:
-            logging.warning(
-                f"Neither {RouteRule.IP_FROM} nor {RouteRule.IP_TO} "
-                "is defined, treating it a IPv4 route rule"
-            )
-            return False
+        if self._is_ipv6 is None:
+            if self.ip_from:
+                self._is_ipv6 = is_ipv6_address(self.ip_from)
+            elif self.ip_to:
+                self._is_ipv6 = is_ipv6_address(self.ip_to)
+            else:
+                logging.warning(
+                    f"Neither {RouteRule.IP_FROM} nor {RouteRule.IP_TO} "
+                    "is defined, treating it a IPv4 route rule"
+                )
+                self._is_ipv6 = False
+        return self._is_ipv6
 
     @property
     def absent(self):
@@ -66,20 +72,15 @@ class RouteRuleEntry(StateEntry):
             "RouteRuleEntry does not support absent property"
         )
 
-    def is_valid(self, config_iface_routes):
+    def is_valid(self, route_state):
         """
         Return False when there is no route for defined route table.
         """
-        found = False
-        for route_set in config_iface_routes.values():
-            for route in route_set:
-                if route.table_id == self.route_table or (
-                    route.table_id == Route.USE_DEFAULT_ROUTE_TABLE
-                    and self.route_table == KERNEL_MAIN_ROUTE_TABLE_ID
-                ):
-                    found = True
-                    break
-        return found
+        if route_state.get_table_routes(self.route_table):
+            return True
+        return self.route_table == KERNEL_MAIN_ROUTE_TABLE_ID and bool(
+            route_state.get_table_routes(Route.USE_DEFAULT_ROUTE_TABLE)
+        )
 
 
 class RouteRuleState:
@@ -101,9 +102,7 @@ class RouteRuleState:
             # Discard invalid route rule when merging from current
             for rules in self._cur_rules.values():
                 for rule in rules:
-                    if not route_state or rule.is_valid(
-                        route_state.config_iface_routes
-                    ):
+                    if not route_state or rule.is_valid(route_state):
                         self._rules[rule.route_table].add(rule)
 
     @property
@@ -152,20 +151,19 @@ class RouteRuleState:
         route_rule_metadata = {}
         for route_table, rules in self._rules.items():
             iface_name = self._iface_for_route_table(route_state, route_table)
-            route_rule_metadata[iface_name] = {
-                Interface.IPV4: [],
-                Interface.IPV6: [],
-            }
+            iface_metadata = route_rule_metadata.setdefault(
+                iface_name, {Interface.IPV4: [], Interface.IPV6: []}
+            )
             for rule in rules:
                 family = Interface.IPV6 if rule.is_ipv6 else Interface.IPV4
-                route_rule_metadata[iface_name][family].append(rule.to_dict())
+                iface_metadata[family].append(rule.to_dict())
         return route_rule_metadata
 
     def _iface_for_route_table(self, route_state, route_table):
-        for routes in route_state.config_iface_routes.values():
-            for route in routes:
-                if route.table_id == route_table:
-                    return route.next_hop_interface
+        routes = route_state.get_table_routes(route_table)
+        if routes:
+            # The lowest interface name is picked regardless of set order
+            return min(routes).next_hop_interface
         raise NmstateValueError(
             "Failed to find interface to with route table ID "
             f"{route_table} to store route rules"
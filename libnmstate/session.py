@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from libnmstate.error import NmstateValueError
+
+from .netapplier import apply_many_with_plugins
+from .netapplier import apply_with_plugins
+from .netapplier import plan_with_plugins
+from .nmstate import destroy_checkpoints
+from .nmstate import load_plugins
+from .nmstate import rollback_checkpoints
+from .nmstate import show_with_plugins
+from .nmstate import unload_plugins
+from .netwatch import watch_with_plugins
+
+
+class Session:
+    """
+    Keep the plugins(and their connection to NetworkManager) loaded across
+    multiple show/apply/commit/rollback calls.
+    The content of the plugins is refreshed before each call instead of
+    reloading them. Example:
+
+        with libnmstate.Session() as session:
+            while True:
+                state = session.show()
+    """
+
+    def __init__(self):
+        self._plugins = load_plugins()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._plugins is not None:
+            unload_plugins(self._plugins)
+            self._plugins = None
+
+    @property
+    def closed(self):
+        return self._plugins is None
+
+    @property
+    def plugins(self):
+        if self._plugins is None:
+            raise NmstateValueError("Session is already closed")
+        return self._plugins
+
+    def show(self, *, include_status_data=False, interfaces=None, fields=None):
+        """
+        Same as `libnmstate.show()`.
+        """
+        return show_with_plugins(
+            self.plugins, include_status_data, interfaces, fields
+        )
+
+    def watch(
+        self,
+        *,
+        include_status_data=False,
+        interfaces=None,
+        full_snapshot=False,
+    ):
+        """
+        Same as `libnmstate.watch()`.
+        """
+        return watch_with_plugins(
+            self.plugins,
+            include_status_data=include_status_data,
+            interfaces=interfaces,
+            full_snapshot=full_snapshot,
+        )
+
+    def apply(
+        self,
+        desired_state,
+        *,
+        verify_change=True,
+        commit=True,
+        rollback_timeout=60,
+        save_to_disk=True,
+        scoped_checkpoint=True,
+    ):
+        """
+        Same as `libnmstate.apply()`.
+        """
+        return apply_with_plugins(
+            self.plugins,
+            desired_state,
+            verify_change=verify_change,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+            save_to_disk=save_to_disk,
+            scoped_checkpoint=scoped_checkpoint,
+        )
+
+    def apply_many(
+        self,
+        desired_states,
+        *,
+        verify_change=True,
+        commit=True,
+        rollback_timeout=60,
+        save_to_disk=True,
+    ):
+        """
+        Same as `libnmstate.apply_many()`.
+        """
+        return apply_many_with_plugins(
+            self.plugins,
+            desired_states,
+            verify_change=verify_change,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+            save_to_disk=save_to_disk,
+        )
+
+    def plan(self, desired_state, *, save_to_disk=True):
+        """
+        Same as `libnmstate.plan()`.
+        """
+        return plan_with_plugins(
+            self.plugins, desired_state, save_to_disk=save_to_disk
+        )
+
+    def commit(self, *, checkpoint=None):
+        """
+        Same as `libnmstate.commit()`.
+        """
+        destroy_checkpoints(self.plugins, checkpoint)
+
+    def rollback(self, *, checkpoint=None):
+        """
+        Same as `libnmstate.rollback()`.
+        """
+        rollback_checkpoints(self.plugins, checkpoint)
@@ -21,11 +21,20 @@ from abc import ABCMeta
 from abc import abstractmethod
 from collections.abc import Sequence
 from collections.abc import Mapping
+import fnmatch
 from functools import total_ordering
 
 
 @total_ordering
 class StateEntry(metaclass=ABCMeta):
+    """
+    The subclass should list its attributes in `__slots__` and invoke
+    `_freeze()` once they are all set, the entry should not be modified since
+    then.
+    """
+
+    __slots__ = ("_key_tuple",)
+
     @abstractmethod
     def _keys(self):
         """
@@ -34,14 +43,17 @@ class StateEntry(metaclass=ABCMeta):
         """
         pass
 
+    def _freeze(self):
+        self._key_tuple = self._keys()
+
     def __hash__(self):
-        return hash(self._keys())
+        return hash(self._key_tuple)
 
     def __eq__(self, other):
-        return self is other or self._keys() == other._keys()
+        return self is other or self._key_tuple == other._key_tuple
 
     def __lt__(self, other):
-        return self._keys() < other._keys()
+        return self._key_tuple < other._key_tuple
 
     def __repr__(self):
         return str(self.to_dict())
@@ -52,11 +64,13 @@ class StateEntry(metaclass=ABCMeta):
         pass
 
     def to_dict(self):
-        return {
-            key.replace("_", "-"): value
-            for key, value in vars(self).items()
-            if (not key.startswith("_")) and (value is not None)
-        }
+        info = {}
+        for key in self.__slots__:
+            if not key.startswith("_"):
+                value = getattr(self, key)
+                if value is not None:
+                    info[key.replace("_", "-")] = value
+        return info
 
     def match(self, other):
         """
@@ -64,7 +78,7 @@ class StateEntry(metaclass=ABCMeta):
         matching against any value in others.
         Return True for a match, False otherwise.
         """
-        for self_value, other_value in zip(self._keys(), other._keys()):
+        for self_value, other_value in zip(self._key_tuple, other._key_tuple):
             if self_value is not None and self_value != other_value:
                 return False
         return True
@@ -102,3 +116,87 @@ def merge_dict(dict_to, dict_from):
             dict_to[key] = from_value
         elif isinstance(dict_to[key], Mapping):
             merge_dict(dict_to[key], from_value)
+
+
+class InterfaceFilter:
+    """
+    Match interface names against a list of names or shell-style wildcards.
+    Example: InterfaceFilter(["eth1", "bond*"])
+    """
+
+    def __init__(self, patterns):
+        self._names = set()
+        self._globs = []
+        for pattern in patterns:
+            if any(c in pattern for c in "*?["):
+                self._globs.append(pattern)
+            else:
+                self._names.add(pattern)
+
+    def match(self, iface_name):
+        return iface_name in self._names or any(
+            fnmatch.fnmatchcase(iface_name, glob) for glob in self._globs
+        )
+
+
+class FieldFilter:
+    """
+    Select the parts of report by dot-separated paths of keys. For lists like
+    interfaces, the remaining path applies to each item of the list.
+    Example: FieldFilter(["interfaces.name", "interfaces.state", "routes"])
+    """
+
+    def __init__(self, paths):
+        # Nested dict of selected keys, None means the whole value is selected
+        self._tree = {}
+        for path in paths:
+            keys = path.split(".")
+            node = self._tree
+            for key in keys[:-1]:
+                node = node.setdefault(key, {})
+                if node is None:
+                    break
+            else:
+                node[keys[-1]] = None
+
+    @property
+    def sections(self):
+        return set(self._tree)
+
+    def match(self, *keys):
+        """
+        Return True if the value of specified path of keys is fully or
+        partially selected.
+        """
+        node = self._tree
+        for key in keys:
+            if node is None:
+                return True
+            if key not in node:
+                return False
+            node = node[key]
+        return True
+
+    def match_any(self, section, keys):
+        return any(self.match(section, key) for key in keys)
+
+    def project(self, report):
+        """
+        Return a new report holding only the selected values.
+        """
+        return _project(report, self._tree)
+
+
+def _project(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, Mapping):
+        return {
+            key: _project(value[key], sub_tree)
+            for key, sub_tree in tree.items()
+            if key in value
+        }
+    elif isinstance(value, Sequence) and not isinstance(value, str):
+        return [_project(item, tree) for item in value]
+    else:
+        return value
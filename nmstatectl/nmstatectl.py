@@ -157,6 +157,13 @@ def setup_subcommand_set(subparsers):
         default=True,
         help="Do not make the state persistent.",
     )
+    parser_set.add_argument(
+        "--plan",
+        action="store_true",
+        default=False,
+        help="Only show the operations planned to set the state, without "
+        "changing anything.",
+    )
     parser_set.set_defaults(func=apply)
 
 
@@ -170,6 +177,25 @@ def setup_subcommand_show(subparsers):
         action="store_false",
         dest="yaml",
     )
+    parser_show.add_argument(
+        "--fields",
+        help="Show only specified fields (comma-separated), for example: "
+        "interfaces.name,interfaces.state,routes.config",
+        default=None,
+    )
+    parser_show.add_argument(
+        "--watch",
+        help="Keep running and report the changes of network state",
+        default=False,
+        action="store_true",
+    )
+    parser_show.add_argument(
+        "--full",
+        help="Report the full network state on every change in watch mode",
+        default=False,
+        action="store_true",
+        dest="full_snapshot",
+    )
     parser_show.add_argument(
         "only",
         default="*",
@@ -199,7 +225,7 @@ def commit(args):
 
 
 def edit(args):
-    state = _filter_state(libnmstate.show(), args.only)
+    state = _show_state(args.only)
 
     if not state[Interface.KEY]:
         sys.stderr.write("ERROR: No such interface\n")
@@ -235,59 +261,106 @@ def rollback(args):
 
 
 def show(args):
-    state = _filter_state(libnmstate.show(), args.only)
+    if args.watch:
+        return _watch_state(args.only, args.full_snapshot, args.yaml)
+    state = _show_state(args.only, args.fields)
     print_state(state, use_yaml=args.yaml)
 
 
+def _watch_state(whitelist, full_snapshot, use_yaml):
+    """
+    The first report and the full snapshots are filtered like `show`, while
+    the changes only have their routes filtered as they might not contain
+    the routes which route rules refer to.
+    """
+    interfaces = None if whitelist == "*" else whitelist.split(",")
+    is_first = True
+    try:
+        for state in libnmstate.watch(
+            interfaces=interfaces, full_snapshot=full_snapshot
+        ):
+            if is_first or full_snapshot:
+                state = _filter_state(state, whitelist)
+                is_first = False
+            elif interfaces and Route.KEY in state:
+                state[Route.KEY] = _filter_routes(state, interfaces)
+            print_state(state, use_yaml=use_yaml)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+
+
 def apply(args):
     if args.file:
+        statedatas = []
         for statefile in args.file:
             if statefile == "-" and not os.path.isfile(statefile):
-                statedata = sys.stdin.read()
+                statedatas.append(sys.stdin.read())
             else:
                 with open(statefile) as statefile:
-                    statedata = statefile.read()
-
-            ret = apply_state(
-                statedata,
-                args.verify,
-                args.commit,
-                args.timeout,
-                args.save_to_disk,
-            )
-            if ret:
-                return ret
+                    statedatas.append(statefile.read())
     elif not sys.stdin.isatty():
-        statedata = sys.stdin.read()
-        return apply_state(
-            statedata,
-            args.verify,
-            args.commit,
-            args.timeout,
-            args.save_to_disk,
-        )
+        statedatas = [sys.stdin.read()]
     else:
         sys.stderr.write("ERROR: No state specified\n")
         return 1
 
+    if args.plan:
+        return plan_states(statedatas, args.save_to_disk)
+    return apply_states(
+        statedatas, args.verify, args.commit, args.timeout, args.save_to_disk,
+    )
 
-def apply_state(statedata, verify_change, commit, timeout, save_to_disk):
-    use_yaml = False
-    # JSON dictionaries start with a curly brace
-    if statedata[0] == "{":
-        state = json.loads(statedata)
-    else:
-        state = yaml.load(statedata, Loader=yaml.SafeLoader)
-        use_yaml = True
 
-    try:
-        checkpoint = libnmstate.apply(
-            state,
-            verify_change=verify_change,
-            commit=commit,
-            rollback_timeout=timeout,
-            save_to_disk=save_to_disk,
+def plan_states(statedatas, save_to_disk):
+    """
+    Print the operations planned for each state without changing anything.
+    """
+    states, use_yamls = _load_states(statedatas)
+    for state, use_yaml in zip(states, use_yamls):
+        print_state(
+            libnmstate.plan(state, save_to_disk=save_to_disk),
+            use_yaml=use_yaml,
         )
+
+
+def _load_states(statedatas):
+    states = []
+    use_yamls = []
+    for statedata in statedatas:
+        # JSON dictionaries start with a curly brace
+        if statedata[0] == "{":
+            states.append(json.loads(statedata))
+            use_yamls.append(False)
+        else:
+            states.append(yaml.load(statedata, Loader=yaml.SafeLoader))
+            use_yamls.append(True)
+    return states, use_yamls
+
+
+def apply_states(statedatas, verify_change, commit, timeout, save_to_disk):
+    """
+    Apply all the states in a single transaction.
+    """
+    states, use_yamls = _load_states(statedatas)
+
+    try:
+        if len(states) == 1:
+            checkpoint = libnmstate.apply(
+                states[0],
+                verify_change=verify_change,
+                commit=commit,
+                rollback_timeout=timeout,
+                save_to_disk=save_to_disk,
+            )
+        else:
+            checkpoint = libnmstate.apply_many(
+                states,
+                verify_change=verify_change,
+                commit=commit,
+                rollback_timeout=timeout,
+                save_to_disk=save_to_disk,
+            )
     except NmstatePermissionError as e:
         sys.stderr.write("ERROR: Missing permissions:{}\n".format(str(e)))
         return os.EX_NOPERM
@@ -298,18 +371,32 @@ def apply_state(statedata, verify_change, commit, timeout, save_to_disk):
         )
         return os.EX_UNAVAILABLE
 
-    print("Desired state applied: ")
-    print_state(state, use_yaml=use_yaml)
+    for state, use_yaml in zip(states, use_yamls):
+        print("Desired state applied: ")
+        print_state(state, use_yaml=use_yaml)
     if checkpoint:
         print("Checkpoint: {}".format(checkpoint))
 
 
+def _show_state(whitelist, fields=None):
+    show_args = {}
+    if whitelist != "*":
+        show_args["interfaces"] = whitelist.split(",")
+    if fields:
+        show_args["fields"] = fields.split(",")
+    state = libnmstate.show(**show_args)
+    return _filter_state(state, whitelist)
+
+
 def _filter_state(state, whitelist):
     if whitelist != "*":
         patterns = [p for p in whitelist.split(",")]
-        state[Interface.KEY] = _filter_interfaces(state, patterns)
-        state[Route.KEY] = _filter_routes(state, patterns)
-        state[RouteRule.KEY] = _filter_route_rule(state)
+        if Interface.KEY in state:
+            state[Interface.KEY] = _filter_interfaces(state, patterns)
+        if Route.KEY in state:
+            state[Route.KEY] = _filter_routes(state, patterns)
+            if RouteRule.KEY in state:
+                state[RouteRule.KEY] = _filter_route_rule(state)
     return state
 
 
@@ -418,9 +505,13 @@ def _filter_routes(state, patterns):
     return the states for all routes from `state` that match at least one
     of the provided patterns.
     """
-    routes = {Route.CONFIG: [], Route.RUNNING: []}
-    for route_type in (Route.RUNNING, Route.CONFIG):
-        for route in state.get(Route.KEY, {}).get(route_type, []):
+    routes = {
+        route_type: []
+        for route_type in (Route.CONFIG, Route.RUNNING)
+        if route_type in state.get(Route.KEY, {})
+    }
+    for route_type in routes:
+        for route in state[Route.KEY][route_type]:
             for pattern in patterns:
                 if fnmatch.fnmatch(route[Route.NEXT_HOP_INTERFACE], pattern):
                     routes[route_type].append(route)
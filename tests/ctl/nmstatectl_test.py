@@ -95,6 +95,44 @@ def test_run_ctl_directly_set():
     nmstatectl.main()
 
 
+@mock.patch("sys.argv", ["nmstatectl", "set", "s1.yml", "s2.json"])
+@mock.patch.object(nmstatectl.libnmstate, "apply_many")
+@mock.patch.object(nmstatectl, "open", create=True)
+def test_run_ctl_directly_set_many(open_mock, apply_many_mock):
+    open_mock.side_effect = [
+        mock.mock_open(read_data="interfaces: []").return_value,
+        mock.mock_open(read_data="{}").return_value,
+    ]
+    apply_many_mock.return_value = None
+
+    nmstatectl.main()
+
+    apply_many_mock.assert_called_once_with(
+        [{"interfaces": []}, {}],
+        verify_change=True,
+        commit=True,
+        rollback_timeout=60,
+        save_to_disk=True,
+    )
+
+
+@mock.patch("sys.argv", ["nmstatectl", "set", "--plan", "s1.json"])
+@mock.patch.object(nmstatectl.libnmstate, "apply")
+@mock.patch.object(nmstatectl.libnmstate, "plan")
+@mock.patch.object(
+    nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+)
+@mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
+def test_run_ctl_directly_set_plan(mock_stdout, plan_mock, apply_mock):
+    plan_mock.return_value = {"operations": [], "interfaces": []}
+
+    nmstatectl.main()
+
+    plan_mock.assert_called_once_with({}, save_to_disk=True)
+    apply_mock.assert_not_called()
+    assert json.loads(mock_stdout.getvalue()) == plan_mock.return_value
+
+
 @mock.patch("sys.argv", ["nmstatectl", "show"])
 @mock.patch.object(nmstatectl.libnmstate, "show", lambda: {})
 def test_run_ctl_directly_show_empty():
@@ -103,7 +141,7 @@ def test_run_ctl_directly_show_empty():
 
 @mock.patch("sys.argv", ["nmstatectl", "show", "non_existing_interface"])
 @mock.patch.object(
-    nmstatectl.libnmstate, "show", lambda: json.loads(LO_JSON_STATE)
+    nmstatectl.libnmstate, "show", lambda **kwargs: json.loads(LO_JSON_STATE)
 )
 @mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
 def test_run_ctl_directly_show_only_empty(mock_stdout):
@@ -113,7 +151,7 @@ def test_run_ctl_directly_show_only_empty(mock_stdout):
 
 @mock.patch("sys.argv", ["nmstatectl", "show", "lo"])
 @mock.patch.object(
-    nmstatectl.libnmstate, "show", lambda: json.loads(LO_JSON_STATE)
+    nmstatectl.libnmstate, "show", lambda **kwargs: json.loads(LO_JSON_STATE)
 )
 @mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
 def test_run_ctl_directly_show_only(mock_stdout):
@@ -125,7 +163,7 @@ def test_run_ctl_directly_show_only(mock_stdout):
     "sys.argv", ["nmstatectl", "show", "--json", "non_existing_interface"]
 )
 @mock.patch.object(
-    nmstatectl.libnmstate, "show", lambda: json.loads(LO_JSON_STATE)
+    nmstatectl.libnmstate, "show", lambda **kwargs: json.loads(LO_JSON_STATE)
 )
 @mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
 def test_run_ctl_directly_show_json_only_empty(mock_stdout):
@@ -135,7 +173,7 @@ def test_run_ctl_directly_show_json_only_empty(mock_stdout):
 
 @mock.patch("sys.argv", ["nmstatectl", "show", "--json", "lo"])
 @mock.patch.object(
-    nmstatectl.libnmstate, "show", lambda: json.loads(LO_JSON_STATE)
+    nmstatectl.libnmstate, "show", lambda **kwargs: json.loads(LO_JSON_STATE)
 )
 @mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
 def test_run_ctl_directly_show_json_only(mock_stdout):
@@ -146,3 +184,42 @@ def test_run_ctl_directly_show_json_only(mock_stdout):
 def test_run_ctl_executable():
     rc = subprocess.call(["nmstatectl", "--help"])
     assert rc == 0
+
+
+@mock.patch("sys.argv", ["nmstatectl", "show", "--watch", "lo"])
+@mock.patch.object(
+    nmstatectl.libnmstate,
+    "watch",
+    lambda **kwargs: iter(
+        [
+            json.loads(LO_JSON_STATE),
+            {"interfaces": [{"name": "lo", "state": "absent"}]},
+        ]
+    ),
+)
+@mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
+def test_run_ctl_directly_show_watch(mock_stdout):
+    nmstatectl.main()
+    assert mock_stdout.getvalue() == (
+        LO_YAML_STATE + "---\ninterfaces:\n- name: lo\n  state: absent\n"
+    )
+
+
+@mock.patch(
+    "sys.argv",
+    ["nmstatectl", "show", "--fields", "interfaces.name,routes.config", "lo"],
+)
+@mock.patch.object(nmstatectl.libnmstate, "show")
+@mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
+def test_run_ctl_directly_show_fields(mock_stdout, show_mock):
+    show_mock.return_value = {
+        "routes": {"config": []},
+        "interfaces": [{"name": "lo"}],
+    }
+    nmstatectl.main()
+    show_mock.assert_called_once_with(
+        interfaces=["lo"], fields=["interfaces.name", "routes.config"]
+    )
+    assert mock_stdout.getvalue() == (
+        "---\nroutes:\n  config: []\ninterfaces:\n- name: lo\n"
+    )
@@ -18,12 +18,14 @@
 #
 
 import logging
+import os
 import subprocess
 import warnings
 
 import pytest
 
 import libnmstate
+from libnmstate import validator
 from libnmstate.schema import DNS
 from libnmstate.schema import Route
 from libnmstate.schema import RouteRule
@@ -39,6 +41,8 @@ nmstate: {nmstate_version}
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "slow tier1 tier2")
+    # Validate the reported state of every show
+    os.environ[validator.VALIDATE_SHOW_ENV] = "1"
 
 
 def pytest_addoption(parser):
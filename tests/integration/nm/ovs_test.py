@@ -326,5 +326,5 @@ def _assert_mac_exists(ctx, ifname):
     state = {}
     nmdev = ctx.get_nm_dev(ifname)
     if nmdev:
-        state = nm.wired.get_info(nmdev)
+        state = nm.wired.get_info(ctx, nmdev)
     assert state.get(Interface.MAC)
@@ -73,7 +73,7 @@ def _modify_interface(ctx, wired_state):
 def _get_wired_current_state(plugin, ifname):
     plugin.refresh_content()
     nmdev = plugin.context.get_nm_dev(ifname)
-    return nm.wired.get_info(nmdev) if nmdev else {}
+    return nm.wired.get_info(plugin.context, nmdev) if nmdev else {}
 
 
 def _create_iface_settings(wired_state, con_profile):
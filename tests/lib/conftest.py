@@ -0,0 +1,45 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: performance comparison, slow and noisy"
+    )
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runbenchmark",
+        action="store_true",
+        default=False,
+        help="run benchmark tests",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--runbenchmark"):
+        skip_benchmark = pytest.mark.skip(
+            reason="need --runbenchmark option to run"
+        )
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
@@ -0,0 +1,130 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import ctypes
+import errno
+import struct
+
+import pytest
+
+from unittest import mock
+
+from libnmstate import ethtool
+
+LINK_MODE_MASKS_NWORDS = 3
+
+
+def _write_ecmd(ifreq, data):
+    _, address = struct.unpack("16sP", ifreq)
+    ctypes.memmove(address, data, len(data))
+
+
+def _read_cmd(ifreq):
+    _, address = struct.unpack("16sP", ifreq)
+    return struct.unpack("I", ctypes.string_at(address, 4))[0]
+
+
+def _glinksettings_ioctl(fd, request, ifreq):
+    _, address = struct.unpack("16sP", ifreq)
+    nwords = struct.unpack("b", ctypes.string_at(address + 15, 1))[0]
+    if nwords == 0:
+        _write_ecmd(
+            ifreq,
+            struct.pack(
+                "IIBxxBxxxb",
+                ethtool.ETHTOOL_GLINKSETTINGS,
+                0,
+                0,
+                0,
+                -LINK_MODE_MASKS_NWORDS,
+            ),
+        )
+    else:
+        _write_ecmd(
+            ifreq,
+            struct.pack(
+                "IIBxxBxxxb",
+                ethtool.ETHTOOL_GLINKSETTINGS,
+                10000,
+                1,
+                1,
+                LINK_MODE_MASKS_NWORDS,
+            ),
+        )
+
+
+def _gset_only_ioctl(fd, request, ifreq):
+    if _read_cmd(ifreq) == ethtool.ETHTOOL_GLINKSETTINGS:
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+    _write_ecmd(
+        ifreq, struct.pack("I8xHB3xB", ethtool.ETHTOOL_GSET, 1000, 0, 0)
+    )
+
+
+@pytest.fixture
+def socket_mock():
+    with mock.patch.object(ethtool.socket, "socket") as m:
+        yield m
+
+
+@pytest.fixture
+def ioctl_mock():
+    with mock.patch.object(ethtool.fcntl, "ioctl") as m:
+        yield m
+
+
+def test_get_link_settings(socket_mock, ioctl_mock):
+    ioctl_mock.side_effect = _glinksettings_ioctl
+
+    assert ethtool.minimal_ethtool("eth1") == {
+        "speed": 10000,
+        "duplex": "full",
+        "auto-negotiation": True,
+    }
+    assert ioctl_mock.call_count == 2
+
+
+def test_fallback_to_gset(socket_mock, ioctl_mock):
+    ioctl_mock.side_effect = _gset_only_ioctl
+
+    assert ethtool.minimal_ethtool("eth1") == {
+        "speed": 1000,
+        "duplex": "half",
+        "auto-negotiation": False,
+    }
+
+
+def test_get_link_settings_with_failure(socket_mock, ioctl_mock):
+    ioctl_mock.side_effect = OSError(errno.ENODEV, "No such device")
+
+    assert ethtool.minimal_ethtool("eth1") == {
+        "speed": 0,
+        "duplex": "unknown",
+        "auto-negotiation": None,
+    }
+
+
+def test_get_all_link_settings_share_socket(socket_mock, ioctl_mock):
+    ioctl_mock.side_effect = _glinksettings_ioctl
+
+    with ethtool.Ethtool() as ethtool_socket:
+        settings = ethtool_socket.get_all_link_settings(["eth1", "eth2"])
+
+    assert set(settings.keys()) == {"eth1", "eth2"}
+    socket_mock.assert_called_once()
+    socket_mock.return_value.close.assert_called_once()
@@ -31,6 +31,7 @@ from ..testlib.constants import MAC_ADDRESS1
 from ..testlib.constants import IPV6_LINK_LOCAL_ADDRESS1
 from ..testlib.constants import IPV6_ADDRESSES
 from ..testlib.ifacelib import gen_foo_iface_info
+from ..testlib.ifacelib import gen_foo_iface_info_static_ip
 
 
 class TestBaseIface:
@@ -179,3 +180,31 @@ class TestBaseIface:
         iface = BaseIface(gen_foo_iface_info())
         iface2 = BaseIface(gen_foo_iface_info())
         assert iface.config_changed_slaves(iface2) == []
+
+    def test_info_is_not_modified(self):
+        iface_info = gen_foo_iface_info_static_ip()
+        iface_info[Interface.IPV6][InterfaceIPv6.ADDRESS].reverse()
+        iface_info[Interface.MAC] = MAC_ADDRESS1.lower()
+        ori_iface_info = deepcopy(iface_info)
+
+        iface = BaseIface(iface_info)
+        iface.store_route_metadata({Interface.IPV4: ["route"]})
+        iface.mark_as_up()
+        state = iface.state_for_verify()
+
+        assert iface_info == ori_iface_info
+        assert state[Interface.MAC] == MAC_ADDRESS1
+        assert iface.to_dict()[Interface.IPV4][BaseIface.ROUTES_METADATA] == [
+            "route"
+        ]
+
+    def test_info_is_copied_only_when_modified(self):
+        iface_info = gen_foo_iface_info_static_ip()
+
+        iface = BaseIface(iface_info)
+        iface.store_route_metadata({Interface.IPV4: ["route"]})
+
+        assert iface.original_dict is iface_info
+        assert iface._info[Interface.IPV4] is not iface_info[Interface.IPV4]
+        assert iface._info[Interface.IPV6] is iface_info[Interface.IPV6]
+        assert BaseIface.ROUTES_METADATA not in iface_info[Interface.IPV4]
@@ -19,6 +19,7 @@
 
 from copy import deepcopy
 from operator import itemgetter
+import socket
 
 import pytest
 
@@ -29,6 +30,7 @@ from libnmstate.schema import InterfaceType
 
 from libnmstate.ifaces.ovs import OvsBridgeIface
 from libnmstate.ifaces.ovs import OvsInternalIface
+from libnmstate.ifaces.ovs import is_ovs_running
 from libnmstate.ifaces.ifaces import Ifaces
 
 from ..testlib.constants import SLAVE1_IFACE_NAME
@@ -253,3 +255,21 @@ class TestOvsInternalIface:
         ).can_have_ip_when_enslaved
 
     # The 'parent' property is tested by `test_auto_create_ovs_interface`.
+
+
+class TestIsOvsRunning:
+    def test_ovs_db_socket_accepting_connection(self, tmp_path, monkeypatch):
+        socket_path = str(tmp_path / "db.sock")
+        monkeypatch.setenv("OVS_DB_UNIX_SOCKET_PATH", socket_path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen(1)
+
+            assert is_ovs_running()
+
+    def test_ovs_db_socket_not_exist(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(
+            "OVS_DB_UNIX_SOCKET_PATH", str(tmp_path / "db.sock")
+        )
+
+        assert not is_ovs_running()
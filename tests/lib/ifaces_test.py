@@ -125,6 +125,41 @@ class TestIfaces:
         assert edit_iface.is_desired
         assert edit_iface.is_absent
 
+    def test_changed_iface_names(self):
+        cur_iface_infos = self._gen_iface_infos()
+        for slave_name in (SLAVE1_IFACE_NAME, SLAVE2_IFACE_NAME):
+            slave_info = gen_foo_iface_info()
+            slave_info[Interface.NAME] = slave_name
+            cur_iface_infos.append(slave_info)
+        des_iface_info = gen_bridge_iface_info()
+
+        ifaces = Ifaces([des_iface_info], cur_iface_infos)
+
+        assert ifaces.changed_iface_names == {
+            LINUX_BRIDGE_IFACE_NAME,
+            SLAVE1_IFACE_NAME,
+            SLAVE2_IFACE_NAME,
+        }
+
+    def test_affected_iface_names(self):
+        cur_iface_infos = self._gen_iface_infos()
+        for slave_name in (SLAVE1_IFACE_NAME, SLAVE2_IFACE_NAME):
+            slave_info = gen_foo_iface_info()
+            slave_info[Interface.NAME] = slave_name
+            cur_iface_infos.append(slave_info)
+        cur_iface_infos.append(gen_bridge_iface_info())
+        des_iface_info = gen_foo_iface_info()
+        des_iface_info[Interface.NAME] = SLAVE1_IFACE_NAME
+        des_iface_info[Interface.MTU] = 1400
+
+        ifaces = Ifaces([des_iface_info], cur_iface_infos)
+
+        assert ifaces.affected_iface_names == {
+            LINUX_BRIDGE_IFACE_NAME,
+            SLAVE1_IFACE_NAME,
+            SLAVE2_IFACE_NAME,
+        }
+
     def test_validate_unknown_slaves(self):
         cur_iface_infos = self._gen_iface_infos()
         des_iface_info = gen_bridge_iface_info()
@@ -372,3 +407,18 @@ class TestIfaces:
 
         with pytest.raises(NmstateVerificationError):
             des_ifaces.verify(cur_iface_infos)
+
+    def test_verify_filtered_current_master_with_extra_slave(self):
+        cur_iface_infos = self._gen_iface_infos()
+        cur_iface_infos[0][Interface.NAME] = SLAVE1_IFACE_NAME
+        cur_iface_infos[1][Interface.NAME] = SLAVE2_IFACE_NAME
+        cur_iface_infos.append(gen_bridge_iface_info())
+        des_ifaces = Ifaces([gen_bridge_iface_info()], cur_iface_infos)
+        # The shown bridge holds a port attached during the apply, which is
+        # not included in the filtered current state.
+        cur_iface_infos[2][LinuxBridge.CONFIG_SUBTREE][
+            LinuxBridge.PORT_SUBTREE
+        ].append({LinuxBridge.Port.NAME: "eth3"})
+
+        with pytest.raises(NmstateVerificationError):
+            des_ifaces.verify(cur_iface_infos)
@@ -0,0 +1,177 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import copy
+import time
+import tracemalloc
+
+import pytest
+
+from libnmstate import iplib
+from libnmstate.net_state import NetState
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIPv4
+from libnmstate.schema import InterfaceIPv6
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+
+IFACE_COUNT = 2000
+
+
+def _gen_current_state(iface_count=IFACE_COUNT):
+    iface_infos = []
+    for i in range(iface_count):
+        iface_infos.append(
+            {
+                Interface.NAME: f"dummy{i}",
+                Interface.TYPE: InterfaceType.DUMMY,
+                Interface.STATE: InterfaceState.UP,
+                Interface.MTU: 1500,
+                Interface.IPV4: {
+                    InterfaceIPv4.ENABLED: True,
+                    InterfaceIPv4.DHCP: False,
+                    InterfaceIPv4.ADDRESS: [
+                        {
+                            InterfaceIPv4.ADDRESS_IP: (
+                                f"198.51.{i // 256}.{i % 256}"
+                            ),
+                            InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
+                        }
+                    ],
+                },
+                Interface.IPV6: {
+                    InterfaceIPv6.ENABLED: True,
+                    InterfaceIPv6.DHCP: False,
+                    InterfaceIPv6.AUTOCONF: False,
+                    InterfaceIPv6.ADDRESS: [
+                        {
+                            InterfaceIPv6.ADDRESS_IP: f"2001:db8::{i:x}",
+                            InterfaceIPv6.ADDRESS_PREFIX_LENGTH: 64,
+                        },
+                        {
+                            InterfaceIPv6.ADDRESS_IP: f"fe80::{i:x}",
+                            InterfaceIPv6.ADDRESS_PREFIX_LENGTH: 64,
+                        },
+                    ],
+                },
+            }
+        )
+    return {Interface.KEY: iface_infos}
+
+
+def _trace(func):
+    """
+    Return the peak memory allocated and the time spent by func().
+    """
+    tracemalloc.start()
+    try:
+        start = time.monotonic()
+        func()
+        spent = time.monotonic() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, spent
+
+
+def test_current_state_is_not_modified():
+    current_state = _gen_current_state()
+    ori_current_state = copy.deepcopy(current_state)
+    desired_state = {
+        Interface.KEY: [{Interface.NAME: "dummy0", Interface.MTU: 1400}]
+    }
+
+    net_state = NetState(desired_state, current_state)
+
+    assert net_state.has_changes()
+    assert current_state == ori_current_state
+
+
+@pytest.mark.benchmark
+def test_net_state_memory_benchmark():
+    """
+    Compare the peak memory and time of preparing an apply of single
+    interface against a single copy of the current state.
+    """
+    current_state = _gen_current_state()
+    desired_state = {
+        Interface.KEY: [{Interface.NAME: "dummy0", Interface.MTU: 1400}]
+    }
+
+    copy_peak, copy_time = _trace(lambda: copy.deepcopy(current_state))
+    apply_peak, apply_time = _trace(
+        lambda: NetState(desired_state, current_state).has_changes()
+    )
+
+    print(
+        f"{IFACE_COUNT} interfaces: state copy {copy_peak} bytes "
+        f"{copy_time:.3f}s, apply {apply_peak} bytes {apply_time:.3f}s"
+    )
+    assert apply_peak < copy_peak
+
+
+@pytest.mark.benchmark
+def test_net_state_ip_cache_benchmark():
+    """
+    Prepare an apply and verify it against the state shown again, for 10k IP
+    addresses and 50k routes.
+    """
+    iface_count = 3334
+    route_count = 50000
+
+    def _gen_state():
+        state = _gen_current_state(iface_count)
+        state[Route.KEY] = {
+            Route.CONFIG: [
+                {
+                    Route.DESTINATION: (
+                        f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}/32"
+                    ),
+                    Route.NEXT_HOP_ADDRESS: f"198.51.0.{i % 200 + 1}",
+                    Route.NEXT_HOP_INTERFACE: f"dummy{i % iface_count}",
+                    Route.TABLE_ID: 254,
+                    Route.METRIC: 100,
+                }
+                for i in range(route_count)
+            ]
+        }
+        return state
+
+    current_state = _gen_state()
+    shown_state = _gen_state()
+    desired_state = {
+        Interface.KEY: [{Interface.NAME: "dummy0", Interface.MTU: 1500}]
+    }
+    iplib.clear_ip_cache()
+
+    start = time.monotonic()
+    net_state = NetState(desired_state, current_state)
+    apply_time = time.monotonic() - start
+    start = time.monotonic()
+    net_state.verify(shown_state)
+    verify_time = time.monotonic() - start
+
+    cache_info = iplib.get_ip_cache_info()
+    print(
+        f"{route_count} routes of {iface_count} interfaces: "
+        f"apply {apply_time:.3f}s, verify {verify_time:.3f}s, {cache_info}"
+    )
+    assert cache_info["canonicalize_ip_network"].hits >= route_count
+    assert cache_info["canonicalize_ip_address"].hits >= route_count
@@ -23,13 +23,19 @@ import pytest
 from unittest import mock
 
 from libnmstate import netapplier
+from libnmstate.error import NmstateDependencyError
+from libnmstate.error import NmstateLibnmError
+from libnmstate.error import NmstateVerificationError
+from libnmstate.plugin import NmstatePlugin
 from libnmstate.schema import Bond
+from libnmstate.schema import DNS
 from libnmstate.schema import BondMode
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceIPv4
 from libnmstate.schema import InterfaceIPv6
 from libnmstate.schema import InterfaceState
 from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
 
 BOND_TYPE = InterfaceType.BOND
 
@@ -150,6 +156,347 @@ def test_edit_existing_bond(
     )
 
 
+def test_apply_with_plugins_rollback_on_failure(
+    show_with_plugins_mock, net_state_mock
+):
+    show_with_plugins_mock.return_value = {}
+    plugin = mock.MagicMock()
+    plugin.apply_changes.side_effect = NmstateLibnmError("foo")
+
+    with pytest.raises(NmstateLibnmError):
+        netapplier.apply_with_plugins(
+            [plugin], {Interface.KEY: []}, verify_change=False
+        )
+
+    plugin.create_checkpoint.assert_called_once()
+    plugin.rollback_checkpoint.assert_called_once()
+
+
+def _gen_dummy_state(state=InterfaceState.UP, mtu=1500):
+    return {
+        Interface.KEY: [
+            {
+                Interface.NAME: "dummy0",
+                Interface.TYPE: InterfaceType.DUMMY,
+                Interface.STATE: state,
+                Interface.MTU: mtu,
+                Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+                Interface.IPV6: {InterfaceIPv6.ENABLED: False},
+            }
+        ]
+    }
+
+
+@pytest.mark.parametrize(
+    "ovs_running,error_message",
+    [
+        (False, "openvswitch service is not started"),
+        (True, "Open vSwitch NetworkManager support not installed"),
+    ],
+)
+def test_apply_ovs_without_ovs_capability(
+    show_with_plugins_mock, ovs_running, error_message
+):
+    plugin = mock.MagicMock()
+    plugin.capabilities = []
+    plugin.ovs_running = ovs_running
+    desired_state = {
+        Interface.KEY: [
+            {
+                Interface.NAME: "br0",
+                Interface.TYPE: InterfaceType.OVS_BRIDGE,
+                Interface.STATE: InterfaceState.UP,
+            }
+        ]
+    }
+
+    with pytest.raises(NmstateDependencyError, match=error_message):
+        netapplier.apply_with_plugins([plugin], desired_state)
+
+    plugin.apply_changes.assert_not_called()
+
+
+def test_apply_unchanged_state_skips_checkpoint(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+    plugin.is_applied.return_value = True
+
+    checkpoints = netapplier.apply_with_plugins([plugin], _gen_dummy_state())
+
+    assert checkpoints is None
+    plugin.create_checkpoint.assert_not_called()
+    plugin.apply_changes.assert_not_called()
+    show_with_plugins_mock.assert_called_once()
+
+
+def test_apply_unchanged_state_without_commit_returns_checkpoint(
+    show_with_plugins_mock,
+):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+    plugin.name = "foo"
+    plugin.is_applied.return_value = True
+    plugin.create_checkpoint.return_value = "/checkpoint/1"
+
+    checkpoints = netapplier.apply_with_plugins(
+        [plugin], _gen_dummy_state(), commit=False
+    )
+
+    assert checkpoints == "foo|/checkpoint/1"
+    plugin.apply_changes.assert_not_called()
+    plugin.destroy_checkpoint.assert_not_called()
+
+
+def test_apply_unchanged_state_not_applied_by_plugin(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+    plugin.is_applied.return_value = False
+
+    netapplier.apply_with_plugins(
+        [plugin], _gen_dummy_state(), verify_change=False, save_to_disk=True
+    )
+
+    plugin.is_applied.assert_called_once_with(mock.ANY, True)
+    plugin.create_checkpoint.assert_called_once()
+    plugin.apply_changes.assert_called_once()
+
+
+def test_apply_changed_state_creates_checkpoint(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+
+    netapplier.apply_with_plugins(
+        [plugin], _gen_dummy_state(InterfaceState.DOWN), verify_change=False
+    )
+
+    plugin.create_checkpoint.assert_called_once()
+    plugin.apply_changes.assert_called_once()
+
+
+@pytest.fixture
+def sleep_mock():
+    with mock.patch.object(netapplier.time, "sleep") as m:
+        yield m
+
+
+def _gen_watch_plugin():
+    plugin = mock.MagicMock()
+    plugin.plugin_capabilities = [NmstatePlugin.PLUGIN_CAPABILITY_WATCH]
+    plugin.is_watching = False
+    return plugin
+
+
+def test_verify_change_once_changes_noticed(
+    show_with_plugins_mock, sleep_mock
+):
+    show_with_plugins_mock.side_effect = [
+        _gen_dummy_state(),
+        _gen_dummy_state(),
+        _gen_dummy_state(mtu=1400),
+    ]
+    plugin = _gen_watch_plugin()
+    plugin.wait_for_changes.side_effect = [{"eth1"}, {"dummy0"}]
+
+    netapplier.apply_with_plugins([plugin], _gen_dummy_state(mtu=1400))
+
+    plugin.start_watch.assert_called_once()
+    plugin.stop_watch.assert_called_once()
+    assert plugin.wait_for_changes.call_count == 2
+    show_with_plugins_mock.assert_called_with([plugin], interfaces={"dummy0"})
+    sleep_mock.assert_not_called()
+
+
+def test_verify_change_timeout_without_changes(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = _gen_watch_plugin()
+    plugin.wait_for_changes.return_value = None
+
+    with mock.patch.object(
+        netapplier.time, "monotonic", side_effect=[0, 1, 10]
+    ):
+        with pytest.raises(NmstateVerificationError):
+            netapplier.apply_with_plugins([plugin], _gen_dummy_state(mtu=1400))
+
+    plugin.wait_for_changes.assert_called_once_with(
+        netapplier.VERIFY_RETRY_TIMEOUT - 1
+    )
+    plugin.rollback_checkpoint.assert_called_once()
+    plugin.stop_watch.assert_called_once()
+
+
+def test_verify_change_without_watch_plugin(
+    show_with_plugins_mock, sleep_mock
+):
+    show_with_plugins_mock.side_effect = [
+        _gen_dummy_state(),
+        _gen_dummy_state(),
+        _gen_dummy_state(mtu=1400),
+    ]
+    plugin = mock.MagicMock()
+    plugin.plugin_capabilities = []
+
+    netapplier.apply_with_plugins([plugin], _gen_dummy_state(mtu=1400))
+
+    sleep_mock.assert_called_once_with(netapplier.VERIFY_RETRY_INTERNAL)
+    plugin.start_watch.assert_not_called()
+
+
+def test_apply_with_scoped_checkpoint(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+
+    netapplier.apply_with_plugins(
+        [plugin], _gen_dummy_state(mtu=1400), verify_change=False
+    )
+
+    plugin.create_checkpoint.assert_called_once_with(
+        60, iface_names={"dummy0"}
+    )
+
+
+def test_apply_new_iface_with_checkpoint_of_all_devices(
+    show_with_plugins_mock,
+):
+    show_with_plugins_mock.return_value = {}
+    plugin = mock.MagicMock()
+
+    netapplier.apply_with_plugins(
+        [plugin], _gen_dummy_state(), verify_change=False
+    )
+
+    plugin.create_checkpoint.assert_called_once_with(60)
+
+
+def test_apply_without_scoped_checkpoint(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+
+    netapplier.apply_with_plugins(
+        [plugin],
+        _gen_dummy_state(mtu=1400),
+        verify_change=False,
+        scoped_checkpoint=False,
+    )
+
+    plugin.create_checkpoint.assert_called_once_with(60)
+
+
+def _gen_dummy_states(count):
+    states = []
+    for i in range(count):
+        state = _gen_dummy_state()
+        state[Interface.KEY][0][Interface.NAME] = f"dummy{i}"
+        states.append(state)
+    return states
+
+
+def test_apply_many_merges_independent_states(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = {}
+    plugin = mock.MagicMock()
+    desired_states = _gen_dummy_states(10)
+
+    netapplier.apply_many_with_plugins(
+        [plugin], desired_states, verify_change=False
+    )
+
+    show_with_plugins_mock.assert_called_once()
+    plugin.create_checkpoint.assert_called_once_with(60)
+    plugin.apply_changes.assert_called_once()
+    plugin.destroy_checkpoint.assert_called_once()
+
+
+def test_apply_many_with_common_iface(show_with_plugins_mock):
+    show_with_plugins_mock.side_effect = [{}, _gen_dummy_state()]
+    plugin = mock.MagicMock()
+    desired_states = [_gen_dummy_state(), _gen_dummy_state(mtu=1400)]
+
+    netapplier.apply_many_with_plugins(
+        [plugin], desired_states, verify_change=False
+    )
+
+    assert show_with_plugins_mock.call_count == 2
+    plugin.create_checkpoint.assert_called_once_with(60)
+    assert plugin.apply_changes.call_count == 2
+    plugin.destroy_checkpoint.assert_called_once()
+
+
+def test_apply_many_rollback_all_on_failure(show_with_plugins_mock):
+    show_with_plugins_mock.side_effect = [{}, _gen_dummy_state()]
+    plugin = mock.MagicMock()
+    plugin.apply_changes.side_effect = [None, NmstateLibnmError("foo")]
+    desired_states = [_gen_dummy_state(), _gen_dummy_state(mtu=1400)]
+
+    with pytest.raises(NmstateLibnmError):
+        netapplier.apply_many_with_plugins(
+            [plugin], desired_states, verify_change=False
+        )
+
+    plugin.create_checkpoint.assert_called_once()
+    plugin.rollback_checkpoint.assert_called_once()
+
+
+def test_merge_desired_states():
+    routes = {Route.KEY: {Route.CONFIG: []}}
+    dns = {DNS.KEY: {DNS.CONFIG: {}}}
+    desired_states = _gen_dummy_states(2) + [routes, dns, dict(routes)]
+
+    merged_states = netapplier._merge_desired_states(desired_states)
+
+    assert merged_states == [
+        {
+            Interface.KEY: _gen_dummy_states(2)[0][Interface.KEY]
+            + _gen_dummy_states(2)[1][Interface.KEY],
+            **routes,
+            **dns,
+        },
+        routes,
+    ]
+
+
+def test_plan_with_recorded_current_state(show_with_plugins_mock):
+    plugin = mock.MagicMock()
+    plugin.name = "NetworkManager"
+    plugin.plan_changes.return_value = [
+        ("update-profile", "dummy0"),
+        ("deactivate", "dummy0"),
+    ]
+
+    plan = netapplier.plan_with_plugins(
+        [plugin],
+        _gen_dummy_state(InterfaceState.DOWN),
+        current_state=_gen_dummy_state(),
+    )
+
+    assert plan == {
+        "operations": [
+            {
+                "plugin": "NetworkManager",
+                "operation": "update-profile",
+                "interface": "dummy0",
+            },
+            {
+                "plugin": "NetworkManager",
+                "operation": "deactivate",
+                "interface": "dummy0",
+            },
+        ],
+        "interfaces": ["dummy0"],
+    }
+    show_with_plugins_mock.assert_not_called()
+    plugin.create_checkpoint.assert_not_called()
+    plugin.apply_changes.assert_not_called()
+
+
+def test_plan_unchanged_state(show_with_plugins_mock):
+    show_with_plugins_mock.return_value = _gen_dummy_state()
+    plugin = mock.MagicMock()
+
+    plan = netapplier.plan_with_plugins([plugin], _gen_dummy_state())
+
+    assert plan == {"operations": [], "interfaces": []}
+    plugin.plan_changes.assert_not_called()
+
+
 def test_error_apply():
     with pytest.raises(TypeError):
         # pylint: disable=too-many-function-args
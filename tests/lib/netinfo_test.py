@@ -20,6 +20,7 @@ import pytest
 
 from unittest import mock
 
+import libnmstate
 from libnmstate import netinfo
 from libnmstate.schema import DNS
 from libnmstate.schema import Interface
@@ -91,3 +92,51 @@ def test_error_show(show_with_plugins_mock, plugin_context_mock):
         # pylint: disable=too-many-function-args
         netinfo.show(None)
         # pylint: enable=too-many-function-args
+
+
+def _gen_route(destination, table_id):
+    return {
+        Route.DESTINATION: destination,
+        Route.METRIC: 103,
+        Route.NEXT_HOP_ADDRESS: "192.0.2.1",
+        Route.NEXT_HOP_INTERFACE: "eth1",
+        Route.TABLE_ID: table_id,
+    }
+
+
+def test_get_covering_routes():
+    route0 = _gen_route("198.51.0.0/16", Route.USE_DEFAULT_ROUTE_TABLE)
+    route1 = _gen_route("198.51.100.0/24", 50)
+    route2 = _gen_route("198.51.101.0/24", 50)
+    absent_route = _gen_route("198.51.100.0/25", 50)
+    absent_route[Route.STATE] = Route.STATE_ABSENT
+    state = {Route.KEY: {Route.CONFIG: [route0, route1, route2, absent_route]}}
+
+    assert libnmstate.get_covering_routes(state, "198.51.100.0/25") == [
+        route0,
+        route1,
+    ]
+    assert libnmstate.get_covering_routes(
+        state, "198.51.100.0/25", table_id=50
+    ) == [route1]
+    assert libnmstate.get_covering_routes(
+        state, "198.51.100.0/25", table_id=254
+    ) == [route0]
+    assert libnmstate.get_covering_routes(state, "2001:db8::/64") == []
+
+
+def test_get_covered_routes():
+    route0 = _gen_route("198.51.0.0/16", 254)
+    route1 = _gen_route("198.51.100.0/24", 50)
+    route2 = _gen_route("198.51.101.0/24", Route.USE_DEFAULT_ROUTE_TABLE)
+    state = {Route.KEY: {Route.CONFIG: [route0, route1, route2]}}
+
+    assert libnmstate.get_covered_routes(state, "198.51.0.0/16") == [
+        route2,
+        route1,
+        route0,
+    ]
+    assert libnmstate.get_covered_routes(
+        state, "198.51.0.0/16", table_id=Route.USE_DEFAULT_ROUTE_TABLE
+    ) == [route2, route0]
+    assert libnmstate.get_covered_routes({}, "198.51.0.0/16") == []
@@ -0,0 +1,340 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import struct
+
+import pytest
+
+from unittest import mock
+
+from libnmstate import netlink
+from libnmstate.nm import sriov as nm_sriov
+from libnmstate.schema import Ethernet
+
+# RTM_NEWLINK reply of PF eth1 with 2 VFs:
+#   vf 0 MAC d2:a1:b3:c4:d5:e6, spoof checking on, trust off
+#   vf 1 MAC 00:00:00:00:00:00, spoof checking off, trust unsupported,
+#        min_tx_rate 100Mbps, max_tx_rate 1000Mbps
+PF_WITH_2_VFS = bytes.fromhex(
+    "5401000010000000010000000000000000000100030000000310000000000000"
+    "0900030065746831000000000a00010000112233445500000800150002000000"
+    "14011680880001802800010000000000d2a1b3c4d5e600000000000000000000"
+    "0000000000000000000000000000000010000200000000000000000000000000"
+    "0c00030000000000000000000c00040000000000010000000c00050000000000"
+    "00000000100006000000000000000000000000000c0007000000000000000000"
+    "0c00090000000000000000008800018028000100010000000000000000000000"
+    "0000000000000000000000000000000000000000000000001000020001000000"
+    "00000000000000000c00030001000000e80300000c0004000100000000000000"
+    "0c0005000100000000000000100006000100000064000000e80300000c000700"
+    "01000000000000000c00090001000000ffffffff"
+)
+
+# IFLA_LINKINFO of bridge br0 with default options
+BRIDGE_LINKINFO = bytes.fromhex(
+    "0b00010062726964676500008c0102000c00100000000000000000000c001100"
+    "00000000000000000c00120000000000000000000c0013000000000000000000"
+    "08000100dc05000008000200c800000008000300d00700000800040030750000"
+    "0800050000000000060006000080000005000700000000000600090000000000"
+    "0c000b00800012d8fcb46bbc0c000a00800012d8fcb46bbc06000c0000000000"
+    "08000d000000000005000e000000000005000f00000000000a0014000180c200"
+    "000000000c002e00000000001f00000008003000000000000800310000000000"
+    "0500160001000000050017000100000005001800000000000500190000000000"
+    "05002a000000000008001a001000000008001b000010000008001c0002000000"
+    "08001d000200000005002b000200000005002c00010000000c001e0064000000"
+    "000000000c001f0090650000000000000c0020009c630000000000000c002100"
+    "d4300000000000000c002200e8030000000000000c002300340c000000000000"
+    "050024000000000005002500000000000500260000000000"
+)
+
+# RTM_NEWLINK reply of AF_BRIDGE dump for port eth1 of bridge br0(index 1006):
+#   path_cost 100, priority 16, hairpin on
+BRIDGE_PORT = bytes.fromhex(
+    "a80100001000020001000000d21c000007000100f00300000210000000000000"
+    "09000300657468310000000008000a00ee03000008000400dc05000005001000"
+    "020000000a00010012d8fcb46bbc000008000500ef03000050010c8005000100"
+    "0000000006000200100000000800030064000000050004000100000005000500"
+    "000000000500060000000000050007000000000005001c000000000005000800"
+    "01000000050009000100000005001b000100000005001e000100000005000a00"
+    "0000000005000c00000000000c000d00800012d8fcb46bbc0c000e00800012d8"
+    "fcb46bbc06000f00014000000600100000000000060011000140000006001200"
+    "010000000500130000000000050014000000000005001d000000000006001f00"
+    "0000000005002000000000000500230000000000050024000000000005002100"
+    "000000000500270000000000050028000000000005002b00000000000c001500"
+    "00000000000000000c00160000000000000000000c0017000000000000000000"
+    "0500190001000000080025000002000008002600000000000800290000000000"
+    "08002a0000000000"
+)
+
+ACK = bytes.fromhex(
+    "2400000002000000010000000000000000000000100000001200010001000000"
+    "00000000"
+)
+
+DONE = bytes.fromhex("1400000003000200010000000000000000000000")
+
+NO_SUCH_DEVICE = bytes.fromhex(
+    "24000000020000000100000000000000edffffff100000001200010001000000"
+    "00000000"
+)
+
+
+def _with_seq(message, seq):
+    return message[:8] + struct.pack("=I", seq) + message[12:]
+
+
+def _link_attrs(message):
+    (msg,) = netlink.parse_messages(message)
+    msg_type, _, _, body = msg
+    assert msg_type == netlink.RTM_NEWLINK
+    ifinfomsg_size = netlink.IFINFOMSG_SIZE
+    return netlink.parse_attrs(body[ifinfomsg_size:])
+
+
+def test_parse_link_attrs():
+    attrs = _link_attrs(PF_WITH_2_VFS)
+
+    assert attrs[netlink.IFLA_IFNAME] == b"eth1\0"
+    assert attrs[netlink.IFLA_NUM_VF] == struct.pack("=I", 2)
+
+
+def test_parse_vfs_info():
+    vfs = netlink.parse_vfs_info(_link_attrs(PF_WITH_2_VFS))
+
+    assert vfs == [
+        {
+            netlink.VfInfo.VF: 0,
+            netlink.VfInfo.MAC: "D2:A1:B3:C4:D5:E6",
+            netlink.VfInfo.SPOOF_CHECK: True,
+            netlink.VfInfo.TRUST: False,
+            netlink.VfInfo.MIN_TX_RATE: 0,
+            netlink.VfInfo.MAX_TX_RATE: 0,
+        },
+        {
+            netlink.VfInfo.VF: 1,
+            netlink.VfInfo.MAC: "00:00:00:00:00:00",
+            netlink.VfInfo.SPOOF_CHECK: False,
+            netlink.VfInfo.MIN_TX_RATE: 100,
+            netlink.VfInfo.MAX_TX_RATE: 1000,
+        },
+    ]
+
+
+def test_parse_vfs_info_without_vfinfo_list():
+    attrs = {netlink.IFLA_IFNAME: b"eth1\0"}
+
+    assert netlink.parse_vfs_info(attrs) is None
+
+
+def test_parse_attrs_with_wanted_types():
+    attrs = _link_attrs(PF_WITH_2_VFS)
+    wanted = {netlink.IFLA_IFNAME, netlink.IFLA_ADDRESS}
+
+    assert netlink.parse_attrs(
+        netlink.pack_attr(netlink.IFLA_IFNAME, attrs[netlink.IFLA_IFNAME])
+        + netlink.pack_attr(netlink.IFLA_ADDRESS, attrs[netlink.IFLA_ADDRESS])
+        + netlink.pack_attr(netlink.IFLA_NUM_VF, attrs[netlink.IFLA_NUM_VF]),
+        wanted,
+    ) == {
+        netlink.IFLA_IFNAME: attrs[netlink.IFLA_IFNAME],
+        netlink.IFLA_ADDRESS: attrs[netlink.IFLA_ADDRESS],
+    }
+
+
+def test_parse_bridge_options():
+    options = netlink.parse_bridge_options(
+        {netlink.IFLA_LINKINFO: BRIDGE_LINKINFO}
+    )
+
+    assert options == {
+        "forward_delay": 1500,
+        "hello_time": 200,
+        "max_age": 2000,
+        "ageing_time": 30000,
+        "stp_state": 0,
+        "priority": 32768,
+        "vlan_filtering": 0,
+        "group_fwd_mask": 0,
+        "hello_timer": 0,
+        "gc_timer": 0,
+        "group_addr": "01:80:c2:00:00:00",
+        "multicast_router": 1,
+        "multicast_snooping": 1,
+        "multicast_query_use_ifaddr": 0,
+        "multicast_querier": 0,
+        "hash_elasticity": 16,
+        "hash_max": 4096,
+        "multicast_last_member_count": 2,
+        "multicast_startup_query_count": 2,
+        "multicast_last_member_interval": 100,
+        "multicast_membership_interval": 26000,
+        "multicast_querier_interval": 25500,
+        "multicast_query_interval": 12500,
+        "multicast_query_response_interval": 1000,
+        "multicast_startup_query_interval": 3124,
+    }
+
+
+def test_parse_bridge_options_of_non_bridge():
+    assert netlink.parse_bridge_options(_link_attrs(PF_WITH_2_VFS)) is None
+
+
+def test_parse_bridge_port():
+    attrs = _link_attrs(BRIDGE_PORT)
+
+    assert netlink.get_ifname(attrs) == "eth1"
+    assert netlink.get_master(attrs) == 1006
+    assert netlink.parse_bridge_port_options(attrs) == {
+        "path_cost": 100,
+        "priority": 16,
+        "hairpin_mode": 1,
+    }
+
+
+def test_parse_bridge_port_options_of_non_port():
+    attrs = _link_attrs(PF_WITH_2_VFS)
+
+    assert netlink.parse_bridge_port_options(attrs) is None
+
+
+def test_parse_truncated_message():
+    assert list(netlink.parse_messages(PF_WITH_2_VFS[:100])) == []
+
+
+class TestNetlinkRoute:
+    @pytest.fixture
+    def socket_mock(self):
+        with mock.patch.object(netlink.socket, "socket") as socket_mock:
+            sock = socket_mock.return_value
+            sock.recvmsg.return_value = (b"", [], 0, None)
+            yield sock
+
+    def test_get_link(self, socket_mock):
+        socket_mock.recv.return_value = PF_WITH_2_VFS
+
+        with netlink.NetlinkRoute() as nl:
+            attrs = nl.get_link("eth1", ext_mask=netlink.RTEXT_FILTER_VF)
+
+        assert attrs == _link_attrs(PF_WITH_2_VFS)
+        socket_mock.close.assert_called_once()
+
+    def test_socket_is_reused_by_requests(self, socket_mock):
+        socket_mock.recv.side_effect = [
+            PF_WITH_2_VFS,
+            _with_seq(PF_WITH_2_VFS, 2),
+        ]
+
+        nl = netlink.NetlinkRoute()
+        nl.get_link("eth1")
+        nl.get_link("eth1")
+
+        assert netlink.socket.socket.call_count == 1
+
+    def test_dump_bridge_ports(self, socket_mock):
+        socket_mock.recv.side_effect = [BRIDGE_PORT, DONE]
+
+        ports = netlink.NetlinkRoute().dump_bridge_ports()
+
+        assert ports == [_link_attrs(BRIDGE_PORT)]
+
+    def test_get_link_with_error(self, socket_mock):
+        socket_mock.recv.return_value = NO_SUCH_DEVICE
+
+        with pytest.raises(OSError):
+            netlink.NetlinkRoute().get_link("eth1")
+
+    def test_get_link_with_ack_only(self, socket_mock):
+        socket_mock.recv.return_value = ACK
+
+        assert netlink.NetlinkRoute().get_link("eth1") == {}
+
+    def test_socket_has_receive_timeout(self, socket_mock):
+        socket_mock.recv.return_value = PF_WITH_2_VFS
+
+        netlink.NetlinkRoute().get_link("eth1")
+
+        socket_mock.settimeout.assert_called_once_with(netlink._RECV_TIMEOUT)
+
+    def test_get_link_timeout_closes_socket(self, socket_mock):
+        socket_mock.recvmsg.side_effect = netlink.socket.timeout
+
+        nl = netlink.NetlinkRoute()
+        with pytest.raises(OSError):
+            nl.get_link("eth1")
+
+        socket_mock.close.assert_called_once()
+
+    def test_get_link_with_unexpected_replies_only(self, socket_mock):
+        socket_mock.recv.return_value = _with_seq(PF_WITH_2_VFS, 0)
+
+        nl = netlink.NetlinkRoute()
+        with pytest.raises(OSError):
+            nl.get_link("eth1")
+
+        assert (
+            socket_mock.recv.call_count == netlink._MAX_UNEXPECTED_REPLIES + 1
+        )
+        socket_mock.close.assert_called_once()
+
+    def test_recv_grows_buffer_for_truncated_message(self, socket_mock):
+        socket_mock.recvmsg.side_effect = [
+            (b"", [], netlink.socket.MSG_TRUNC, None),
+            (b"", [], 0, None),
+        ]
+        socket_mock.recv.return_value = PF_WITH_2_VFS
+
+        netlink.NetlinkRoute().get_link("eth1")
+
+        socket_mock.recv.assert_called_once_with(netlink._RECV_BUFFER_SIZE * 2)
+
+
+class TestSriovVfsInfo:
+    def test_get_vfs_info_from_netlink(self):
+        context = mock.MagicMock()
+        context.index.netlink.get_link.return_value = _link_attrs(
+            PF_WITH_2_VFS
+        )
+
+        vfs = nm_sriov._get_sriov_vfs_info(context, "eth1")
+
+        assert vfs == [
+            {
+                Ethernet.SRIOV.VFS.ID: 0,
+                Ethernet.SRIOV.VFS.MAC_ADDRESS: "D2:A1:B3:C4:D5:E6",
+                Ethernet.SRIOV.VFS.SPOOF_CHECK: True,
+                Ethernet.SRIOV.VFS.TRUST: False,
+                Ethernet.SRIOV.VFS.MIN_TX_RATE: 0,
+                Ethernet.SRIOV.VFS.MAX_TX_RATE: 0,
+            },
+            {
+                Ethernet.SRIOV.VFS.ID: 1,
+                Ethernet.SRIOV.VFS.MAC_ADDRESS: "00:00:00:00:00:00",
+                Ethernet.SRIOV.VFS.SPOOF_CHECK: False,
+                Ethernet.SRIOV.VFS.MIN_TX_RATE: 100,
+                Ethernet.SRIOV.VFS.MAX_TX_RATE: 1000,
+            },
+        ]
+
+    @mock.patch.object(nm_sriov, "_get_sriov_vfs_info_from_iplink")
+    def test_fallback_to_ip_link_on_netlink_failure(self, iplink_mock):
+        context = mock.MagicMock()
+        context.index.netlink.get_link.side_effect = OSError(1, "EPERM")
+
+        vfs = nm_sriov._get_sriov_vfs_info(context, "eth1")
+
+        assert vfs == iplink_mock.return_value
+        iplink_mock.assert_called_once_with("eth1")
@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import pytest
+
+from unittest import mock
+
+from libnmstate import netwatch
+from libnmstate.error import NmstateNotSupportedError
+from libnmstate.plugin import NmstatePlugin
+from libnmstate.schema import DNS
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+
+
+def _gen_iface_info(iface_name, mtu=1500):
+    return {
+        Interface.NAME: iface_name,
+        Interface.TYPE: InterfaceType.DUMMY,
+        Interface.STATE: InterfaceState.UP,
+        Interface.MTU: mtu,
+    }
+
+
+def _gen_route(iface_name, destination="198.51.100.0/24"):
+    return {
+        Route.DESTINATION: destination,
+        Route.NEXT_HOP_INTERFACE: iface_name,
+    }
+
+
+def _gen_report(ifaces, routes=(), dns_servers=()):
+    return {
+        Interface.KEY: list(ifaces),
+        Route.KEY: {Route.RUNNING: list(routes), Route.CONFIG: []},
+        DNS.KEY: {DNS.RUNNING: {DNS.SERVER: list(dns_servers)}},
+    }
+
+
+@pytest.fixture
+def plugin():
+    plugin = mock.MagicMock()
+    plugin.plugin_capabilities = [
+        NmstatePlugin.PLUGIN_CAPABILITY_IFACE,
+        NmstatePlugin.PLUGIN_CAPABILITY_WATCH,
+    ]
+    plugin.priority = NmstatePlugin.DEFAULT_PRIORITY
+    return plugin
+
+
+@pytest.fixture
+def show_mock():
+    with mock.patch.object(netwatch, "show_with_plugins") as show_mock:
+        show_mock.return_value = _gen_report(
+            [_gen_iface_info("eth1"), _gen_iface_info("eth2")],
+            routes=[_gen_route("eth1"), _gen_route("eth2")],
+        )
+        yield show_mock
+
+
+def test_first_report_is_full_report(plugin, show_mock):
+    watcher = netwatch.watch_with_plugins([plugin])
+
+    report = next(watcher)
+    watcher.close()
+
+    assert report == show_mock.return_value
+    plugin.start_watch.assert_called_once()
+    plugin.stop_watch.assert_called_once()
+
+
+def test_only_changed_iface_is_reported(plugin, show_mock):
+    plugin.wait_for_changes.side_effect = [None, {"eth2"}]
+    watcher = netwatch.watch_with_plugins([plugin])
+    next(watcher)
+    show_mock.return_value = _gen_report(
+        [_gen_iface_info("eth2", mtu=9000)], routes=[_gen_route("eth2")]
+    )
+
+    changes = next(watcher)
+
+    assert changes == {Interface.KEY: [_gen_iface_info("eth2", mtu=9000)]}
+    show_mock.assert_called_with([plugin], False, ["eth2"])
+
+
+def test_removed_iface_is_reported_as_absent(plugin, show_mock):
+    plugin.wait_for_changes.return_value = {"eth2"}
+    watcher = netwatch.watch_with_plugins([plugin])
+    next(watcher)
+    show_mock.return_value = _gen_report([])
+
+    changes = next(watcher)
+
+    assert changes == {
+        Interface.KEY: [
+            {Interface.NAME: "eth2", Interface.STATE: InterfaceState.ABSENT}
+        ],
+        Route.KEY: {Route.RUNNING: [_gen_route("eth1")], Route.CONFIG: []},
+    }
+
+
+def test_unchanged_state_is_not_reported(plugin, show_mock):
+    plugin.wait_for_changes.side_effect = [{"eth1"}, {"eth3"}]
+    watcher = netwatch.watch_with_plugins([plugin])
+    next(watcher)
+    new_reports = [
+        _gen_report([_gen_iface_info("eth1")], routes=[_gen_route("eth1")]),
+        _gen_report([_gen_iface_info("eth3")]),
+    ]
+    show_mock.side_effect = new_reports
+
+    changes = next(watcher)
+
+    assert changes == {Interface.KEY: [_gen_iface_info("eth3")]}
+
+
+def test_global_change_is_reported(plugin, show_mock):
+    plugin.wait_for_changes.return_value = set()
+    watcher = netwatch.watch_with_plugins([plugin])
+    next(watcher)
+    show_mock.return_value = _gen_report([], dns_servers=["192.0.2.1"])
+
+    changes = next(watcher)
+
+    assert changes == {
+        DNS.KEY: {DNS.RUNNING: {DNS.SERVER: ["192.0.2.1"]}},
+    }
+
+
+def test_full_snapshot(plugin, show_mock):
+    plugin.wait_for_changes.return_value = {"eth3"}
+    watcher = netwatch.watch_with_plugins([plugin], full_snapshot=True)
+    next(watcher)
+    show_mock.return_value = _gen_report([_gen_iface_info("eth3")])
+
+    report = next(watcher)
+
+    assert report[Interface.KEY] == [
+        _gen_iface_info("eth1"),
+        _gen_iface_info("eth2"),
+        _gen_iface_info("eth3"),
+    ]
+    assert report[Route.KEY][Route.RUNNING] == [
+        _gen_route("eth1"),
+        _gen_route("eth2"),
+    ]
+
+
+def test_changed_iface_not_matching_filter_is_ignored(plugin, show_mock):
+    plugin.wait_for_changes.side_effect = [{"eth1", "eth2"}]
+    watcher = netwatch.watch_with_plugins([plugin], interfaces=["eth1"])
+    next(watcher)
+    show_mock.return_value = _gen_report([_gen_iface_info("eth1", mtu=9000)])
+
+    next(watcher)
+
+    show_mock.assert_called_with([plugin], False, ["eth1"])
+
+
+def test_no_plugin_capable_of_watch(plugin):
+    plugin.plugin_capabilities = [NmstatePlugin.PLUGIN_CAPABILITY_IFACE]
+
+    with pytest.raises(NmstateNotSupportedError):
+        next(netwatch.watch_with_plugins([plugin]))
@@ -0,0 +1,354 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import functools
+import heapq
+import logging
+import random
+from unittest import mock
+
+import pytest
+
+from libnmstate.nm import applier
+from libnmstate.nm import context as nm_context
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+from libnmstate.schema import VLAN
+
+BOND0 = "bond0"
+ETH1 = "eth1"
+ETH2 = "eth2"
+VLAN10 = "eth1.10"
+
+
+@pytest.fixture(autouse=True)
+def is_activated_mock():
+    with mock.patch.object(
+        applier.connection, "is_activated", return_value=True
+    ) as m:
+        yield m
+
+
+def _gen_iface_to_edit(ifname, master=None):
+    iface_state = {
+        Interface.NAME: ifname,
+        Interface.TYPE: InterfaceType.ETHERNET,
+        Interface.STATE: InterfaceState.UP,
+    }
+    if master:
+        iface_state[applier.MASTER_METADATA] = master
+    nmdev = mock.MagicMock()
+    profile = mock.MagicMock()
+    nmdev.get_active_connection.return_value.get_uuid.return_value = (
+        profile.get_uuid.return_value
+    )
+    return iface_state, nmdev, profile
+
+
+def test_skip_reapply_unchanged_activated_ifaces():
+    ifaces_to_edit = {
+        BOND0: _gen_iface_to_edit(BOND0),
+        ETH1: _gen_iface_to_edit(ETH1, master=BOND0),
+        ETH2: _gen_iface_to_edit(ETH2),
+    }
+
+    skipped = applier._get_ifaces_to_skip_reapply(
+        {BOND0, ETH1}, {}, ifaces_to_edit, []
+    )
+
+    assert skipped == {BOND0, ETH1}
+
+
+def test_reapply_unchanged_iface_when_master_reapplied():
+    ifaces_to_edit = {
+        BOND0: _gen_iface_to_edit(BOND0),
+        ETH1: _gen_iface_to_edit(ETH1, master=BOND0),
+    }
+
+    skipped = applier._get_ifaces_to_skip_reapply(
+        {ETH1}, {}, ifaces_to_edit, []
+    )
+
+    assert skipped == set()
+
+
+def test_reapply_unchanged_iface_not_activated(is_activated_mock):
+    is_activated_mock.return_value = False
+    ifaces_to_edit = {ETH1: _gen_iface_to_edit(ETH1)}
+
+    skipped = applier._get_ifaces_to_skip_reapply(
+        {ETH1}, {}, ifaces_to_edit, []
+    )
+
+    assert skipped == set()
+
+
+def test_reapply_unchanged_iface_activated_with_other_profile():
+    ifaces_to_edit = {ETH1: _gen_iface_to_edit(ETH1)}
+    _, nmdev, _ = ifaces_to_edit[ETH1]
+    nmdev.get_active_connection.return_value.get_uuid.return_value = "other"
+
+    skipped = applier._get_ifaces_to_skip_reapply(
+        {ETH1}, {}, ifaces_to_edit, []
+    )
+
+    assert skipped == set()
+
+
+def test_plan_changes_does_not_invoke_actions():
+    profile_actions = []
+    for operation, ifname in (
+        (applier._ADD_PROFILE, BOND0),
+        (applier._UPDATE_PROFILE, ETH1),
+        (applier._ADD_PROFILE, VLAN10),
+    ):
+        profile_actions.append((operation, ifname, mock.MagicMock()))
+    bond_state = {
+        Interface.NAME: BOND0,
+        Interface.TYPE: InterfaceType.BOND,
+        Interface.STATE: InterfaceState.UP,
+    }
+    eth_state, nmdev, profile = _gen_iface_to_edit(ETH1)
+    vlan_state = _gen_vlan_state(VLAN10)
+    context = mock.MagicMock()
+    context.get_nm_dev.side_effect = lambda ifname: (
+        nmdev if ifname == ETH1 else None
+    )
+
+    with mock.patch.object(
+        applier, "_get_ifaces_desired_state"
+    ), mock.patch.object(
+        applier,
+        "_get_profile_actions",
+        return_value=(
+            profile_actions,
+            [
+                _gen_con_profile(BOND0),
+                _gen_con_profile(ETH1, profile),
+                _gen_con_profile(VLAN10),
+            ],
+            set(),
+        ),
+    ):
+        applier._get_ifaces_desired_state.return_value = [
+            bond_state,
+            eth_state,
+            vlan_state,
+        ]
+        operations = applier.plan_changes(context, mock.MagicMock(), True)
+
+    assert operations == [
+        (applier._ADD_PROFILE, BOND0),
+        (applier._UPDATE_PROFILE, ETH1),
+        (applier._ADD_PROFILE, VLAN10),
+        (applier._ACTIVATE, BOND0),
+        (applier._REAPPLY, ETH1),
+        (applier._ACTIVATE, VLAN10),
+    ]
+    for _, _, issue in profile_actions:
+        issue.assert_not_called()
+    nmdev.set_managed.assert_not_called()
+
+
+class TestIsApplied:
+    @pytest.fixture
+    def net_state(self):
+        net_state = mock.MagicMock()
+        net_state.ifaces.state_to_edit = [
+            {
+                Interface.NAME: ETH1,
+                Interface.TYPE: InterfaceType.ETHERNET,
+                Interface.STATE: InterfaceState.UP,
+            }
+        ]
+        net_state.desire_state = {
+            Interface.KEY: net_state.ifaces.state_to_edit
+        }
+        return net_state
+
+    @pytest.fixture
+    def is_externally_managed_mock(self):
+        with mock.patch.object(
+            applier, "is_externally_managed", return_value=False
+        ) as m:
+            yield m
+
+    @pytest.fixture
+    def is_memory_only_mock(self):
+        with mock.patch.object(
+            applier.connection.ConnectionProfile,
+            "is_memory_only",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ) as m:
+            yield m
+
+    def test_saved_profile(
+        self, net_state, is_externally_managed_mock, is_memory_only_mock
+    ):
+        assert applier.is_applied(mock.MagicMock(), net_state, True)
+
+    def test_memory_only_profile_to_save(
+        self, net_state, is_externally_managed_mock, is_memory_only_mock
+    ):
+        is_memory_only_mock.return_value = True
+
+        assert not applier.is_applied(mock.MagicMock(), net_state, True)
+        assert applier.is_applied(mock.MagicMock(), net_state, False)
+
+    def test_externally_managed_iface(
+        self, net_state, is_externally_managed_mock, is_memory_only_mock
+    ):
+        is_externally_managed_mock.return_value = True
+
+        assert not applier.is_applied(mock.MagicMock(), net_state, True)
+
+    def test_iface_without_profile(
+        self, net_state, is_externally_managed_mock, is_memory_only_mock
+    ):
+        context = mock.MagicMock()
+        context.index.profile.return_value = None
+
+        assert not applier.is_applied(context, net_state, True)
+
+    def test_route_next_hop_iface_is_checked(
+        self, net_state, is_externally_managed_mock, is_memory_only_mock
+    ):
+        net_state.ifaces.state_to_edit = []
+        net_state.desire_state = {
+            Route.KEY: {
+                Route.CONFIG: [
+                    {
+                        Route.DESTINATION: "198.51.100.0/24",
+                        Route.NEXT_HOP_INTERFACE: ETH2,
+                    }
+                ]
+            }
+        }
+        context = mock.MagicMock()
+        context.get_nm_dev.return_value = None
+
+        assert not applier.is_applied(context, net_state, True)
+        context.get_nm_dev.assert_called_once_with(ETH2)
+
+
+def _gen_vlan_state(ifname, base_iface=ETH1):
+    return {
+        Interface.NAME: ifname,
+        Interface.TYPE: InterfaceType.VLAN,
+        Interface.STATE: InterfaceState.UP,
+        VLAN.CONFIG_SUBTREE: {VLAN.ID: 10, VLAN.BASE_IFACE: base_iface},
+    }
+
+
+def _gen_con_profile(ifname, profile=None):
+    con_profile = mock.MagicMock()
+    con_profile.devname = ifname
+    con_profile.con_id = ifname
+    con_profile.profile = profile
+    return con_profile
+
+
+class _FakeNmClient:
+    """
+    Complete each async call after a random delay in virtual time. Each
+    iteration of main context jumps to the next completion.
+    """
+
+    def __init__(self, context, seed=0):
+        self._ctx = context
+        self._random = random.Random(seed)
+        self._pending = []
+        self.now = 0.0
+        context.context.iteration.side_effect = self._iteration
+
+    def call_async(self, action, fast=False):
+        self._ctx.register_async(action, fast=fast)
+        delay = self._random.uniform(0.1, 1.0)
+        heapq.heappush(self._pending, (self.now + delay, action))
+
+    def _iteration(self, _may_block):
+        self.now, action = heapq.heappop(self._pending)
+        self._ctx.finish_async(action, suppress_log=True)
+        return True
+
+
+@pytest.fixture
+def context_cls():
+    with mock.patch.object(nm_context, "NM"), mock.patch.object(
+        nm_context, "GLib"
+    ), mock.patch.object(nm_context, "Gio"):
+        yield nm_context.NmContext
+
+
+def _create_vlans(context_cls, vlan_count, pipelined):
+    """
+    Return the virtual time of adding and activating new VLANs.
+    """
+    context = context_cls()
+    client = _FakeNmClient(context)
+    ifnames = [f"{ETH1}.{i}" for i in range(vlan_count)]
+    profile_actions = [
+        (
+            applier._ADD_PROFILE,
+            ifname,
+            functools.partial(client.call_async, f"add {ifname}", fast=True),
+        )
+        for ifname in ifnames
+    ]
+
+    def _activate(_context, dev, connection_id):
+        client.call_async(f"activate {connection_id}")
+
+    with mock.patch.object(
+        context, "get_nm_dev", return_value=None
+    ), mock.patch.object(applier.device, "activate", _activate):
+        if not pipelined:
+            for _, _, issue in profile_actions:
+                issue()
+            context.wait_all_finish()
+            profile_actions = []
+        applier._set_ifaces_admin_state(
+            context,
+            [_gen_vlan_state(ifname) for ifname in ifnames],
+            [_gen_con_profile(ifname) for ifname in ifnames],
+            profile_actions=profile_actions,
+        )
+    return client.now
+
+
+@pytest.mark.benchmark
+def test_pipelined_vlan_creation_benchmark(context_cls):
+    """
+    Compare the virtual time of activating each new VLAN once its own
+    profile is added against waiting for all profiles to be added.
+    """
+    logging.disable(logging.DEBUG)
+    try:
+        for vlan_count in (50, 1000):
+            pipelined_time = _create_vlans(context_cls, vlan_count, True)
+            barrier_time = _create_vlans(context_cls, vlan_count, False)
+            print(
+                f"{vlan_count} new VLANs: pipelined {pipelined_time:.2f}, "
+                f"barrier {barrier_time:.2f}"
+            )
+            assert pipelined_time < barrier_time
+    finally:
+        logging.disable(logging.NOTSET)
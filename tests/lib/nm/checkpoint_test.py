@@ -0,0 +1,91 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+from unittest import mock
+
+import pytest
+
+from libnmstate.nm import checkpoint
+
+ETH1 = "eth1"
+ETH2 = "eth2"
+
+
+@pytest.fixture
+def NM_mock():
+    with mock.patch.object(checkpoint.common, "NM") as m:
+        m.CheckpointCreateFlags.DELETE_NEW_CONNECTIONS = 0x4
+        m.CheckpointCreateFlags.DISCONNECT_NEW_DEVICES = 0x8
+        yield m
+
+
+@pytest.fixture
+def context_mock(NM_mock):
+    context = mock.MagicMock()
+    devs = {}
+    for iface_name in (ETH1, ETH2):
+        nmdev = mock.MagicMock()
+        nmdev.get_iface.return_value = iface_name
+        nmdev.get_device_type.return_value = NM_mock.DeviceType.ETHERNET
+        devs[iface_name] = nmdev
+    context.get_nm_dev.side_effect = devs.get
+    yield context
+
+
+def _get_created_checkpoint_args(context):
+    args, _ = context.client.checkpoint_create.call_args
+    devs, _, flags = args[:3]
+    return devs, flags
+
+
+def test_create_checkpoint_for_devices(NM_mock, context_mock):
+    checkpoint.CheckPoint.create(context_mock, iface_names={ETH2, ETH1})
+
+    devs, flags = _get_created_checkpoint_args(context_mock)
+    assert [dev.get_iface() for dev in devs] == [ETH1, ETH2]
+    assert flags == NM_mock.CheckpointCreateFlags.DELETE_NEW_CONNECTIONS
+
+
+def test_create_checkpoint_for_all_devices(NM_mock, context_mock):
+    checkpoint.CheckPoint.create(context_mock)
+
+    devs, flags = _get_created_checkpoint_args(context_mock)
+    assert devs == []
+    assert flags == (
+        NM_mock.CheckpointCreateFlags.DELETE_NEW_CONNECTIONS
+        | NM_mock.CheckpointCreateFlags.DISCONNECT_NEW_DEVICES
+    )
+
+
+def test_create_checkpoint_for_all_devices_when_device_missing(
+    NM_mock, context_mock
+):
+    checkpoint.CheckPoint.create(context_mock, iface_names={ETH1, "eth3"})
+
+    devs, _ = _get_created_checkpoint_args(context_mock)
+    assert devs == []
+
+
+def test_create_checkpoint_for_all_devices_with_ovs(NM_mock, context_mock):
+    ovs_dev = context_mock.get_nm_dev(ETH2)
+    ovs_dev.get_device_type.return_value = NM_mock.DeviceType.OVS_INTERFACE
+
+    checkpoint.CheckPoint.create(context_mock, iface_names={ETH1, ETH2})
+
+    devs, _ = _get_created_checkpoint_args(context_mock)
+    assert devs == []
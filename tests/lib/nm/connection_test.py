@@ -79,7 +79,10 @@ def test_update_profile(NM_mock, context_mock):
     profile = mock.MagicMock()
     con_profile = nm.connection.ConnectionProfile(context_mock, profile)
     con_profile.update(new_profile)
-    user_data = f"Update profile: {profile.get_id()}"
+    user_data = (
+        f"Update profile: {profile.get_id()}",
+        new_profile_mock.get_interface_name(),
+    )
 
     nm_update2_flags = NM_mock.SettingsUpdate2Flags
     flags = nm_update2_flags.BLOCK_AUTOCONNECT
@@ -96,6 +99,48 @@ def test_update_profile(NM_mock, context_mock):
     )
 
 
+def test_update_profile_callback_reindexes_profile(NM_mock, context_mock):
+    context_mock.is_cancelled.return_value = False
+    profile = mock.MagicMock()
+    con_profile = nm.connection.ConnectionProfile(context_mock, profile)
+
+    con_profile._update2_callback(
+        profile, mock.MagicMock(), ("Update profile: eth1", "eth1")
+    )
+
+    context_mock.index.profile_updated.assert_called_once_with(profile, "eth1")
+    context_mock.finish_async.assert_called_once_with("Update profile: eth1")
+
+
+def test_has_same_settings(NM_mock, context_mock):
+    profile = mock.MagicMock()
+    new_profile = mock.MagicMock()
+    con_profile = nm.connection.ConnectionProfile(context_mock, profile)
+    new_con_profile = nm.connection.ConnectionProfile(
+        context_mock, new_profile
+    )
+
+    assert con_profile.has_same_settings(new_con_profile)
+
+    NM_mock.SimpleConnection.new_clone.assert_called_once_with(new_profile)
+    normalized_profile = NM_mock.SimpleConnection.new_clone.return_value
+    normalized_profile.normalize.assert_called_once()
+    profile.compare.assert_called_once_with(
+        normalized_profile,
+        NM_mock.SettingCompareFlags.IGNORE_TIMESTAMP
+        | NM_mock.SettingCompareFlags.IGNORE_SECRETS,
+    )
+
+
+def test_has_same_settings_without_profile(NM_mock, context_mock):
+    con_profile = nm.connection.ConnectionProfile(context_mock)
+    new_con_profile = nm.connection.ConnectionProfile(
+        context_mock, mock.MagicMock()
+    )
+
+    assert not con_profile.has_same_settings(new_con_profile)
+
+
 def test_create_setting(NM_mock):
     con_setting = nm.connection.ConnectionSetting()
     con_setting.create("con-name", "iface-name", "iface-type")
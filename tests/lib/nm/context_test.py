@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import heapq
+import logging
+import random
+
+import pytest
+
+from unittest import mock
+
+from libnmstate.error import NmstateValueError
+from libnmstate.nm import context as nm_context
+
+ACTION_COUNT = 1000
+QUEUE_SIZE = 100
+
+
+class _FakeNmClient:
+    """
+    Complete each async call after a random delay in virtual time. Each
+    iteration of main context jumps to the next completion.
+    """
+
+    def __init__(self, context, seed=0):
+        self._ctx = context
+        self._random = random.Random(seed)
+        self._pending = []
+        self.now = 0.0
+        self.max_in_flight = 0
+        context.context.iteration.side_effect = self._iteration
+
+    def call_async(self, action):
+        self._ctx.register_async(action)
+        delay = self._random.uniform(0.1, 1.0)
+        heapq.heappush(self._pending, (self.now + delay, action))
+        self.max_in_flight = max(self.max_in_flight, len(self._pending))
+
+    def _iteration(self, _may_block):
+        self.now, action = heapq.heappop(self._pending)
+        self._ctx.finish_async(action, suppress_log=True)
+        return True
+
+
+@pytest.fixture
+def context_cls():
+    with mock.patch.object(nm_context, "NM"), mock.patch.object(
+        nm_context, "GLib"
+    ), mock.patch.object(nm_context, "Gio"):
+        yield nm_context.NmContext
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    logging.disable(logging.DEBUG)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_queue_admits_action_once_any_finished(context_cls):
+    context = context_cls(slow_queue_size=10)
+    client = _FakeNmClient(context)
+
+    for i in range(10):
+        client.call_async(f"action{i}")
+    client.call_async("action10")
+
+    # Only one action finished to make room for the new one
+    assert len(client._pending) == 10
+    context.wait_all_finish()
+    assert client.max_in_flight == 10
+
+
+def test_invalid_queue_size(context_cls):
+    with pytest.raises(NmstateValueError):
+        context_cls(slow_queue_size=0)
+    with pytest.raises(NmstateValueError):
+        context_cls(
+            slow_queue_size=nm_context.DBUS_MAX_PENDING_REPLIES,
+            fast_queue_size=1,
+        )
+
+
+@pytest.mark.benchmark
+def test_sliding_window_throughput_benchmark(context_cls):
+    """
+    Compare the virtual time of sliding window against draining the full
+    queue before admitting more actions.
+    """
+    context = context_cls(slow_queue_size=QUEUE_SIZE)
+    client = _FakeNmClient(context)
+    for i in range(ACTION_COUNT):
+        client.call_async(f"action{i}")
+    context.wait_all_finish()
+    sliding_window_time = client.now
+
+    context = context_cls(slow_queue_size=QUEUE_SIZE)
+    client = _FakeNmClient(context)
+    for i in range(ACTION_COUNT):
+        if i and i % QUEUE_SIZE == 0:
+            context.wait_all_finish()
+        client.call_async(f"action{i}")
+    context.wait_all_finish()
+    drain_time = client.now
+
+    print(
+        f"{ACTION_COUNT} actions with queue size {QUEUE_SIZE}: "
+        f"sliding window {sliding_window_time:.2f}, drain {drain_time:.2f}"
+    )
+    assert client.max_in_flight == QUEUE_SIZE
+    assert sliding_window_time < drain_time * 0.7
@@ -0,0 +1,244 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+from collections import Counter
+import struct
+
+import pytest
+
+from unittest import mock
+
+from libnmstate import nm
+from libnmstate.schema import Interface
+
+
+class _FakeNmObject:
+    """
+    Fake libnm object counting the invocations of its getters.
+    """
+
+    def __init__(self, counter, **props):
+        self._counter = counter
+        self._props = props
+
+    def __getattr__(self, name):
+        value = self._props[name]
+
+        def getter():
+            self._counter[name] += 1
+            return value
+
+        return getter
+
+
+@pytest.fixture
+def counter():
+    return Counter()
+
+
+@pytest.fixture
+def context(counter):
+    ctx = mock.MagicMock()
+    ip4_setting = object()
+    ip6_setting = object()
+    profiles = [
+        _FakeNmObject(
+            counter,
+            get_setting_ip4_config=ip4_setting,
+            get_setting_ip6_config=ip6_setting,
+        )
+        for _ in range(2)
+    ]
+    devices = []
+    acs = []
+    for i, profile in enumerate(profiles):
+        dev = _FakeNmObject(counter, get_iface=f"eth{i}")
+        ac = _FakeNmObject(counter, get_connection=profile, get_devices=[dev])
+        dev._props["get_active_connection"] = ac
+        devices.append(dev)
+        acs.append(ac)
+    ctx.client = _FakeNmObject(
+        counter, get_devices=devices, get_active_connections=acs
+    )
+    return ctx
+
+
+def test_device_lookups_are_cached(context, counter):
+    index = nm.index.DeviceIndex(context)
+
+    # Emulating the collectors of a single show
+    for _ in range(3):
+        for dev in index.devices:
+            index.iface_name(dev)
+            index.active_connection(dev)
+            index.profile(dev)
+
+    assert counter == {
+        "get_devices": 1,
+        "get_iface": 2,
+        "get_active_connection": 2,
+        "get_connection": 2,
+    }
+
+
+def test_ip_profile_lookups_are_cached(context, counter):
+    index = nm.index.DeviceIndex(context)
+
+    # Emulating route, route rule and DNS collectors
+    for _ in range(3):
+        for family in (Interface.IPV4, Interface.IPV6):
+            for ac, _ in index.acs_and_ip_profiles(family):
+                index.ac_iface_name(ac)
+
+    assert counter == {
+        "get_active_connections": 1,
+        "get_connection": 2,
+        "get_setting_ip4_config": 2,
+        "get_setting_ip6_config": 2,
+        "get_devices": 2,
+        "get_iface": 2,
+    }
+
+
+def test_device_without_active_connection(context):
+    index = nm.index.DeviceIndex(context)
+    dev = mock.MagicMock()
+    dev.get_active_connection.return_value = None
+
+    assert index.profile(dev) is None
+    assert index.profile(None) is None
+
+
+def test_bridge_ports_are_dumped_once(context):
+    index = nm.index.DeviceIndex(context)
+    port_attrs = [
+        {nm.index.netlink.IFLA_MASTER: struct.pack("=I", master)}
+        for master in (10, 11, 10)
+    ]
+    with mock.patch.object(nm.index.netlink, "NetlinkRoute") as nl_mock:
+        nl_mock.return_value.dump_bridge_ports.return_value = port_attrs
+
+        assert index.bridge_ports(10) == [port_attrs[0], port_attrs[2]]
+        assert index.bridge_ports(11) == [port_attrs[1]]
+        assert index.bridge_ports(12) == []
+        nl_mock.return_value.dump_bridge_ports.assert_called_once()
+
+
+def test_ovs_running_is_probed_once_per_index(context):
+    with mock.patch.object(
+        nm.index, "is_ovs_running", return_value=True
+    ) as probe_mock:
+        index = nm.index.DeviceIndex(context)
+        assert index.ovs_running
+        assert index.ovs_running
+        probe_mock.assert_called_once()
+
+        assert nm.index.DeviceIndex(context).ovs_running
+        assert probe_mock.call_count == 2
+
+
+def _gen_profiles(counter, iface_count, profiles_per_iface=2):
+    return [
+        _FakeNmObject(
+            counter, get_interface_name=f"eth{i}", get_uuid=f"uuid-{i}-{j}"
+        )
+        for i in range(iface_count)
+        for j in range(profiles_per_iface)
+    ]
+
+
+def test_profile_lookups_are_indexed(counter):
+    ctx = mock.MagicMock()
+    profiles = _gen_profiles(counter, 2)
+    ctx.client = _FakeNmObject(counter, get_connections=profiles)
+    index = nm.index.DeviceIndex(ctx)
+
+    for _ in range(3):
+        assert index.iface_profiles("eth0") == profiles[:2]
+        assert index.iface_profiles("eth1") == profiles[2:]
+        assert index.iface_profiles("eth2") == []
+
+    assert counter == {
+        "get_connections": 1,
+        "get_interface_name": 4,
+        "get_uuid": 4,
+    }
+
+
+def test_profile_index_follows_added_and_deleted_profiles(counter):
+    ctx = mock.MagicMock()
+    profiles = _gen_profiles(counter, 1)
+    ctx.client = _FakeNmObject(counter, get_connections=profiles)
+    index = nm.index.DeviceIndex(ctx)
+    new_profile = _FakeNmObject(
+        counter, get_interface_name="eth0", get_uuid="uuid-new"
+    )
+
+    index.iface_profiles("eth0")
+    index.profile_added(new_profile)
+    index.profile_deleted(profiles[0])
+
+    assert index.iface_profiles("eth0") == [profiles[1], new_profile]
+
+
+def test_profile_index_follows_updated_iface_name(counter):
+    ctx = mock.MagicMock()
+    profiles = _gen_profiles(counter, 1)
+    ctx.client = _FakeNmObject(counter, get_connections=profiles)
+    index = nm.index.DeviceIndex(ctx)
+
+    index.iface_profiles("eth0")
+    index.profile_updated(profiles[0], "eth1")
+
+    assert index.iface_profiles("eth0") == [profiles[1]]
+    assert index.iface_profiles("eth1") == [profiles[0]]
+
+
+def test_profile_changes_before_loading_are_ignored(counter):
+    ctx = mock.MagicMock()
+    profiles = _gen_profiles(counter, 1)
+    ctx.client = _FakeNmObject(counter, get_connections=profiles)
+    index = nm.index.DeviceIndex(ctx)
+
+    index.profile_added(profiles[0])
+    index.profile_deleted(profiles[1])
+
+    assert index.iface_profiles("eth0") == profiles
+    assert counter["get_connections"] == 1
+
+
+@pytest.mark.benchmark
+def test_profile_lookup_scaling_benchmark():
+    """
+    The libnm calls of looking up the profiles of every interface should
+    grow linearly with the number of interfaces.
+    """
+    calls = []
+    for iface_count in (1000, 2000):
+        counter = Counter()
+        ctx = mock.MagicMock()
+        ctx.client = _FakeNmObject(
+            counter, get_connections=_gen_profiles(counter, iface_count)
+        )
+        index = nm.index.DeviceIndex(ctx)
+        for i in range(iface_count):
+            index.iface_profiles(f"eth{i}")
+        calls.append(sum(counter.values()))
+
+    print(f"libnm calls for 1000 and 2000 interfaces: {calls}")
+    assert calls[1] <= calls[0] * 2
@@ -33,13 +33,9 @@ def NM_mock():
 
 @pytest.fixture
 def context_mock():
-    yield mock.MagicMock()
-
-
-@pytest.fixture
-def nm_connection_mock():
-    with mock.patch.object(nm.ovs, "connection") as m:
-        yield m
+    context = mock.MagicMock()
+    context.index = nm.index.DeviceIndex(context)
+    yield context
 
 
 def test_is_ovs_bridge_type_id(NM_mock):
@@ -57,9 +53,9 @@ def test_is_ovs_interface_type_id(NM_mock):
     assert nm.ovs.is_ovs_interface_type_id(type_id)
 
 
-def test_get_ovs_info_without_ports(context_mock, nm_connection_mock, NM_mock):
+def test_get_ovs_info_without_ports(context_mock, NM_mock):
     bridge_device = mock.MagicMock()
-    _mock_port_profile(nm_connection_mock)
+    _mock_bridge_profile(bridge_device.get_active_connection.return_value)
 
     device_info = [(bridge_device, None)]
     info = nm.ovs.get_ovs_info(context_mock, bridge_device, device_info)
@@ -76,14 +72,14 @@ def test_get_ovs_info_without_ports(context_mock, nm_connection_mock, NM_mock):
     assert expected_info == info
 
 
-def test_get_ovs_info_with_ports_without_interfaces(
-    nm_connection_mock, NM_mock, context_mock
-):
+def test_get_ovs_info_with_ports_without_interfaces(NM_mock, context_mock):
     bridge_device = mock.MagicMock()
     port_device = mock.MagicMock()
-    _mock_port_profile(nm_connection_mock)
-    active_con = nm_connection_mock.get_device_active_connection.return_value
+    active_con = mock.MagicMock()
     active_con.props.master = bridge_device
+    bridge_device.get_active_connection.return_value = active_con
+    port_device.get_active_connection.return_value = active_con
+    _mock_bridge_profile(active_con)
 
     device_info = [(bridge_device, None), (port_device, None)]
     info = nm.ovs.get_ovs_info(context_mock, bridge_device, device_info)
@@ -100,20 +96,15 @@ def test_get_ovs_info_with_ports_without_interfaces(
     assert expected_info == info
 
 
-def test_get_ovs_info_with_ports_with_interfaces(
-    nm_connection_mock, NM_mock, context_mock
-):
+def test_get_ovs_info_with_ports_with_interfaces(NM_mock, context_mock):
     bridge_device = mock.MagicMock()
     port_device = mock.MagicMock()
     bridge_active_con = mock.MagicMock()
     port_active_con = mock.MagicMock()
     context_mock.get_nm_dev.return_value = port_device
-    _mock_port_profile(nm_connection_mock)
-    nm_connection_mock.get_device_active_connection = (
-        lambda dev: bridge_active_con
-        if dev == bridge_device
-        else port_active_con
-    )
+    _mock_bridge_profile(bridge_active_con)
+    bridge_device.get_active_connection.return_value = bridge_active_con
+    port_device.get_active_connection.return_value = port_active_con
     bridge_active_con.props.master = bridge_device
     port_active_con.props.master = port_device
 
@@ -175,9 +166,8 @@ def test_create_port_setting(NM_mock):
     assert port_setting.props.vlan_mode == vlan_mode
 
 
-def _mock_port_profile(nm_connection_mock):
-    con_prof_mock = nm_connection_mock.ConnectionProfile.return_value
-    connection_profile = con_prof_mock.profile
+def _mock_bridge_profile(active_con):
+    connection_profile = active_con.get_connection.return_value
     bridge_setting = connection_profile.get_setting.return_value
     bridge_setting.props.stp_enable = False
     bridge_setting.props.rstp_enable = False
@@ -27,9 +27,12 @@ from libnmstate.error import NmstateNotImplementedError
 from libnmstate.nm import ipv4 as nm_ipv4
 from libnmstate.nm import ipv6 as nm_ipv6
 from libnmstate.nm import connection as nm_connection
+from libnmstate.nm import plugin as nm_plugin
+from libnmstate.nm.index import DeviceIndex
 from libnmstate.ifaces import BaseIface
 from libnmstate.schema import InterfaceIP
 from libnmstate.schema import Route
+from libnmstate.state import InterfaceFilter
 
 IPV4_DEFAULT_GATEWAY_DESTINATION = "0.0.0.0/0"
 IPV6_DEFAULT_GATEWAY_DESTINATION = "::/0"
@@ -293,6 +296,64 @@ def test_clear_gateway(nm_ip, routes, gateways, client_mock):
     assert setting_ip.props.route_metric == Route.USE_DEFAULT_METRIC
 
 
+@mock.patch.object(nm_plugin, "NmContext")
+def test_get_routes_with_iface_filter(context_mock):
+    context = context_mock.return_value
+    context.client.get_version.return_value = None
+    context.index = DeviceIndex(context)
+    context.client.get_active_connections.return_value = [
+        _gen_active_connection("eth0", IPV4_ROUTE1, IPV6_ROUTE1),
+        _gen_active_connection("eth1", IPV4_ROUTE2, IPV6_ROUTE2),
+    ]
+    plugin = nm_plugin.NetworkManagerPlugin()
+
+    routes = plugin.get_routes(iface_filter=InterfaceFilter(["eth1"]))
+
+    expected_routes = [
+        dict(IPV4_ROUTE2, **{Route.NEXT_HOP_INTERFACE: "eth1"}),
+        dict(IPV6_ROUTE2, **{Route.NEXT_HOP_INTERFACE: "eth1"}),
+    ]
+    assert routes[Route.RUNNING] == expected_routes
+    assert routes[Route.CONFIG] == expected_routes
+
+
+def _gen_active_connection(iface_name, ipv4_route, ipv6_route):
+    nm_dev = mock.MagicMock()
+    nm_dev.get_iface.return_value = iface_name
+    nm_ac = mock.MagicMock()
+    nm_ac.get_devices.return_value = [nm_dev]
+    for ip_config, ip_profile, route in (
+        (
+            nm_ac.get_ip4_config.return_value,
+            nm_ac.get_connection.return_value.get_setting_ip4_config,
+            ipv4_route,
+        ),
+        (
+            nm_ac.get_ip6_config.return_value,
+            nm_ac.get_connection.return_value.get_setting_ip6_config,
+            ipv6_route,
+        ),
+    ):
+        nm_route = _gen_nm_route(route)
+        ip_config.props.routes = [nm_route]
+        ip_profile.return_value.props.routes = [nm_route]
+        ip_profile.return_value.props.gateway = None
+    return nm_ac
+
+
+def _gen_nm_route(route):
+    destination, prefix = route[Route.DESTINATION].split("/")
+    nm_route = mock.MagicMock()
+    nm_route.get_dest.return_value = destination
+    nm_route.get_prefix.return_value = int(prefix)
+    nm_route.get_next_hop.return_value = route[Route.NEXT_HOP_ADDRESS]
+    nm_route.get_metric.return_value = route[Route.METRIC]
+    nm_route.get_attribute.return_value.get_uint32.return_value = route[
+        Route.TABLE_ID
+    ]
+    return nm_route
+
+
 def _nm_route_to_dict(nm_route):
     dst = "{ip}/{prefix}".format(
         ip=nm_route.get_dest(), prefix=nm_route.get_prefix()
@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+from collections import deque
+
+import pytest
+
+from unittest import mock
+
+from libnmstate.error import NmstateValueError
+from libnmstate.nm import context as nm_context
+from libnmstate.nm.scheduler import ActionScheduler
+
+
+class _FakeContext:
+    """
+    Finish the started async groups in the order of starting.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._groups = deque()
+
+    def start_async_group(self, group, issue, finish_callback):
+        self.events.append(("start", group))
+        issue()
+        self._groups.append((group, finish_callback))
+
+    def wait_all_finish(self):
+        while self._groups:
+            group, finish_callback = self._groups.popleft()
+            self.events.append(("finish", group))
+            finish_callback(group)
+
+
+@pytest.fixture
+def fake_context():
+    return _FakeContext()
+
+
+class TestActionScheduler:
+    def test_independent_actions_are_not_waiting_each_other(
+        self, fake_context
+    ):
+        scheduler = ActionScheduler(fake_context)
+        issue = mock.MagicMock()
+        scheduler.add("bond0", issue)
+        scheduler.add("eth1", issue, after=["bond0"])
+        scheduler.add("eth2", issue)
+
+        scheduler.run()
+
+        assert fake_context.events == [
+            ("start", "bond0"),
+            ("start", "eth2"),
+            ("finish", "bond0"),
+            ("start", "eth1"),
+            ("finish", "eth2"),
+            ("finish", "eth1"),
+        ]
+        assert issue.call_count == 3
+
+    def test_action_waits_all_dependencies(self, fake_context):
+        scheduler = ActionScheduler(fake_context)
+        scheduler.add("br0", mock.MagicMock())
+        scheduler.add("eth1", mock.MagicMock())
+        scheduler.add("eth1.10", mock.MagicMock(), after=["br0", "eth1"])
+
+        scheduler.run()
+
+        assert fake_context.events.index(
+            ("start", "eth1.10")
+        ) > fake_context.events.index(("finish", "eth1"))
+
+    def test_unknown_dependency_is_ignored(self, fake_context):
+        scheduler = ActionScheduler(fake_context)
+        scheduler.add("eth1", mock.MagicMock(), after=["bond99"])
+
+        scheduler.run()
+
+        assert fake_context.events == [("start", "eth1"), ("finish", "eth1")]
+
+    def test_circular_dependency(self, fake_context):
+        scheduler = ActionScheduler(fake_context)
+        scheduler.add("bond0", mock.MagicMock(), after=["bond1"])
+        scheduler.add("bond1", mock.MagicMock(), after=["bond0"])
+
+        with pytest.raises(NmstateValueError):
+            scheduler.run()
+        assert not fake_context.events
+
+    def test_plan_does_not_run_actions(self, fake_context):
+        scheduler = ActionScheduler(fake_context)
+        issue = mock.MagicMock()
+        scheduler.add("eth1", issue, after=["bond0"])
+        scheduler.add("bond0", issue)
+        scheduler.add("eth2", issue, after=["bond99"])
+
+        assert scheduler.plan() == ["bond0", "eth2", "eth1"]
+        assert not fake_context.events
+        issue.assert_not_called()
+
+    def test_plan_with_circular_dependency(self, fake_context):
+        scheduler = ActionScheduler(fake_context)
+        scheduler.add("bond0", mock.MagicMock(), after=["bond1"])
+        scheduler.add("bond1", mock.MagicMock(), after=["bond0"])
+
+        with pytest.raises(NmstateValueError):
+            scheduler.plan()
+
+
+@pytest.fixture
+def context():
+    with mock.patch.object(nm_context, "NM"), mock.patch.object(
+        nm_context, "GLib"
+    ), mock.patch.object(nm_context, "Gio"):
+        yield nm_context.NmContext()
+
+
+class TestNmContextAsyncGroup:
+    def test_group_includes_actions_registered_by_callbacks(self, context):
+        finished = []
+        unfinished_on_fallback = []
+
+        def _reapply_callback():
+            context.finish_async("reapply")
+            context.register_async("activate")
+
+        def _activate_callback():
+            unfinished_on_fallback.append(not finished)
+            context.finish_async("activate")
+
+        callbacks = deque([_reapply_callback, _activate_callback])
+        context.context.iteration.side_effect = (
+            lambda _may_block: callbacks.popleft()()
+        )
+
+        context.start_async_group(
+            "eth1", lambda: context.register_async("reapply"), finished.append
+        )
+        context.wait_all_finish()
+
+        assert unfinished_on_fallback == [True]
+        assert finished == ["eth1"]
+
+    def test_group_without_action(self, context):
+        finished = []
+
+        def _start_next(group):
+            finished.append(group)
+            if group == "eth1":
+                context.start_async_group("eth2", lambda: None, _start_next)
+
+        context.start_async_group("eth1", lambda: None, _start_next)
+        context.wait_all_finish()
+
+        assert finished == ["eth1", "eth2"]
+        context.context.iteration.assert_not_called()
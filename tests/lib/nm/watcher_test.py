@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import pytest
+
+from unittest import mock
+
+from libnmstate.nm import watcher as nm_watcher
+
+
+def _gen_nm_dev(iface_name):
+    nmdev = mock.MagicMock()
+    nmdev.get_iface.return_value = iface_name
+    nmdev.get_ip4_config.return_value = None
+    nmdev.get_ip6_config.return_value = None
+    return nmdev
+
+
+def _param_spec(name):
+    param_spec = mock.MagicMock()
+    param_spec.name = name
+    return param_spec
+
+
+@pytest.fixture
+def nm_dev():
+    return _gen_nm_dev("eth1")
+
+
+@pytest.fixture
+def watcher(nm_dev):
+    context = mock.MagicMock()
+    context.client.get_devices.return_value = [nm_dev]
+    with mock.patch.object(nm_watcher.NmWatcher, "_iterate"):
+        yield nm_watcher.NmWatcher(context)
+
+
+def test_no_changes(watcher):
+    assert watcher.wait_for_changes(1) is None
+
+
+def test_device_state_changed(watcher, nm_dev):
+    watcher._device_state_callback(nm_dev, 100, 30, 0)
+
+    assert watcher.wait_for_changes(1) == {"eth1"}
+    assert watcher.wait_for_changes(1) is None
+
+
+def test_device_added_and_removed(watcher):
+    new_dev = _gen_nm_dev("eth2")
+
+    watcher._device_added_callback(None, new_dev)
+    assert watcher.wait_for_changes(1) == {"eth2"}
+
+    watcher._device_removed_callback(None, new_dev)
+    assert watcher.wait_for_changes(1) == {"eth2"}
+    new_dev.handler_disconnect.assert_called()
+
+
+def test_device_renamed(watcher, nm_dev):
+    nm_dev.get_iface.return_value = "eth1.new"
+
+    watcher._device_notify_callback(nm_dev, _param_spec("interface"))
+
+    assert watcher.wait_for_changes(1) == {"eth1", "eth1.new"}
+
+
+def test_ip_config_replaced(watcher, nm_dev):
+    ip_config = mock.MagicMock()
+    nm_dev.get_ip4_config.return_value = ip_config
+
+    watcher._device_notify_callback(nm_dev, _param_spec("ip4-config"))
+
+    ip_config.connect.assert_called_once_with(
+        "notify", watcher._ip_config_notify_callback, nm_dev
+    )
+    assert watcher.wait_for_changes(1) == {"eth1"}
+
+
+def test_dns_changed(watcher):
+    watcher._global_callback(None, _param_spec("dns-configuration"))
+
+    assert watcher.wait_for_changes(1) == set()
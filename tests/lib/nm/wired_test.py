@@ -136,24 +136,22 @@ def test_create_setting_speed_duplex(NM_mock):
     assert setting.props.duplex == schema.Ethernet.FULL_DUPLEX
 
 
-@mock.patch.object(
-    nm.wired,
-    "minimal_ethtool",
-    return_value={
+def test_get_info_with_invalid_duplex(NM_mock):
+    context = mock.MagicMock()
+    context.index.link_settings.return_value = {
         "speed": 1500,
         "duplex": "unknown",
         "auto-negotiation": True,
-    },
-)
-def test_get_info_with_invalid_duplex(ethtool_mock, NM_mock):
+    }
     dev_mock = mock.MagicMock()
     dev_mock.get_iface.return_value = "nmstate_test"
     dev_mock.get_hw_address.return_value = "ab:cd:ef:01:23:45"
     dev_mock.get_mtu.return_value = 1500
     dev_mock.get_device_type.return_value = NM_mock.DeviceType.ETHERNET
 
-    info = nm.wired.get_info(dev_mock)
+    info = nm.wired.get_info(context, dev_mock)
 
+    context.index.link_settings.assert_called_once_with("nmstate_test")
     assert info == {
         schema.Interface.MAC: dev_mock.get_hw_address.return_value,
         schema.Interface.MTU: dev_mock.get_mtu.return_value,
@@ -0,0 +1,236 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import pytest
+
+from unittest import mock
+
+from libnmstate import nmstate
+from libnmstate import validator
+from libnmstate.plugin import NmstatePlugin
+from libnmstate.schema import DNS
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+from libnmstate.error import NmstateValueError
+from libnmstate.state import FieldFilter
+from libnmstate.state import InterfaceFilter
+
+
+def _gen_iface_info(iface_name):
+    return {
+        Interface.NAME: iface_name,
+        Interface.TYPE: InterfaceType.DUMMY,
+        Interface.STATE: InterfaceState.UP,
+    }
+
+
+def _gen_route(iface_name):
+    return {
+        Route.DESTINATION: "198.51.100.0/24",
+        Route.NEXT_HOP_INTERFACE: iface_name,
+    }
+
+
+@pytest.fixture
+def plugin():
+    plugin = mock.MagicMock()
+    plugin.plugin_capabilities = [
+        NmstatePlugin.PLUGIN_CAPABILITY_IFACE,
+        NmstatePlugin.PLUGIN_CAPABILITY_ROUTE,
+    ]
+    plugin.priority = NmstatePlugin.DEFAULT_PRIORITY
+    plugin.get_interfaces.return_value = [
+        _gen_iface_info("bond0"),
+        _gen_iface_info("eth1"),
+        _gen_iface_info("eth2"),
+    ]
+    plugin.get_routes.return_value = {
+        Route.CONFIG: [_gen_route("eth1"), _gen_route("bond0")],
+        Route.RUNNING: [_gen_route("eth2")],
+    }
+    plugin.get_route_rules.return_value = {RouteRule.CONFIG: []}
+    plugin.get_dns_client_config.return_value = {
+        DNS.RUNNING: {},
+        DNS.CONFIG: {},
+    }
+    return plugin
+
+
+class TestInterfaceFilter:
+    def test_match_name(self):
+        iface_filter = InterfaceFilter(["eth1"])
+
+        assert iface_filter.match("eth1")
+        assert not iface_filter.match("eth10")
+
+    def test_match_wildcard(self):
+        iface_filter = InterfaceFilter(["eth1", "bond*"])
+
+        assert iface_filter.match("bond0")
+        assert iface_filter.match("eth1")
+        assert not iface_filter.match("eth2")
+
+    def test_match_nothing(self):
+        assert not InterfaceFilter([]).match("eth1")
+
+
+class TestFieldFilter:
+    def test_match(self):
+        field_filter = FieldFilter(["interfaces.name", "routes"])
+
+        assert field_filter.match(Interface.KEY)
+        assert field_filter.match(Interface.KEY, Interface.NAME)
+        assert not field_filter.match(Interface.KEY, Interface.IPV4)
+        assert field_filter.match(Route.KEY, Route.CONFIG)
+        assert not field_filter.match(DNS.KEY)
+        assert field_filter.sections == {Interface.KEY, Route.KEY}
+
+    def test_whole_section_overrides_sub_field(self):
+        field_filter = FieldFilter(["interfaces.name", "interfaces"])
+
+        assert field_filter.match(Interface.KEY, Interface.IPV4)
+        assert FieldFilter(["interfaces", "interfaces.name"]).match(
+            Interface.KEY, Interface.IPV4
+        )
+
+    def test_project(self):
+        field_filter = FieldFilter(
+            ["interfaces.name", "interfaces.ipv4.enabled", "routes.config"]
+        )
+        report = {
+            Interface.KEY: [
+                {
+                    Interface.NAME: "eth1",
+                    Interface.STATE: InterfaceState.UP,
+                    Interface.IPV4: {"enabled": True, "address": []},
+                },
+                {Interface.NAME: "eth2", Interface.STATE: InterfaceState.UP},
+            ],
+            Route.KEY: {Route.CONFIG: [], Route.RUNNING: []},
+            DNS.KEY: {},
+        }
+
+        assert field_filter.project(report) == {
+            Interface.KEY: [
+                {Interface.NAME: "eth1", Interface.IPV4: {"enabled": True}},
+                {Interface.NAME: "eth2"},
+            ],
+            Route.KEY: {Route.CONFIG: []},
+        }
+
+
+class TestShowWithPlugins:
+    def test_show_without_filter(self, plugin):
+        state = nmstate.show_with_plugins([plugin])
+
+        plugin.get_interfaces.assert_called_once_with()
+        plugin.get_routes.assert_called_once_with()
+        assert len(state[Interface.KEY]) == 3
+        assert len(state[Route.KEY][Route.CONFIG]) == 2
+
+    def test_show_with_filter(self, plugin):
+        state = nmstate.show_with_plugins([plugin], interfaces=["eth*", "foo"])
+
+        iface_filter = plugin.get_interfaces.call_args[1]["iface_filter"]
+        assert iface_filter.match("eth1")
+        plugin.get_routes.assert_called_once_with(iface_filter=iface_filter)
+        assert [iface[Interface.NAME] for iface in state[Interface.KEY]] == [
+            "eth1",
+            "eth2",
+        ]
+        assert state[Route.KEY] == {
+            Route.CONFIG: [_gen_route("eth1")],
+            Route.RUNNING: [_gen_route("eth2")],
+        }
+
+    def test_show_with_single_interface_name(self, plugin):
+        state = nmstate.show_with_plugins([plugin], interfaces="bond0")
+
+        assert [iface[Interface.NAME] for iface in state[Interface.KEY]] == [
+            "bond0"
+        ]
+
+    def test_show_with_fields(self, plugin):
+        state = nmstate.show_with_plugins(
+            [plugin], fields=["interfaces.name", "routes.config"]
+        )
+
+        field_filter = plugin.get_interfaces.call_args[1]["field_filter"]
+        assert field_filter.match(Interface.KEY, Interface.NAME)
+        plugin.get_routes.assert_called_once_with(field_filter=field_filter)
+        plugin.get_route_rules.assert_not_called()
+        plugin.get_dns_client_config.assert_not_called()
+        assert state == {
+            Interface.KEY: [
+                {Interface.NAME: "bond0"},
+                {Interface.NAME: "eth1"},
+                {Interface.NAME: "eth2"},
+            ],
+            Route.KEY: {
+                Route.CONFIG: [_gen_route("eth1"), _gen_route("bond0")]
+            },
+        }
+
+    def test_show_with_plugin_not_supporting_filters(self, plugin):
+        class OldPlugin(NmstatePlugin):
+            @property
+            def name(self):
+                return "old"
+
+            @property
+            def plugin_capabilities(self):
+                return [NmstatePlugin.PLUGIN_CAPABILITY_IFACE]
+
+            def get_interfaces(self, iface_filter=None):
+                return [
+                    {
+                        Interface.NAME: "eth1",
+                        Interface.DESCRIPTION: "from old plugin",
+                    }
+                ]
+
+        state = nmstate.show_with_plugins(
+            [plugin, OldPlugin()],
+            interfaces=["eth1"],
+            fields=["interfaces.name", "interfaces.description"],
+        )
+
+        assert state[Interface.KEY] == [
+            {Interface.NAME: "eth1", Interface.DESCRIPTION: "from old plugin"}
+        ]
+
+    def test_show_with_unknown_fields(self, plugin):
+        with pytest.raises(NmstateValueError):
+            nmstate.show_with_plugins([plugin], fields=["foo.bar"])
+
+    def test_show_is_not_validated_by_default(self, plugin, monkeypatch):
+        monkeypatch.delenv(validator.VALIDATE_SHOW_ENV, raising=False)
+        with mock.patch.object(validator, "schema_validate") as validate:
+            nmstate.show_with_plugins([plugin])
+
+        validate.assert_not_called()
+
+    def test_show_is_validated_when_requested(self, plugin, monkeypatch):
+        monkeypatch.setenv(validator.VALIDATE_SHOW_ENV, "1")
+        with mock.patch.object(validator, "schema_validate") as validate:
+            state = nmstate.show_with_plugins([plugin])
+
+        validate.assert_called_once_with(state)
@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from libnmstate.error import NmstateValueError
+from libnmstate.prefix_trie import PrefixTrie
+
+
+@pytest.fixture
+def ipv4_trie():
+    trie = PrefixTrie()
+    for network in (
+        "0.0.0.0/0",
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+        "10.1.2.0/24",
+        "10.1.3.0/24",
+        "192.0.2.0/24",
+    ):
+        trie.add(network, network)
+    return trie
+
+
+@pytest.fixture
+def ipv6_trie():
+    trie = PrefixTrie()
+    for network in ("::/0", "2001:db8::/32", "2001:db8:a::/64", "fe80::/64"):
+        trie.add(network, network)
+    return trie
+
+
+def test_get_exact(ipv4_trie):
+    assert ipv4_trie.get_exact("10.1.0.0/16") == {"10.1.0.0/16"}
+    assert ipv4_trie.get_exact("10.2.0.0/16") == set()
+
+
+def test_get_exact_with_multiple_values(ipv4_trie):
+    ipv4_trie.add("10.1.0.0/16", "foo")
+
+    assert ipv4_trie.get_exact("10.1.0.0/16") == {"10.1.0.0/16", "foo"}
+
+
+def test_get_covering(ipv4_trie):
+    assert ipv4_trie.get_covering("10.1.2.0/24") == {
+        "0.0.0.0/0",
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+        "10.1.2.0/24",
+    }
+    assert ipv4_trie.get_covering("10.1.2.128/25") == {
+        "0.0.0.0/0",
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+        "10.1.2.0/24",
+    }
+    assert ipv4_trie.get_covering("198.51.100.0/24") == {"0.0.0.0/0"}
+
+
+def test_get_covered_by(ipv4_trie):
+    assert ipv4_trie.get_covered_by("10.1.0.0/16") == {
+        "10.1.0.0/16",
+        "10.1.2.0/24",
+        "10.1.3.0/24",
+    }
+    assert ipv4_trie.get_covered_by("10.1.4.0/24") == set()
+    assert len(ipv4_trie.get_covered_by("0.0.0.0/0")) == 6
+
+
+def test_host_bits_are_ignored(ipv4_trie):
+    assert ipv4_trie.get_exact("10.1.2.1/24") == {"10.1.2.0/24"}
+
+
+def test_ipv6(ipv6_trie):
+    assert ipv6_trie.get_covering("2001:db8:a::1/128") == {
+        "::/0",
+        "2001:db8::/32",
+        "2001:db8:a::/64",
+    }
+    assert ipv6_trie.get_covered_by("2001:db8::/32") == {
+        "2001:db8::/32",
+        "2001:db8:a::/64",
+    }
+
+
+def test_remove(ipv4_trie):
+    ipv4_trie.remove("10.1.0.0/16", "10.1.0.0/16")
+    ipv4_trie.remove("10.9.0.0/16", "10.9.0.0/16")
+
+    assert ipv4_trie.get_exact("10.1.0.0/16") == set()
+    assert "10.1.0.0/16" not in ipv4_trie.get_covering("10.1.2.0/24")
+    assert ipv4_trie.get_covered_by("10.1.0.0/16") == {
+        "10.1.2.0/24",
+        "10.1.3.0/24",
+    }
+
+
+def test_invalid_network(ipv4_trie):
+    with pytest.raises(NmstateValueError):
+        ipv4_trie.get_covering("10.1.2.0/33")
@@ -17,6 +17,8 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import time
+
 import pytest
 
 from libnmstate.error import NmstateValueError
@@ -290,6 +292,41 @@ class TestRouteRuleState:
         )
 
 
+@pytest.mark.benchmark
+def test_route_rule_state_benchmark():
+    """
+    Merge 5000 route rules with 50k routes of 5000 route tables.
+    """
+    table_count = 5000
+    route_count = 50000
+    routes = [
+        {
+            Route.DESTINATION: f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}/32",
+            Route.NEXT_HOP_ADDRESS: "192.0.2.1",
+            Route.NEXT_HOP_INTERFACE: IPV4_ROUTE_IFACE_NAME,
+            Route.TABLE_ID: 1000 + i * table_count // route_count,
+        }
+        for i in range(route_count)
+    ]
+    rules = [
+        _create_route_rule_dict(
+            f"198.{i >> 8}.{i & 255}.0/24", "", 1000 + i, 1000 + i
+        )
+        for i in range(table_count)
+    ]
+    route_state = RouteState(None, None, {Route.CONFIG: routes})
+
+    start = time.monotonic()
+    route_rule_state = RouteRuleState(
+        route_state, None, {RouteRule.CONFIG: rules}
+    )
+    metadata = route_rule_state.gen_metadata(route_state)
+    spent = time.monotonic() - start
+
+    print(f"{table_count} route rules with {route_count} routes: {spent:.3f}s")
+    assert len(metadata[IPV4_ROUTE_IFACE_NAME][Interface.IPV4]) == table_count
+
+
 def _create_route_rule(ip_from, ip_to, priority, table):
     return RouteRuleEntry(
         _create_route_rule_dict(ip_from, ip_to, priority, table)
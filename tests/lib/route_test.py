@@ -17,6 +17,10 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import ipaddress
+import time
+import tracemalloc
+
 import pytest
 
 from libnmstate.error import NmstateValueError
@@ -33,7 +37,9 @@ from libnmstate.route import RouteState
 from .testlib.ifacelib import gen_two_static_ip_ifaces
 from .testlib.routelib import IPV4_ROUTE_IFACE_NAME
 from .testlib.routelib import IPV4_ROUTE_DESITNATION
+from .testlib.routelib import IPV4_ROUTE_TABLE_ID
 from .testlib.routelib import IPV6_ROUTE_IFACE_NAME
+from .testlib.routelib import IPV6_ROUTE_TABLE_ID
 from .testlib.routelib import gen_ipv4_route
 from .testlib.routelib import gen_ipv6_route
 
@@ -304,6 +310,139 @@ class TestRouteState:
         state = self._gen_route_state([route_absent], [ipv4_route])
         assert not list(state.config_iface_routes.keys())
 
+    def test_remove_route_with_wildcard_match_with_table_id(self):
+        ipv4_route = gen_ipv4_route()
+        ipv6_route = gen_ipv6_route()
+        route_absent = RouteEntry(
+            {
+                Route.TABLE_ID: IPV4_ROUTE_TABLE_ID,
+                Route.STATE: Route.STATE_ABSENT,
+            }
+        )
+        state = self._gen_route_state([route_absent], [ipv4_route, ipv6_route])
+
+        assert not state.config_iface_routes[IPV4_ROUTE_IFACE_NAME]
+        assert state.config_iface_routes[IPV6_ROUTE_IFACE_NAME] == set(
+            [ipv6_route]
+        )
+        assert not state.get_table_routes(IPV4_ROUTE_TABLE_ID)
+        assert state.get_table_routes(IPV6_ROUTE_TABLE_ID) == set([ipv6_route])
+
+    def test_remove_route_with_wildcard_match_with_table_and_destination(
+        self,
+    ):
+        route0 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route1 = _create_route(
+            "198.51.100.0/24", "192.0.2.2", IPV4_ROUTE_IFACE_NAME, 50, 104
+        )
+        route2 = _create_route(
+            "198.51.101.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route_absent = RouteEntry(
+            {
+                Route.TABLE_ID: 50,
+                Route.DESTINATION: "198.51.100.0/24",
+                Route.STATE: Route.STATE_ABSENT,
+            }
+        )
+        state = self._gen_route_state([route_absent], [route0, route1, route2])
+
+        assert state.config_iface_routes[IPV4_ROUTE_IFACE_NAME] == set(
+            [route2]
+        )
+        assert state.get_table_routes(50) == set([route2])
+
+    def test_get_covering_routes(self):
+        route0 = _create_route(
+            "198.51.0.0/16", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route1 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route2 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 51, 103
+        )
+        route3 = _create_route(
+            "198.51.101.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        ipv6_route = gen_ipv6_route()
+        state = self._gen_route_state(
+            [], [route0, route1, route2, route3, ipv6_route]
+        )
+
+        assert state.get_covering_routes("198.51.100.128/25") == [
+            route0,
+            route1,
+            route2,
+        ]
+        assert state.get_covering_routes("198.51.100.128/25", 51) == [route2]
+        assert state.get_covering_routes("2001:db8:a::1/128") == [ipv6_route]
+
+    def test_get_covering_routes_in_main_route_table(self):
+        route0 = _create_route(
+            "198.51.0.0/16",
+            "192.0.2.1",
+            IPV4_ROUTE_IFACE_NAME,
+            Route.USE_DEFAULT_ROUTE_TABLE,
+            103,
+        )
+        route1 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 254, 103
+        )
+        route2 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        state = self._gen_route_state([], [route0, route1, route2])
+
+        for table_id in (Route.USE_DEFAULT_ROUTE_TABLE, 254):
+            assert state.get_covering_routes("198.51.100.0/24", table_id) == [
+                route0,
+                route1,
+            ]
+
+    def test_get_covered_routes(self):
+        route0 = _create_route(
+            "198.51.0.0/16", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route1 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route2 = _create_route(
+            "198.51.101.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 51, 103
+        )
+        state = self._gen_route_state([], [route0, route1, route2])
+
+        assert state.get_covered_routes("198.51.0.0/16") == [
+            route0,
+            route1,
+            route2,
+        ]
+        assert state.get_covered_routes("198.51.0.0/16", 51) == [route2]
+        assert state.get_covered_routes("198.51.102.0/24") == []
+
+    def test_get_covering_routes_after_route_removed(self):
+        route0 = _create_route(
+            "198.51.0.0/16", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        route1 = _create_route(
+            "198.51.100.0/24", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 50, 103
+        )
+        state = self._gen_route_state([], [route0, route1])
+        assert state.get_covering_routes("198.51.100.0/24") == [
+            route0,
+            route1,
+        ]
+
+        absent_route = route0.to_dict()
+        absent_route[Route.STATE] = Route.STATE_ABSENT
+        state._apply_absent_routes(
+            RouteEntry(absent_route), self._gen_ifaces()
+        )
+
+        assert state.get_covering_routes("198.51.100.0/24") == [route1]
+
     def test_validate_route_to_abent_iface(self):
         ifaces = self._gen_ifaces()
         ifaces[IPV4_ROUTE_IFACE_NAME].state = InterfaceState.ABSENT
@@ -546,6 +685,153 @@ class TestRouteState:
         ] == [ipv6_route.to_dict()]
 
 
+@pytest.mark.benchmark
+def test_route_entry_benchmark():
+    """
+    Build, hash and sort the routes of a full routing table.
+    """
+    route_count = 100000
+    route_dicts = [
+        _create_route_dict(
+            f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}/32",
+            f"192.0.2.{i % 4 + 1}",
+            f"eth{i % 4}",
+            254,
+            i % 100,
+        )
+        for i in range(route_count)
+    ]
+
+    tracemalloc.start()
+    try:
+        start = time.monotonic()
+        routes = [RouteEntry(route) for route in route_dicts]
+        build_time = time.monotonic() - start
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    start = time.monotonic()
+    route_set = set(routes)
+    assert len(route_set & set(routes)) == route_count
+    hash_time = time.monotonic() - start
+
+    start = time.monotonic()
+    sorted(routes, reverse=True)
+    sort_time = time.monotonic() - start
+
+    print(
+        f"{route_count} routes: {memory} bytes, build {build_time:.3f}s, "
+        f"hash {hash_time:.3f}s, sort {sort_time:.3f}s"
+    )
+    assert not hasattr(routes[0], "__dict__")
+
+
+@pytest.mark.benchmark
+def test_absent_routes_benchmark():
+    """
+    Remove 1000 routes out of 50k routes by absent routes with route table
+    and destination defined.
+    """
+    route_count = 50000
+    absent_count = 1000
+    ifaces = gen_two_static_ip_ifaces(
+        IPV4_ROUTE_IFACE_NAME, IPV6_ROUTE_IFACE_NAME
+    )
+    routes = [
+        _create_route_dict(
+            f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}/32",
+            "192.0.2.1",
+            IPV4_ROUTE_IFACE_NAME,
+            254,
+            100,
+        )
+        for i in range(route_count)
+    ]
+    absent_routes = [
+        {
+            Route.TABLE_ID: route[Route.TABLE_ID],
+            Route.DESTINATION: route[Route.DESTINATION],
+            Route.STATE: Route.STATE_ABSENT,
+        }
+        for route in routes[:: route_count // absent_count]
+    ]
+
+    start = time.monotonic()
+    state = RouteState(
+        ifaces, {Route.CONFIG: absent_routes}, {Route.CONFIG: routes}
+    )
+    spent = time.monotonic() - start
+
+    print(
+        f"{absent_count} absent routes of {route_count} routes: {spent:.3f}s"
+    )
+    assert (
+        len(state.config_iface_routes[IPV4_ROUTE_IFACE_NAME])
+        == route_count - absent_count
+    )
+
+
+@pytest.mark.benchmark
+def test_covering_routes_benchmark():
+    """
+    Query the routes covering a /24 network out of 50k routes, comparing
+    against a linear scan.
+    """
+    route_count = 50000
+    query_count = 1000
+    routes = [
+        _create_route_dict(
+            f"10.{i >> 12}.{(i >> 4) & 255}.{(i & 15) << 4}/28",
+            "192.0.2.1",
+            IPV4_ROUTE_IFACE_NAME,
+            254,
+            100,
+        )
+        for i in range(route_count)
+    ]
+    routes.append(
+        _create_route_dict(
+            "10.0.0.0/8", "192.0.2.1", IPV4_ROUTE_IFACE_NAME, 254, 100
+        )
+    )
+    state = RouteState(None, None, {Route.CONFIG: routes})
+    queries = [f"10.{i % 12}.{i % 256}.0/24" for i in range(query_count)]
+
+    # The first query builds the trie
+    start = time.monotonic()
+    state.get_covered_routes(queries[0])
+    build_time = time.monotonic() - start
+    start = time.monotonic()
+    results = [state.get_covered_routes(query) for query in queries]
+    trie_time = time.monotonic() - start
+
+    networks = [
+        (ipaddress.ip_network(route.destination), route)
+        for route in state.config_iface_routes[IPV4_ROUTE_IFACE_NAME]
+    ]
+    start = time.monotonic()
+    for query in queries[:10]:
+        query_network = ipaddress.ip_network(query)
+        scan_result = sorted(
+            route
+            for network, route in networks
+            if network.subnet_of(query_network)
+        )
+    scan_time = (time.monotonic() - start) * query_count / 10
+
+    print(
+        f"{query_count} queries of {route_count} routes: trie build "
+        f"{build_time:.3f}s, trie {trie_time:.3f}s, "
+        f"linear scan {scan_time:.3f}s(estimated)"
+    )
+    assert scan_result == results[9]
+    assert all(len(result) == 16 for result in results)
+    assert state.get_covering_routes("10.1.2.0/24")[0].destination == (
+        "10.0.0.0/8"
+    )
+
+
 def _create_route(dest, via_addr, via_iface, table, metric):
     return RouteEntry(
         _create_route_dict(dest, via_addr, via_iface, table, metric)
@@ -0,0 +1,142 @@
+#
+# Copyright (c) 2020 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import pytest
+
+from unittest import mock
+
+from libnmstate import session
+from libnmstate.error import NmstateValueError
+
+
+@pytest.fixture
+def plugin():
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def load_plugins_mock(plugin):
+    with mock.patch.object(session, "load_plugins") as m:
+        m.return_value = [plugin]
+        yield m
+
+
+@pytest.fixture
+def show_with_plugins_mock():
+    with mock.patch.object(session, "show_with_plugins") as m:
+        yield m
+
+
+@pytest.fixture
+def apply_with_plugins_mock():
+    with mock.patch.object(session, "apply_with_plugins") as m:
+        yield m
+
+
+@pytest.fixture
+def apply_many_with_plugins_mock():
+    with mock.patch.object(session, "apply_many_with_plugins") as m:
+        yield m
+
+
+def test_session_load_plugins_once(
+    load_plugins_mock, show_with_plugins_mock, plugin
+):
+    with session.Session() as nmstate_session:
+        nmstate_session.show()
+        nmstate_session.show(include_status_data=True, interfaces=["eth1"])
+        nmstate_session.show(fields=["interfaces.name"])
+
+    load_plugins_mock.assert_called_once()
+    show_with_plugins_mock.assert_has_calls(
+        [
+            mock.call([plugin], False, None, None),
+            mock.call([plugin], True, ["eth1"], None),
+            mock.call([plugin], False, None, ["interfaces.name"]),
+        ]
+    )
+    plugin.unload.assert_called_once()
+
+
+def test_session_apply_reuse_plugins(
+    load_plugins_mock, apply_with_plugins_mock, plugin
+):
+    desired_state = {"interfaces": []}
+    with session.Session() as nmstate_session:
+        nmstate_session.apply(desired_state, verify_change=False)
+        nmstate_session.apply(desired_state, save_to_disk=False)
+
+    load_plugins_mock.assert_called_once()
+    apply_with_plugins_mock.assert_has_calls(
+        [
+            mock.call(
+                [plugin],
+                desired_state,
+                verify_change=False,
+                commit=True,
+                rollback_timeout=60,
+                save_to_disk=True,
+                scoped_checkpoint=True,
+            ),
+            mock.call(
+                [plugin],
+                desired_state,
+                verify_change=True,
+                commit=True,
+                rollback_timeout=60,
+                save_to_disk=False,
+                scoped_checkpoint=True,
+            ),
+        ]
+    )
+
+
+def test_session_apply_many(
+    load_plugins_mock, apply_many_with_plugins_mock, plugin
+):
+    desired_states = [{"interfaces": []}, {"interfaces": []}]
+    with session.Session() as nmstate_session:
+        nmstate_session.apply_many(desired_states, commit=False)
+
+    apply_many_with_plugins_mock.assert_called_once_with(
+        [plugin],
+        desired_states,
+        verify_change=True,
+        commit=False,
+        rollback_timeout=60,
+        save_to_disk=True,
+    )
+
+
+def test_session_unload_plugins_on_exception(load_plugins_mock, plugin):
+    with pytest.raises(NmstateValueError):
+        with session.Session():
+            raise NmstateValueError("foo")
+
+    plugin.unload.assert_called_once()
+
+
+def test_closed_session(load_plugins_mock, show_with_plugins_mock, plugin):
+    nmstate_session = session.Session()
+    nmstate_session.close()
+    nmstate_session.close()
+
+    assert nmstate_session.closed
+    plugin.unload.assert_called_once()
+    with pytest.raises(NmstateValueError):
+        nmstate_session.show()